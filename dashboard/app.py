@@ -4,16 +4,18 @@ Web interface for reviewing and publishing AI-generated content
 """
 
 from fastapi import FastAPI, Request, HTTPException, UploadFile, File
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import uvicorn
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 from pathlib import Path
+from contextlib import asynccontextmanager
 import asyncio
+import json
 import shutil
 import uuid
 from dotenv import load_dotenv
@@ -24,17 +26,28 @@ load_dotenv()
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from anthropic import Anthropic
+from module_ii.llm_client import get_llm_client
+from module_ii.llm_cache import get_llm_cache
 from module_iii import SocialMediaPublisher, ClerkSocialAuth
 from module_iv.news_monitor import NewsMonitor
-from module_v.database import get_database
+from module_iv.content_scheduler import ContentScheduler
+from module_iv.slot_optimizer import parse_blackout
+from module_v.async_database import get_async_database
 from module_v.analytics_engine import AnalyticsEngine
 from module_vi.avatar_video_manager import avatar_video_manager
 
 # Import Zapier publishing router
 from dashboard.publishing_endpoints import router as publishing_router
 
-app = FastAPI(title="Milton AI Publicist Dashboard")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the publisher's HTTP connection pool on shutdown"""
+    yield
+    if publisher is not None:
+        await publisher.close()
+
+
+app = FastAPI(title="Milton AI Publicist Dashboard", lifespan=lifespan)
 
 # Include Zapier publishing endpoints
 app.include_router(publishing_router)
@@ -52,11 +65,13 @@ media_dir.mkdir(exist_ok=True)
 app.mount("/media", StaticFiles(directory="generated_media"), name="media")
 
 # Initialize services
-anthropic_client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+llm = get_llm_client()  # Shared AsyncAnthropic client, capped at LLM_MAX_CONCURRENCY calls
 publisher = None  # Will initialize when needed
+batch_scheduler = None  # ContentScheduler for /api/scheduled/batch, created when needed
+batch_lock = asyncio.Lock()
 
-# Initialize database (replaces in-memory storage)
-db = get_database()
+# Initialize database (async facade: queries run on a bounded worker pool)
+db = get_async_database()
 print("[INFO] Database connected: Persistent storage active")
 
 # Initialize analytics engine
@@ -279,7 +294,7 @@ async def get_status():
         user_info = auth.get_user_info()
 
         # Get database stats
-        stats = db.get_stats()
+        stats = await db.get_stats()
 
         return {
             "status": "online",
@@ -303,23 +318,14 @@ async def get_status():
         }
 
 
-@app.post("/api/generate")
-async def generate_content(request: Request):
-    """Generate new content using Milton's voice (with optional graphics/video)"""
-    data = await request.json()
+GENERATION_MODEL = "claude-sonnet-4-20250514"
 
-    scenario = data.get("scenario", "partner_appreciation")
-    context = data.get("context", "")
-    voice_type = data.get("voice_type", "personal")  # personal or professional
-    include_graphic = data.get("include_graphic", False)
-    include_video = data.get("include_video", False)
-    partner_logo = data.get("partner_logo")
-    uploaded_media_url = data.get("uploaded_media_url")  # User-uploaded media to use instead
 
-    # Build prompt based on voice type
+def _build_generation_prompt(voice_type: str, context: str) -> str:
+    """Build the generation prompt for Milton's personal or professional voice"""
     if voice_type == "personal":
         # Personal LinkedIn voice (20-80 words)
-        prompt = f"""You are helping Milton Overton draft a PERSONAL LinkedIn post.
+        return f"""You are helping Milton Overton draft a PERSONAL LinkedIn post.
 
 **CRITICAL: Use PERSONAL LINKEDIN VOICE**
 
@@ -343,7 +349,7 @@ Write ONLY the LinkedIn post. Keep it 20-80 words. End with "Let's Go Owls!"
 """
     else:
         # Professional AD voice (200-400 words)
-        prompt = f"""You are helping Milton Overton draft an OFFICIAL KSU Athletics statement.
+        return f"""You are helping Milton Overton draft an OFFICIAL KSU Athletics statement.
 
 **CRITICAL: Use PROFESSIONAL ATHLETIC DIRECTOR VOICE**
 
@@ -363,80 +369,181 @@ Write ONLY the LinkedIn post. Keep it 20-80 words. End with "Let's Go Owls!"
 Follow professional AD voice guidelines. Include student-athlete focus and rally close.
 """
 
+
+def _generation_request(data: dict) -> dict:
+    """Keyword arguments for messages.create / messages.stream"""
+    voice_type = data.get("voice_type", "personal")  # personal or professional
+
+    return {
+        "model": GENERATION_MODEL,
+        "max_tokens": 500 if voice_type == "personal" else 800,
+        "temperature": 0.7,
+        "messages": [{
+            "role": "user",
+            "content": _build_generation_prompt(voice_type, data.get("context", ""))
+        }]
+    }
+
+
+def _resolve_media(content: str, data: dict):
+    """
+    Pick the post's media: uploaded media if provided, otherwise generate if requested
+
+    Returns:
+        (graphic_url, video_url)
+    """
+    voice_type = data.get("voice_type", "personal")
+    include_graphic = data.get("include_graphic", False)
+    include_video = data.get("include_video", False)
+    partner_logo = data.get("partner_logo")
+    uploaded_media_url = data.get("uploaded_media_url")  # User-uploaded media to use instead
+
+    graphic_url = None
+    video_url = None
+
+    if uploaded_media_url:
+        # User provided their own media
+        if uploaded_media_url.endswith(('.mp4', '.mov', '.avi')):
+            video_url = uploaded_media_url
+        else:
+            graphic_url = uploaded_media_url
+        print(f"[INFO] Using uploaded media: {uploaded_media_url}")
+
+    elif include_graphic or include_video:
+        # Generate media with AI
+        try:
+            from module_vi.complete_media_workflow import CompleteMediaWorkflow
+
+            workflow = CompleteMediaWorkflow()
+
+            media_package = workflow.create_post_package(
+                text_content=content,
+                voice_type=voice_type,
+                include_graphic=include_graphic,
+                include_video=include_video,
+                partner_logo=partner_logo
+            )
+
+            graphic_url = media_package.get("graphic_url")
+            video_url = media_package.get("video_url")
+
+        except Exception as media_error:
+            print(f"[WARN] Media generation failed: {media_error}")
+            # Continue without media
+
+    return graphic_url, video_url
+
+
+async def _save_generated_post(content: str, data: dict) -> dict:
+    """Attach media, persist the generated post and return it"""
+    graphic_url, video_url = await asyncio.to_thread(_resolve_media, content, data)
+
+    post_id = await db.create_post(
+        content=content,
+        voice_type=data.get("voice_type", "personal"),
+        scenario=data.get("scenario", "partner_appreciation"),
+        context=data.get("context", ""),
+        graphic_url=graphic_url,
+        video_url=video_url
+    )
+
+    return await db.get_post(post_id)
+
+
+def _usage_summary(usage) -> dict:
+    """Token count and estimated cost for a generation"""
+    return {
+        "tokens_used": usage.input_tokens + usage.output_tokens,
+        "cost": (usage.input_tokens * 0.003 + usage.output_tokens * 0.015) / 1000
+    }
+
+
+@app.post("/api/generate")
+async def generate_content(request: Request):
+    """Generate new content using Milton's voice (with optional graphics/video)"""
+    data = await request.json()
+
     try:
         # Generate content with Claude
-        response = anthropic_client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=500 if voice_type == "personal" else 800,
-            temperature=0.7,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        response = await llm.create_message(**_generation_request(data))
 
         content = response.content[0].text.strip()
 
-        # Initialize media URLs
-        graphic_url = None
-        video_url = None
-
-        # Use uploaded media if provided, otherwise generate if requested
-        if uploaded_media_url:
-            # User provided their own media
-            if uploaded_media_url.endswith(('.mp4', '.mov', '.avi')):
-                video_url = uploaded_media_url
-            else:
-                graphic_url = uploaded_media_url
-            print(f"[INFO] Using uploaded media: {uploaded_media_url}")
-
-        elif include_graphic or include_video:
-            # Generate media with AI
-            try:
-                from module_vi.complete_media_workflow import CompleteMediaWorkflow
-
-                workflow = CompleteMediaWorkflow()
-
-                media_package = workflow.create_post_package(
-                    text_content=content,
-                    voice_type=voice_type,
-                    include_graphic=include_graphic,
-                    include_video=include_video,
-                    partner_logo=partner_logo
-                )
-
-                graphic_url = media_package.get("graphic_url")
-                video_url = media_package.get("video_url")
-
-            except Exception as media_error:
-                print(f"[WARN] Media generation failed: {media_error}")
-                # Continue without media
-
-        # Save to database
-        post_id = db.create_post(
-            content=content,
-            voice_type=voice_type,
-            scenario=scenario,
-            context=context,
-            graphic_url=graphic_url,
-            video_url=video_url
-        )
-
-        # Get the created post from database
-        post = db.get_post(post_id)
+        # Save to database (with uploaded or generated media)
+        post = await _save_generated_post(content, data)
 
         return {
             "success": True,
             "post": post,
-            "tokens_used": response.usage.input_tokens + response.usage.output_tokens,
-            "cost": (response.usage.input_tokens * 0.003 + response.usage.output_tokens * 0.015) / 1000
+            **_usage_summary(response.usage)
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse_event(event: str, payload: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+@app.post("/api/generate/stream")
+async def generate_content_stream(request: Request):
+    """
+    Generate new content, streaming tokens as Server-Sent Events
+
+    Emits "token" events ({"text": ...}) as the model writes, then a single
+    "done" event with the saved post (same shape as /api/generate), or an
+    "error" event if generation fails.
+    """
+    data = await request.json()
+
+    async def event_stream():
+        try:
+            # Open the stream immediately so clients see bytes before the first token
+            yield ": generating\n\n"
+
+            async with llm.stream_message(**_generation_request(data)) as stream:
+                async for text in stream.text_stream:
+                    yield _sse_event("token", {"text": text})
+                message = await stream.get_final_message()
+
+            content = "".join(
+                block.text for block in message.content if block.type == "text"
+            ).strip()
+
+            post = await _save_generated_post(content, data)
+
+            yield _sse_event("done", {
+                "success": True,
+                "post": post,
+                **_usage_summary(message.usage)
+            })
+
+        except Exception as e:
+            print(f"[ERROR] Streaming generation failed: {e}")
+            yield _sse_event("error", {"success": False, "detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/llm/metrics")
+async def get_llm_metrics():
+    """Get LLM concurrency, queue/generation time and response cache hit-rate metrics"""
+    return {
+        **llm.get_metrics(),
+        "cache": get_llm_cache().get_metrics()
+    }
+
+
 @app.get("/api/posts")
 async def get_posts(status: Optional[str] = None, limit: int = 100):
     """Get all generated posts"""
-    posts = db.get_all_posts(limit=limit)
+    posts = await db.get_all_posts(limit=limit)
 
     if status:
         posts = [p for p in posts if p["status"] == status]
@@ -447,7 +554,7 @@ async def get_posts(status: Optional[str] = None, limit: int = 100):
 @app.get("/api/posts/{post_id}")
 async def get_post_endpoint(post_id: int):
     """Get specific post"""
-    post = db.get_post(post_id)
+    post = await db.get_post(post_id)
 
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -470,20 +577,20 @@ async def update_post_endpoint(post_id: int, request: Request):
         updates["status"] = data["status"]
 
     # Update in database
-    success = db.update_post(post_id, **updates)
+    success = await db.update_post(post_id, **updates)
 
     if not success:
         raise HTTPException(status_code=404, detail="Post not found")
 
     # Return updated post
-    post = db.get_post(post_id)
+    post = await db.get_post(post_id)
     return {"success": True, "post": post}
 
 
 @app.post("/api/posts/{post_id}/publish")
 async def publish_post(post_id: int):
     """Publish post to LinkedIn"""
-    post = db.get_post(post_id)
+    post = await db.get_post(post_id)
 
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -501,10 +608,10 @@ async def publish_post(post_id: int):
 
         if result["success"]:
             # Mark as published in database
-            db.mark_post_published(post_id, result.get("url"))
+            await db.mark_post_published(post_id, result.get("url"))
 
             # Log publishing result
-            db.log_publishing_result(
+            await db.log_publishing_result(
                 post_id=post_id,
                 platform="linkedin",
                 success=True,
@@ -512,7 +619,7 @@ async def publish_post(post_id: int):
             )
 
             # Get updated post
-            post = db.get_post(post_id)
+            post = await db.get_post(post_id)
 
             return {
                 "success": True,
@@ -522,7 +629,7 @@ async def publish_post(post_id: int):
             }
         else:
             # Log failed publishing result
-            db.log_publishing_result(
+            await db.log_publishing_result(
                 post_id=post_id,
                 platform="linkedin",
                 success=False,
@@ -537,7 +644,7 @@ async def publish_post(post_id: int):
 
     except Exception as e:
         # Log exception
-        db.log_publishing_result(
+        await db.log_publishing_result(
             post_id=post_id,
             platform="linkedin",
             success=False,
@@ -553,7 +660,7 @@ async def publish_post(post_id: int):
 @app.delete("/api/posts/{post_id}")
 async def delete_post_endpoint(post_id: int):
     """Delete a post"""
-    success = db.delete_post(post_id)
+    success = await db.delete_post(post_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -564,7 +671,7 @@ async def delete_post_endpoint(post_id: int):
 @app.get("/api/published")
 async def get_published_posts():
     """Get all published posts"""
-    posts = db.get_all_posts()
+    posts = await db.get_all_posts()
     published = [p for p in posts if p["status"] == "published"]
     return {"posts": published}
 
@@ -695,19 +802,19 @@ async def schedule_post_endpoint(post_id: int, request: Request):
         raise HTTPException(status_code=400, detail="Missing platform or scheduled_time")
 
     # Verify post exists
-    post = db.get_post(post_id)
+    post = await db.get_post(post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
     # Schedule the post
-    schedule_id = db.schedule_post(
+    schedule_id = await db.schedule_post(
         post_id=post_id,
         platform=platform,
         scheduled_time=scheduled_time
     )
 
     # Get the scheduled post
-    scheduled = db.get_all_scheduled_posts()
+    scheduled = await db.get_all_scheduled_posts()
     scheduled_post = next((s for s in scheduled if s["id"] == schedule_id), None)
 
     return {
@@ -717,24 +824,104 @@ async def schedule_post_endpoint(post_id: int, request: Request):
     }
 
 
+def _as_utc(moment):
+    """The API reads times without an offset as UTC: attach it (datetime or daily time)"""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def _get_batch_scheduler() -> ContentScheduler:
+    """ContentScheduler that plans batches (created on first use; it loads the schedule, and never publishes)"""
+    global batch_scheduler
+    if batch_scheduler is None:
+        batch_scheduler = ContentScheduler(best_times=analytics.best_times, db=db.db, publisher=publisher)
+    return batch_scheduler
+
+
+@app.post("/api/scheduled/batch")
+async def schedule_batch_endpoint(request: Request):
+    """
+    Schedule many posts at once, spreading them over the calendar
+
+    Body: post_ids, platforms, and optionally start (ISO; default now),
+    days (7), min_spacing_minutes (120), daily_cap (3) and blackouts
+    ([{"start": "22:00", "end": "06:00"}] daily, or ISO timestamps for
+    one-off windows). Times without a UTC offset, daily blackout times
+    included, are UTC; returned times are UTC. Slots are planned by
+    ContentScheduler.schedule_batch, so they match the scheduler's own.
+    """
+    data = await request.json()
+
+    post_ids = data.get("post_ids") or []
+    platforms = [p.lower() for p in data.get("platforms") or []]
+    if not post_ids or not platforms:
+        raise HTTPException(status_code=400, detail="Missing post_ids or platforms")
+
+    try:
+        start = _as_utc(datetime.fromisoformat(data["start"])) if data.get("start") else datetime.now(timezone.utc)
+        daily_cap = data.get("daily_cap", 3)
+        options = {
+            "days": int(data.get("days", 7)),
+            "min_spacing": timedelta(minutes=float(data.get("min_spacing_minutes", 120))),
+            "daily_cap": int(daily_cap) if daily_cap is not None else None,
+            "blackouts": [
+                tuple(_as_utc(moment) for moment in parse_blackout(b["start"], b["end"]))
+                for b in data.get("blackouts") or []
+            ]
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid scheduling options: {e}")
+
+    for post_id in post_ids:
+        if not await db.get_post(post_id):
+            raise HTTPException(status_code=404, detail=f"Post {post_id} not found")
+
+    # One batch at a time, so concurrent requests cannot book the same slots
+    async with batch_lock:
+        result = await db.run(
+            lambda: _get_batch_scheduler().schedule_batch(
+                [{"post_id": post_id, "platforms": platforms} for post_id in post_ids],
+                start=start,
+                **options
+            )
+        )
+
+    scheduled_posts = [
+        {
+            "post_id": post["id"],
+            "scheduled_time": ContentScheduler._to_utc(datetime.fromisoformat(post["scheduled_time"])),
+            "predicted_engagement": post["predicted_engagement"],
+            "schedule_ids": list(post["schedule_ids"].values())
+        }
+        for post in result["scheduled"]
+    ]
+
+    return {
+        "success": True,
+        "scheduled": scheduled_posts,
+        "unscheduled": [post["post_id"] for post in result["unscheduled"]]
+    }
+
+
 @app.get("/api/scheduled")
 async def get_scheduled_posts(status: Optional[str] = None):
     """Get all scheduled posts"""
-    scheduled = db.get_all_scheduled_posts(status=status)
+    scheduled = await db.get_all_scheduled_posts(status=status)
     return {"scheduled": scheduled}
 
 
 @app.get("/api/scheduled/upcoming")
 async def get_upcoming_scheduled():
     """Get upcoming scheduled posts (next 7 days)"""
-    upcoming = db.get_upcoming_schedule(days=7)
+    upcoming = await db.get_upcoming_schedule(days=7)
     return {"upcoming": upcoming}
 
 
 @app.delete("/api/scheduled/{schedule_id}")
 async def cancel_schedule_endpoint(schedule_id: int):
     """Cancel a scheduled post"""
-    success = db.cancel_scheduled_post(schedule_id)
+    success = await db.cancel_scheduled_post(schedule_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Scheduled post not found or already published")
@@ -742,17 +929,41 @@ async def cancel_schedule_endpoint(schedule_id: int):
     return {"success": True, "message": "Scheduled post cancelled"}
 
 
+@app.get("/api/scheduled/dead-letter")
+async def get_dead_letter_posts():
+    """Get scheduled posts that failed permanently or ran out of retries"""
+    dead = await db.get_all_scheduled_posts(status='dead_letter')
+    return {"dead_letter": dead, "count": len(dead)}
+
+
+@app.post("/api/scheduled/dead-letter/requeue")
+async def requeue_dead_letter_endpoint(request: Request):
+    """Requeue dead-lettered posts (all of them unless schedule_ids is given)"""
+    body = await request.body()
+    data = json.loads(body) if body else {}
+
+    schedule_ids = data.get("schedule_ids")
+    if schedule_ids is not None and not isinstance(schedule_ids, list):
+        raise HTTPException(status_code=400, detail="schedule_ids must be a list")
+
+    requeued = await db.requeue_dead_letter_posts(schedule_ids)
+
+    return {"success": True, "requeued": requeued}
+
+
 @app.get("/api/scheduler/status")
 async def get_scheduler_status():
     """Get scheduler daemon status"""
     # This would connect to the running scheduler daemon
     # For now, just return basic stats
-    stats = db.get_stats()
-    pending_schedules = db.get_all_scheduled_posts(status='pending')
+    stats = await db.get_stats()
+    pending_schedules = await db.get_all_scheduled_posts(status='pending')
+    dead_letter = await db.get_all_scheduled_posts(status='dead_letter')
 
     return {
         "daemon_running": False,  # Will be updated when daemon is integrated
         "pending_schedules": len(pending_schedules),
+        "dead_letter_schedules": len(dead_letter),
         "total_posts": stats['total_posts'],
         "published_posts": stats['published_posts']
     }
@@ -778,7 +989,8 @@ async def record_engagement_endpoint(request: Request):
     if not post_id:
         raise HTTPException(status_code=400, detail="post_id is required")
 
-    success = analytics.record_engagement(
+    success = await db.run(
+        analytics.record_engagement,
         post_id=post_id,
         platform=platform,
         views=views,
@@ -794,10 +1006,35 @@ async def record_engagement_endpoint(request: Request):
         raise HTTPException(status_code=500, detail="Failed to record engagement")
 
 
+@app.post("/api/analytics/engagement/bulk")
+async def record_engagement_bulk_endpoint(request: Request):
+    """
+    Record engagement metrics for many posts at once (Zapier / CSV backfills)
+
+    Request Body:
+        {"records": [{"post_id": 1, "platform": "linkedin", "views": 150, ...}, ...]}
+
+    Returns counts plus per-row errors; valid rows are written even when
+    some rows fail validation.
+    """
+    data = await request.json()
+    records = data.get("records") if isinstance(data, dict) else data
+
+    if not isinstance(records, list) or not records:
+        raise HTTPException(status_code=400, detail="records must be a non-empty list")
+
+    result = await db.run(analytics.record_engagement_many, records)
+
+    return {
+        "success": result["failed"] == 0,
+        **result
+    }
+
+
 @app.get("/api/analytics/post/{post_id}")
 async def get_post_analytics(post_id: int):
     """Get performance data for a specific post"""
-    performance = analytics.get_post_performance(post_id)
+    performance = await db.run(analytics.get_post_performance, post_id)
 
     if "error" in performance:
         raise HTTPException(status_code=404, detail=performance["error"])
@@ -805,61 +1042,116 @@ async def get_post_analytics(post_id: int):
     return performance
 
 
+@app.get("/api/analytics/post/{post_id}/curve")
+async def get_post_engagement_curve(post_id: int, platform: Optional[str] = None):
+    """Get cumulative engagement over time for a specific post"""
+    curve = await db.run(analytics.get_engagement_curve, post_id, platform=platform)
+
+    if "error" in curve:
+        raise HTTPException(status_code=404, detail=curve["error"])
+
+    return curve
+
+
+@app.get("/api/analytics/cohort-curve")
+async def get_cohort_engagement_curve(
+    platform: str = "linkedin",
+    voice_type: Optional[str] = None,
+    scenario: Optional[str] = None
+):
+    """Get average engagement at t+1h, t+24h and t+7d after publishing"""
+    return await db.run(
+        analytics.get_cohort_curve,
+        platform=platform,
+        voice_type=voice_type,
+        scenario=scenario
+    )
+
+
 @app.get("/api/analytics/overview")
 async def get_analytics_overview(days: int = 30):
     """Get overall performance metrics"""
-    return analytics.get_overall_performance(days=days)
+    return await db.run(analytics.get_overall_performance, days=days)
 
 
 @app.get("/api/analytics/best-times")
 async def get_best_posting_times(platform: str = "linkedin"):
     """Get optimal posting times based on historical data"""
-    return analytics.analyze_best_times(platform=platform)
+    return await db.run(analytics.analyze_best_times, platform=platform)
+
+
+@app.get("/api/analytics/heatmap")
+async def get_posting_heatmap(platform: str = "linkedin"):
+    """Get day-of-week x hour engagement heatmap (mean, count, 95% CI)"""
+    return await db.run(analytics.get_heatmap, platform=platform)
 
 
 @app.get("/api/analytics/content-performance")
 async def get_content_analysis(metric: str = "engagement_rate"):
     """Analyze which content types perform best"""
-    return analytics.analyze_content_performance(metric=metric)
+    return await db.run(analytics.analyze_content_performance, metric=metric)
 
 
 @app.get("/api/analytics/top-posts")
 async def get_top_posts(limit: int = 10, metric: str = "engagement_rate"):
     """Get top performing posts"""
-    posts = analytics.get_top_performing_posts(limit=limit, metric=metric)
+    posts = await db.run(analytics.get_top_performing_posts, limit=limit, metric=metric)
     return {"top_posts": posts}
 
 
 @app.get("/api/analytics/insights")
 async def get_analytics_insights():
     """Get actionable insights from analytics data"""
-    return analytics.generate_insights()
+    return await db.run(analytics.generate_insights)
 
 
 @app.get("/api/analytics/dashboard")
 async def get_analytics_dashboard():
     """Get complete analytics summary for dashboard"""
-    return analytics.get_dashboard_summary()
+    return await db.run(analytics.get_dashboard_summary)
+
+
+# ===== SIMILARITY SEARCH ENDPOINTS =====
+
+@app.get("/api/similar")
+async def find_similar_content(text: str, kind: Optional[str] = None, limit: int = 5):
+    """Find past posts or articles similar to a piece of text (local vector index)"""
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="text is required")
+
+    # Opening the index can backfill it, so resolve it off the event loop too
+    results = await db.run(lambda: db.db.vector_index.search(text, k=min(limit, 50), kind=kind))
+
+    for result in results:
+        if result["kind"] == "post":
+            result["post"] = await db.get_post(result["id"])
+
+    return {"results": results}
 
 
 # ===== NEWS MONITOR ENDPOINTS =====
 
 @app.get("/api/news/monitor")
-async def monitor_news(hours_back: int = 24, min_priority: int = 7):
+async def monitor_news(hours_back: int = 24, min_priority: int = 7, mode: str = "batch"):
     """
     Monitor news sources and generate post suggestions
 
     Args:
         hours_back: How many hours back to check for news (default 24)
         min_priority: Minimum priority score 1-10 (default 7)
+        mode: Triage mode, "batch" (items scored per prompt) or "concurrent" (one prompt per item)
 
     Returns:
         List of news items with post suggestions sorted by priority
     """
+    if mode not in ("batch", "concurrent"):
+        raise HTTPException(status_code=400, detail="mode must be 'batch' or 'concurrent'")
+
     try:
-        suggestions = news_monitor.monitor_and_suggest(
+        suggestions = await news_monitor.monitor_and_suggest_async(
             hours_back=hours_back,
-            min_priority=min_priority
+            min_priority=min_priority,
+            mode=mode
         )
 
         return {
@@ -868,7 +1160,8 @@ async def monitor_news(hours_back: int = 24, min_priority: int = 7):
             "suggestions": suggestions,
             "parameters": {
                 "hours_back": hours_back,
-                "min_priority": min_priority
+                "min_priority": min_priority,
+                "mode": mode
             }
         }
     except Exception as e:
@@ -884,7 +1177,7 @@ async def get_news_feeds():
         List of recent news items from all sources
     """
     try:
-        news_items = news_monitor.fetch_rss_feeds()
+        news_items = await news_monitor.fetch_rss_feeds_async()
 
         return {
             "success": True,
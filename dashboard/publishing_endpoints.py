@@ -9,7 +9,7 @@ import logging
 from datetime import datetime
 
 from dashboard.zapier_publisher import ZapierPublisher
-from module_v.database import get_database
+from module_v.async_database import get_async_database
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/api/publish", tags=["publishing"])
 
 # Initialize services
 zapier_publisher = ZapierPublisher()
-db = get_database()
+db = get_async_database()
 
 
 @router.get("/platforms")
@@ -103,7 +103,7 @@ async def publish_to_platform(post_id: int, platform: str):
         )
 
     # Get post from database
-    post = db.get_post(post_id)
+    post = await db.get_post(post_id)
 
     if not post:
         raise HTTPException(status_code=404, detail=f"Post {post_id} not found")
@@ -135,7 +135,7 @@ async def publish_to_platform(post_id: int, platform: str):
     if result.get("success"):
         # Mark post as published (update status to 'published')
         try:
-            db.update_post(post_id, status='published')
+            await db.update_post(post_id, status='published')
         except Exception as e:
             logger.warning(f"Could not update post status: {e}")
 
@@ -181,7 +181,7 @@ async def publish_to_multiple_platforms(post_id: int, request: Request):
         raise HTTPException(status_code=400, detail="No platforms specified")
 
     # Get post from database
-    post = db.get_post(post_id)
+    post = await db.get_post(post_id)
 
     if not post:
         raise HTTPException(status_code=404, detail=f"Post {post_id} not found")
@@ -207,15 +207,15 @@ async def publish_to_multiple_platforms(post_id: int, request: Request):
     # Log each result
     for platform, result in results.items():
         if result.get("success"):
-            db.mark_post_published(post_id, post_url=None)
-            db.log_publishing_result(
+            await db.mark_post_published(post_id, post_url=None)
+            await db.log_publishing_result(
                 post_id=post_id,
                 platform=platform,
                 success=True,
                 response_data=result
             )
         else:
-            db.log_publishing_result(
+            await db.log_publishing_result(
                 post_id=post_id,
                 platform=platform,
                 success=False,
@@ -254,7 +254,7 @@ async def get_publishing_history(
     """
     try:
         # Get publishing results from database
-        results = db.get_publishing_results(limit=limit)
+        results = await db.get_publishing_results(limit=limit)
 
         # Filter by platform if specified
         if platform:
@@ -301,7 +301,7 @@ async def get_publishing_stats():
     """
     try:
         # Get all publishing results
-        results = db.get_publishing_results(limit=1000)
+        results = await db.get_publishing_results(limit=1000)
 
         # Calculate stats
         total = len(results)
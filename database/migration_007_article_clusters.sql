@@ -0,0 +1,23 @@
+-- Migration #7: Near-Duplicate Article Clusters
+-- Created: 2026-10-16
+-- Purpose: Record syndicated copies on the article that represents their cluster
+
+-- URLs and sources of near-duplicates merged into this article
+ALTER TABLE news_articles
+ADD COLUMN IF NOT EXISTS duplicate_urls TEXT[] DEFAULT '{}';
+
+ALTER TABLE news_articles
+ADD COLUMN IF NOT EXISTS duplicate_sources TEXT[] DEFAULT '{}';
+
+-- MediaMonitor seeds its fingerprint index from recently stored articles
+CREATE INDEX IF NOT EXISTS idx_articles_created ON news_articles(created_at DESC);
+
+-- Canonical URL (tracking parameters, fragments and the like removed) is the
+-- ingestion conflict key; url keeps the link as published. Rows stored
+-- earlier are keyed by their url.
+ALTER TABLE news_articles
+ADD COLUMN IF NOT EXISTS canonical_url VARCHAR(1000);
+
+UPDATE news_articles SET canonical_url = url WHERE canonical_url IS NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_canonical_url ON news_articles(canonical_url);
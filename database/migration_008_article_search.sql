@@ -0,0 +1,12 @@
+-- Migration #8: Full-Text Search over News Articles
+-- Created: 2026-10-16
+-- Purpose: Ranked related-article lookup without scanning news_articles
+
+-- Title (weight A) and content (weight B) lexemes, maintained by PostgreSQL on every write
+ALTER TABLE news_articles
+ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(content, '')), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_articles_search ON news_articles USING GIN (search_vector);
@@ -30,6 +30,7 @@ CREATE TABLE IF NOT EXISTS news_articles (
     article_id SERIAL PRIMARY KEY,
     title VARCHAR(500) NOT NULL,
     url VARCHAR(1000) UNIQUE NOT NULL,
+    canonical_url VARCHAR(1000) UNIQUE,
     source VARCHAR(100) NOT NULL,
     published_date TIMESTAMP WITH TIME ZONE NOT NULL,
     content TEXT,
@@ -37,12 +38,19 @@ CREATE TABLE IF NOT EXISTS news_articles (
     categories TEXT[],
     relevance_score DECIMAL(3,2) DEFAULT 0.00,
     key_entities TEXT[],
+    duplicate_urls TEXT[] DEFAULT '{}',
+    duplicate_sources TEXT[] DEFAULT '{}',
     processed BOOLEAN DEFAULT FALSE,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
 CREATE INDEX idx_articles_source ON news_articles(source);
+CREATE INDEX idx_articles_search ON news_articles USING GIN (search_vector);
 CREATE INDEX idx_articles_relevance ON news_articles(relevance_score DESC);
 CREATE INDEX idx_articles_published ON news_articles(published_date DESC);
 CREATE INDEX idx_articles_processed ON news_articles(processed);
@@ -5,12 +5,18 @@ Combines Milton's raw insights with trending news to create content opportunitie
 
 from typing import List, Dict, Optional
 from anthropic import Anthropic
+import asyncio
 import json
 import asyncpg
 import os
 from datetime import datetime
 from dataclasses import dataclass
 
+from module_ii.keyword_matcher import KeywordMatcher
+from module_ii.llm_cache import get_llm_cache
+from module_v.article_store import create_article_store
+from module_v.vector_index import get_vector_index
+
 @dataclass
 class NewsArticle:
     """News article data structure"""
@@ -29,6 +35,18 @@ class InsightSynthesizer:
     to create high-value content opportunities
     """
 
+    PILLAR_MATCHER = KeywordMatcher({
+        "AI Innovation in Sports Business": ["ai", "artificial intelligence", "technology", "innovation", "data", "analytics", "automation", "digital"],
+        "Leadership & Vision": ["leadership", "strategy", "management", "director", "vision", "execution", "team", "organizational"],
+        "Future of College Sports": ["nil", "conference", "realignment", "future", "trend", "evolution", "reform", "ncaa"]
+    })
+
+    # Synthesis for the same insight and articles is reused for a day
+    SYNTHESIS_CACHE_TTL = 24 * 3600
+
+    # Insight keywords used to search for related articles
+    RELATED_SEARCH_TERMS = 10
+
     def __init__(self, anthropic_api_key: str, db_url: str):
         """
         Initialize Insight Synthesizer
@@ -38,13 +56,18 @@ class InsightSynthesizer:
             db_url: PostgreSQL connection URL
         """
         self.client = Anthropic(api_key=anthropic_api_key)
+        self.llm_cache = get_llm_cache()
         self.db_url = db_url
         self.db_pool = None
+        self.article_store = None
+        self.vector_index = get_vector_index()
         self.voice_profile = {}
 
     async def initialize(self):
         """Initialize database connection and load voice profile"""
         self.db_pool = await asyncpg.create_pool(self.db_url, min_size=2, max_size=10)
+        self.article_store = create_article_store(self.db_url, db_pool=self.db_pool)
+        await self.article_store.initialize()
         self.voice_profile = await self._load_voice_profile()
 
     async def close(self):
@@ -234,7 +257,23 @@ Format your response as valid JSON."""
         """Use Claude API for synthesis"""
 
         try:
-            message = self.client.messages.create(
+            def parse(response_text: str) -> Dict:
+                # Extract JSON (handle markdown code blocks)
+                if "```json" in response_text:
+                    json_str = response_text.split("```json")[1].split("```")[0].strip()
+                elif "```" in response_text:
+                    json_str = response_text.split("```")[1].split("```")[0].strip()
+                else:
+                    json_str = response_text
+
+                return json.loads(json_str)
+
+            # Unparseable responses are not cached, so a retry asks Claude again
+            return self.llm_cache.complete(
+                self.client,
+                call_site="insight_synthesis",
+                ttl=self.SYNTHESIS_CACHE_TTL,
+                parse=parse,
                 model="claude-sonnet-4-20250514",
                 max_tokens=2000,
                 temperature=0.7,
@@ -246,22 +285,9 @@ Format your response as valid JSON."""
                 ]
             )
 
-            # Parse JSON response
-            response_text = message.content[0].text
-
-            # Extract JSON (handle markdown code blocks)
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = response_text
-
-            return json.loads(json_str)
-
         except json.JSONDecodeError as e:
             print(f"[InsightSynthesizer] JSON decode error: {e}")
-            print(f"Response text: {response_text}")
+            print(f"Response text: {e.doc}")
             # Return default structure
             return {
                 "content_angles": ["Discuss the implications of this trend for college athletics"],
@@ -287,72 +313,49 @@ Format your response as valid JSON."""
         Returns:
             List of related NewsArticle objects
         """
-        async with self.db_pool.acquire() as conn:
-            # Simple keyword matching (would use vector similarity in production)
-            # Extract keywords from insight
-            keywords = self._extract_keywords(insight_text)
-
-            if not keywords:
-                # Fallback: get most recent relevant articles
-                rows = await conn.fetch("""
-                    SELECT article_id, title, url, source, published_date,
-                           content, relevance_score, categories
-                    FROM news_articles
-                    WHERE processed = FALSE
-                    ORDER BY relevance_score DESC, published_date DESC
-                    LIMIT $1
-                """, limit)
-            else:
-                # Match articles containing keywords
-                keyword_pattern = '|'.join(keywords)
-                rows = await conn.fetch("""
-                    SELECT article_id, title, url, source, published_date,
-                           content, relevance_score, categories
-                    FROM news_articles
-                    WHERE (title ~* $1 OR content ~* $1)
-                    AND processed = FALSE
-                    ORDER BY relevance_score DESC, published_date DESC
-                    LIMIT $2
-                """, keyword_pattern, limit)
-
-            articles = []
-            for row in rows:
-                articles.append(NewsArticle(
-                    article_id=row['article_id'],
-                    title=row['title'],
-                    url=row['url'],
-                    source=row['source'],
-                    published_date=row['published_date'],
-                    content=row['content'] or "",
-                    relevance_score=float(row['relevance_score']),
-                    categories=row['categories'] or []
-                ))
-
-            return articles
+        # Ranked full-text search over indexed titles and content
+        keywords = self._extract_keywords(insight_text, limit=self.RELATED_SEARCH_TERMS)
+        rows = await self.article_store.search(keywords, limit=limit)
+
+        return [
+            NewsArticle(
+                article_id=row['article_id'],
+                title=row['title'],
+                url=row['url'],
+                source=row['source'],
+                published_date=row['published_date'],
+                content=row['content'] or "",
+                relevance_score=float(row['relevance_score']),
+                categories=row['categories'] or []
+            )
+            for row in rows
+        ]
+
+    async def find_similar_content(self, text: str, limit: int = 5, kind: Optional[str] = None) -> List[Dict]:
+        """
+        Past posts and articles most similar to text (local vector index)
+
+        Args:
+            text: Insight or draft text
+            limit: Maximum results
+            kind: "post" or "article" to restrict results
+
+        Returns:
+            [{"kind", "id", "score"}] by descending cosine similarity
+        """
+        return await asyncio.to_thread(self.vector_index.search, text, k=limit, kind=kind)
 
     async def _determine_pillar(self, insight_text: str, articles: List[NewsArticle]) -> str:
         """Determine which thought leadership pillar this content aligns with"""
 
-        text = f"{insight_text} {' '.join([a.title for a in articles])}".lower()
+        text = f"{insight_text} {' '.join([a.title for a in articles])}"
 
+        # Each pillar with any keyword present scores 2 (one pass over the text)
         pillar_scores = {
-            "AI Innovation in Sports Business": 0,
-            "Leadership & Vision": 0,
-            "Future of College Sports": 0
+            pillar: 2 if matches else 0
+            for pillar, matches in self.PILLAR_MATCHER.count(text).items()
         }
 
-        # AI Innovation keywords
-        if any(word in text for word in ["ai", "artificial intelligence", "technology", "innovation", "data", "analytics", "automation", "digital"]):
-            pillar_scores["AI Innovation in Sports Business"] += 2
-
-        # Leadership keywords
-        if any(word in text for word in ["leadership", "strategy", "management", "director", "vision", "execution", "team", "organizational"]):
-            pillar_scores["Leadership & Vision"] += 2
-
-        # Future of Sports keywords
-        if any(word in text for word in ["nil", "conference", "realignment", "future", "trend", "evolution", "reform", "ncaa"]):
-            pillar_scores["Future of College Sports"] += 2
-
         # Return highest scoring pillar
         best_pillar = max(pillar_scores.items(), key=lambda x: x[1])[0]
 
@@ -371,7 +374,7 @@ Format your response as valid JSON."""
         # Default: return first angle
         return synthesis.get("content_angles", ["General industry analysis"])[0]
 
-    def _extract_keywords(self, text: str) -> List[str]:
+    def _extract_keywords(self, text: str, limit: int = 5) -> List[str]:
         """Extract keywords from text (simplified)"""
         # In production, use spaCy or KeyBERT
         # For now, simple word extraction
@@ -383,9 +386,9 @@ Format your response as valid JSON."""
         words = re.findall(r'\b[a-z]{4,}\b', text.lower())
         keywords = [w for w in words if w not in stop_words]
 
-        # Return top 5 most frequent
+        # Return the most frequent
         from collections import Counter
-        return [word for word, count in Counter(keywords).most_common(5)]
+        return [word for word, count in Counter(keywords).most_common(limit)]
 
     async def _create_content_opportunity(self, opportunity: Dict):
         """Store content opportunity in database"""
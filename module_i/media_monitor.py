@@ -11,10 +11,16 @@ from datetime import datetime, timedelta
 import feedparser
 from dataclasses import dataclass, asdict
 import re
-import asyncpg
 import os
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
+from module_ii.keyword_matcher import KeywordMatcher
+from module_ii.near_duplicates import NearDuplicateIndex, canonicalize_url
+from module_ii.poll_scheduler import PollScheduler
+from module_v.article_store import create_article_store
+from module_v.vector_index import get_vector_index
+
 @dataclass
 class NewsArticle:
     """Structured news article data"""
@@ -47,15 +53,27 @@ class MediaMonitor:
     - Chronicle of Higher Education
     """
 
+    DEDUP_WINDOW_DAYS = 7  # How long stored articles absorb near-duplicates
+
+    # Adaptive polling bounds (see monitor_continuous)
+    MIN_POLL_MINUTES = 5
+    MAX_POLL_MINUTES = 360
+    POLLS_PER_HOST = 2
+
     def __init__(self, db_url: str):
         """
         Initialize Media Monitor
 
         Args:
-            db_url: PostgreSQL connection URL
+            db_url: PostgreSQL connection URL, or sqlite:///path for a
+                    local SQLite stand-in
         """
         self.db_url = db_url
-        self.db_pool = None
+        self.article_store = create_article_store(db_url)
+        self.vector_index = get_vector_index()
+        self.poll_scheduler = None
+        self._last_poll_urls: Dict[str, set] = {}
+        self._process_lock = asyncio.Lock()
 
         # Configure news sources
         self.sources = {
@@ -115,46 +133,121 @@ class MediaMonitor:
             "future of college sports", "sports business",
             "NCAA reform", "athlete compensation"
         ]
+        self._keyword_matcher = KeywordMatcher(self.keywords)
+
+        # Fingerprints of recently stored articles; syndicated copies merge
+        # into the first stored article instead of becoming new rows
+        self.dedup_index = NearDuplicateIndex(
+            threshold=float(os.getenv("ARTICLE_DUPLICATE_THRESHOLD", "0.5")),
+            window_seconds=self.DEDUP_WINDOW_DAYS * 86400
+        )
 
     async def initialize(self):
-        """Initialize database connection pool"""
-        self.db_pool = await asyncpg.create_pool(self.db_url, min_size=2, max_size=10)
+        """Initialize article storage"""
+        await self.article_store.initialize()
+        await self._load_recent_fingerprints()
+        if not self.vector_index.ids("article"):
+            await self.rebuild_vector_index()
+
+    async def _load_recent_fingerprints(self):
+        """Seed the near-duplicate index with articles stored in the dedup window"""
+        try:
+            rows = await self.article_store.recent_articles(self.DEDUP_WINDOW_DAYS)
+        except Exception as e:
+            print(f"[MediaMonitor] Could not load article fingerprints: {e}")
+            return
+
+        for row in rows:
+            self.dedup_index.add(
+                row['article_id'],
+                text=f"{row['title']} {row['content'] or ''}",
+                url=row['url'],
+                added_at=row['created_at'].timestamp()
+            )
+        print(f"[MediaMonitor] Loaded {len(rows)} article fingerprints")
+
+    async def rebuild_vector_index(self) -> int:
+        """
+        Re-index every stored article and drop index entries of deleted ones
+        (also run on startup when the index has no articles)
+
+        Returns:
+            Number of articles indexed
+        """
+        try:
+            rows = await self.article_store.all_articles()
+        except Exception as e:
+            print(f"[MediaMonitor] Could not load articles for the similarity index: {e}")
+            return 0
+
+        existing = {row['article_id'] for row in rows}
+        for article_id in self.vector_index.ids("article"):
+            if article_id not in existing:
+                self.vector_index.remove("article", article_id)
+
+        indexed = await asyncio.to_thread(self.vector_index.add_many, [
+            ("article", row['article_id'], f"{row['title']} {row['content'] or ''}")
+            for row in rows
+        ])
+        print(f"[MediaMonitor] Indexed {indexed} articles for similarity search")
+        return indexed
 
     async def close(self):
-        """Close database connection pool"""
-        if self.db_pool:
-            await self.db_pool.close()
+        """Close article storage"""
+        await self.article_store.close()
 
     async def monitor_continuous(self, interval_minutes: int = 30):
         """
         Continuous monitoring loop
 
+        Each source is polled on its own schedule: it starts at
+        interval_minutes, then adapts to how often the source publishes
+        (between MIN_POLL_MINUTES and MAX_POLL_MINUTES), backs off
+        exponentially on errors, and at most POLLS_PER_HOST fetches run
+        against one host at a time.
+
         Args:
-            interval_minutes: Check interval (default 30 min)
+            interval_minutes: Starting interval per source (default 30 min)
+        """
+        print(f"[MediaMonitor] Starting continuous monitoring (initial interval: {interval_minutes} min)")
+
+        self.poll_scheduler = PollScheduler(
+            min_interval=self.MIN_POLL_MINUTES * 60,
+            max_interval=self.MAX_POLL_MINUTES * 60,
+            per_host_limit=self.POLLS_PER_HOST
+        )
+        for source_name, config in self.sources.items():
+            self.poll_scheduler.add_source(
+                source_name,
+                host=urlsplit(config.get("rss", config["url"])).hostname,
+                interval=interval_minutes * 60
+            )
+
+        async with aiohttp.ClientSession() as session:
+            await self.poll_scheduler.run(lambda source_name: self._poll_source(source_name, session))
+
+    async def _poll_source(self, source_name: str, session: aiohttp.ClientSession) -> Optional[int]:
         """
-        print(f"[MediaMonitor] Starting continuous monitoring (interval: {interval_minutes} min)")
+        Fetch, filter and store one source
 
-        while True:
-            try:
-                print(f"[MediaMonitor] Fetching articles at {datetime.utcnow().isoformat()}")
+        Returns:
+            Articles not present on the previous poll (None on the first poll)
+        """
+        articles = await self.fetch_source(source_name, self.sources[source_name], session, raise_errors=True)
 
-                # Fetch all sources
-                articles = await self.fetch_all_sources()
-                print(f"[MediaMonitor] Fetched {len(articles)} total articles")
+        urls = {canonicalize_url(article.url) for article in articles}
+        previous = self._last_poll_urls.get(source_name)
+        self._last_poll_urls[source_name] = urls
 
-                # Filter for relevance
-                relevant_articles = self.filter_relevant(articles)
-                print(f"[MediaMonitor] {len(relevant_articles)} relevant articles found")
+        relevant_articles = self.filter_relevant(articles)
+        print(f"[MediaMonitor] {source_name}: {len(articles)} fetched, {len(relevant_articles)} relevant")
 
-                # Process and store
+        if relevant_articles:
+            # One batch at a time so concurrent sources see each other's articles in the dedup index
+            async with self._process_lock:
                 await self.process_articles(relevant_articles)
 
-                print(f"[MediaMonitor] Sleeping for {interval_minutes} minutes")
-                await asyncio.sleep(interval_minutes * 60)
-
-            except Exception as e:
-                print(f"[MediaMonitor] ERROR: {e}")
-                await asyncio.sleep(60)  # Retry after 1 min on error
+        return None if previous is None else len(urls - previous)
 
     async def fetch_all_sources(self) -> List[NewsArticle]:
         """Fetch articles from all configured sources"""
@@ -179,27 +272,34 @@ class MediaMonitor:
         self,
         source_name: str,
         config: dict,
-        session: aiohttp.ClientSession
+        session: aiohttp.ClientSession,
+        raise_errors: bool = False
     ) -> List[NewsArticle]:
-        """Fetch articles from a single source"""
+        """Fetch articles from a single source (raise_errors: propagate fetch failures)"""
 
         try:
             if config["type"] == "rss":
-                return await self.fetch_rss(source_name, config.get("rss", config.get("url")))
+                return await self.fetch_rss(source_name, config.get("rss", config.get("url")), raise_errors)
             elif config["type"] == "scrape":
-                return await self.fetch_scrape(source_name, config["url"], session)
+                return await self.fetch_scrape(source_name, config["url"], session, raise_errors)
         except Exception as e:
             print(f"[MediaMonitor] Error fetching {source_name}: {e}")
+            if raise_errors:
+                raise
 
         return []
 
-    async def fetch_rss(self, source_name: str, url: str) -> List[NewsArticle]:
+    async def fetch_rss(self, source_name: str, url: str, raise_errors: bool = False) -> List[NewsArticle]:
         """Fetch RSS feed"""
         try:
             # Run feedparser in executor to avoid blocking
             loop = asyncio.get_event_loop()
             feed = await loop.run_in_executor(None, feedparser.parse, url)
 
+            # feedparser reports network and parse failures instead of raising
+            if not feed.entries and feed.get("bozo"):
+                raise feed.get("bozo_exception") or RuntimeError("unreadable feed")
+
             articles = []
 
             for entry in feed.entries[:20]:  # Latest 20
@@ -219,19 +319,24 @@ class MediaMonitor:
 
         except Exception as e:
             print(f"[MediaMonitor] RSS fetch error for {source_name}: {e}")
+            if raise_errors:
+                raise
             return []
 
     async def fetch_scrape(
         self,
         source_name: str,
         url: str,
-        session: aiohttp.ClientSession
+        session: aiohttp.ClientSession,
+        raise_errors: bool = False
     ) -> List[NewsArticle]:
         """Scrape articles from website"""
         try:
             async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
                 if response.status != 200:
                     print(f"[MediaMonitor] HTTP {response.status} for {source_name}")
+                    if raise_errors:
+                        raise RuntimeError(f"HTTP {response.status}")
                     return []
 
                 html = await response.text()
@@ -247,6 +352,8 @@ class MediaMonitor:
 
         except Exception as e:
             print(f"[MediaMonitor] Scrape error for {source_name}: {e}")
+            if raise_errors:
+                raise
             return []
 
     def filter_relevant(self, articles: List[NewsArticle]) -> List[NewsArticle]:
@@ -275,10 +382,10 @@ class MediaMonitor:
     def _calculate_relevance_score(self, article: NewsArticle) -> float:
         """Calculate relevance score (0-1)"""
         score = 0.0
-        text = f"{article.title} {article.content}".lower()
+        text = f"{article.title} {article.content}"
 
-        # Keyword matching (40% of score)
-        keyword_matches = sum(1 for kw in self.keywords if kw.lower() in text)
+        # Keyword matching (40% of score): distinct keywords present
+        keyword_matches = len(self._keyword_matcher.distinct(text)[KeywordMatcher.DEFAULT_CATEGORY])
         score += (keyword_matches / len(self.keywords)) * 0.4
 
         # Recency (30% of score)
@@ -293,79 +400,93 @@ class MediaMonitor:
 
         return min(score, 1.0)
 
-    async def process_articles(self, articles: List[NewsArticle]):
-        """Process relevant articles for content opportunities"""
+    async def process_articles(self, articles: List[NewsArticle]) -> Dict[str, int]:
+        """
+        Process relevant articles for content opportunities
+
+        Articles whose canonical URL or text matches a recently stored
+        article (or an earlier one in this batch) are merged into that
+        article's cluster. The rest are ingested in one batch: only URLs
+        not already stored are inserted, and each inserted article gets a
+        content opportunity in the same transaction.
+
+        Returns:
+            {canonical url: article_id} for the articles inserted
+        """
+        pending = []     # (index key, article, signature) awaiting insert
+        duplicates = []  # (index key of the cluster, article)
+
         for article in articles:
+            signature = self.dedup_index.signature(f"{article.title} {article.content}")
+
+            match = self.dedup_index.find(url=article.url, signature=signature)
+            if match:
+                duplicates.append((match.key, article))
+                continue
+
             # Extract key entities (simplified - would use spaCy in production)
             article.key_entities = self._extract_entities(article)
 
-            # Store in database
-            await self._store_article(article)
-
-            # Create content opportunity
-            await self._create_content_opportunity(article)
-
-    async def _store_article(self, article: NewsArticle):
-        """Store article in database"""
-        async with self.db_pool.acquire() as conn:
-            try:
-                await conn.execute("""
-                    INSERT INTO news_articles (
-                        title, url, source, published_date, content,
-                        categories, relevance_score, key_entities
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    ON CONFLICT (url) DO UPDATE SET
-                        relevance_score = EXCLUDED.relevance_score,
-                        updated_at = NOW()
-                """,
-                    article.title,
-                    article.url,
-                    article.source,
-                    article.published_date,
-                    article.content,
-                    article.categories,
-                    article.relevance_score,
-                    article.key_entities
-                )
-            except Exception as e:
-                print(f"[MediaMonitor] Database error storing article: {e}")
-
-    async def _create_content_opportunity(self, article: NewsArticle):
-        """Create content opportunity for Module II"""
-        async with self.db_pool.acquire() as conn:
-            # Get article_id
-            row = await conn.fetchrow("SELECT article_id FROM news_articles WHERE url = $1", article.url)
-            if not row:
-                return
-
-            article_id = row['article_id']
-
-            # Determine urgency
-            urgency = self._assess_urgency(article)
-
-            # Map to pillars
-            pillars = self._map_to_pillars(article)
-
-            # Suggest angle
-            angle = self._suggest_content_angle(article)
-
-            try:
-                await conn.execute("""
-                    INSERT INTO content_opportunities (
-                        type, article_id, suggested_angle, urgency,
-                        pillar_alignment, target_platforms, status
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-                """,
-                    "news_reaction",
-                    article_id,
-                    angle,
-                    urgency,
-                    pillars,
-                    ['linkedin'],  # Default to LinkedIn
-                    'pending'
-                )
-            except Exception as e:
-                print(f"[MediaMonitor] Database error creating opportunity: {e}")
+            # Index under a placeholder key until the insert assigns an article_id
+            key = ("pending", len(pending))
+            self.dedup_index.add(key, url=article.url, signature=signature)
+            pending.append((key, article, signature))
+
+        try:
+            inserted = await self.article_store.ingest(
+                [self._ingestion_record(article) for _, article, _ in pending]
+            )
+        except Exception as e:
+            print(f"[MediaMonitor] Database error ingesting articles: {e}")
+            inserted = {}
+
+        try:
+            await asyncio.to_thread(self.vector_index.add_many, [
+                ("article", inserted[canonicalize_url(article.url)], f"{article.title} {article.content}")
+                for _, article, _ in pending
+                if canonicalize_url(article.url) in inserted
+            ])
+        except Exception as e:
+            print(f"[MediaMonitor] Could not update similarity index: {e}")
+
+        article_ids = {}
+        for key, article, signature in pending:
+            self.dedup_index.remove(key)
+            article_id = inserted.get(canonicalize_url(article.url))
+            if article_id is not None:
+                article_ids[key] = article_id
+                self.dedup_index.add(article_id, url=article.url, signature=signature)
+
+        merges = []
+        for key, article in duplicates:
+            article_id = article_ids.get(key, key)
+            if isinstance(article_id, int):
+                merges.append((article_id, article.url, article.source, article.relevance_score))
+
+        try:
+            await self.article_store.merge_duplicates(merges)
+        except Exception as e:
+            print(f"[MediaMonitor] Database error merging duplicate articles: {e}")
+
+        print(f"[MediaMonitor] Stored {len(inserted)} new articles, merged {len(merges)} duplicates")
+        return inserted
+
+    def _ingestion_record(self, article: NewsArticle) -> Dict:
+        """Article columns plus its content opportunity for batched ingestion"""
+        return {
+            "title": article.title,
+            "url": article.url,
+            "canonical_url": canonicalize_url(article.url),
+            "source": article.source,
+            "published_date": article.published_date,
+            "content": article.content,
+            "categories": article.categories,
+            "relevance_score": article.relevance_score,
+            "key_entities": article.key_entities,
+            "suggested_angle": self._suggest_content_angle(article),
+            "urgency": self._assess_urgency(article),
+            "pillar_alignment": self._map_to_pillars(article)
+        }
 
     def _suggest_content_angle(self, article: NewsArticle) -> str:
         """Suggest how Milton should respond to this news"""
@@ -8,9 +8,22 @@ Transforms insights into polished, voice-authentic content across multiple platf
 from .voice_modeling import VoiceProfileModeler
 from .content_generator import ContentGenerator
 from .quality_assurance import QualityAssurance
+from .llm_client import LLMClient, get_llm_client
+from .llm_cache import LLMResponseCache, get_llm_cache
+from .keyword_matcher import KeywordMatcher
+from .near_duplicates import NearDuplicateIndex, canonicalize_url
+from .poll_scheduler import PollScheduler
 
 __all__ = [
     'VoiceProfileModeler',
     'ContentGenerator',
     'QualityAssurance',
+    'LLMClient',
+    'get_llm_client',
+    'LLMResponseCache',
+    'get_llm_cache',
+    'KeywordMatcher',
+    'NearDuplicateIndex',
+    'canonicalize_url',
+    'PollScheduler',
 ]
@@ -0,0 +1,112 @@
+"""
+Keyword Matcher - Module II
+Compiled multi-keyword matching with per-category counts in one pass
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Union
+
+
+class KeywordMatcher:
+    """
+    Matches many keywords, grouped into categories, in a single scan
+
+    All keywords are compiled into one case-insensitive alternation with
+    word boundaries, so "ai" matches "AI strategy" but not "said", and
+    multi-word phrases tolerate any whitespace between words. The scan is
+    a zero-width lookahead at each word start, so overlapping keywords
+    ("kennesaw state" and "state") are all counted. Build a matcher once
+    per keyword set (e.g. as a class attribute) and reuse it.
+
+    Example:
+        matcher = KeywordMatcher({
+            "ai": ["ai", "artificial intelligence"],
+            "leadership": ["leadership", "vision"]
+        })
+        matcher.count("AI and artificial intelligence need vision")
+        # {"ai": 2, "leadership": 1}
+    """
+
+    DEFAULT_CATEGORY = "keywords"
+
+    def __init__(self, keywords: Union[Dict[str, Iterable[str]], Iterable[str]]):
+        """
+        Compile the matcher
+
+        Args:
+            keywords: {category: [keywords]} or a flat list of keywords
+                      (a single category named "keywords")
+        """
+        if not isinstance(keywords, dict):
+            keywords = {self.DEFAULT_CATEGORY: keywords}
+
+        self.categories: List[str] = list(keywords)
+        self._keyword_categories: Dict[str, List[str]] = defaultdict(list)
+
+        for category, words in keywords.items():
+            for word in words:
+                normalized = self._normalize(word)
+                if normalized and category not in self._keyword_categories[normalized]:
+                    self._keyword_categories[normalized].append(category)
+
+        # A match also credits keywords that are whole-word prefixes of it
+        # ("kennesaw" inside "kennesaw state"); lookahead at later word
+        # starts finds every other overlap
+        self._prefixes: Dict[str, List[str]] = {
+            keyword: [
+                other for other in self._keyword_categories
+                if other != keyword and keyword.startswith(other + " ")
+            ]
+            for keyword in self._keyword_categories
+        }
+
+        # Longest first so the alternation prefers the longest keyword at each start
+        alternation = "|".join(
+            r"\s+".join(re.escape(part) for part in keyword.split(" "))
+            for keyword in sorted(self._keyword_categories, key=len, reverse=True)
+        )
+        self._pattern = re.compile(
+            rf"(?<!\w)(?=({alternation})(?!\w))" if alternation else r"(?!)",
+            re.IGNORECASE
+        )
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def keyword_counts(self, text: str) -> Dict[str, int]:
+        """Occurrences of each matched keyword (lowercased)"""
+        counts: Dict[str, int] = defaultdict(int)
+
+        for match in self._pattern.finditer(text):
+            keyword = self._normalize(match.group(1))
+            counts[keyword] += 1
+            for prefix in self._prefixes[keyword]:
+                counts[prefix] += 1
+
+        return dict(counts)
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Total keyword occurrences per category (every category present, 0 if none)"""
+        totals = {category: 0 for category in self.categories}
+
+        for keyword, occurrences in self.keyword_counts(text).items():
+            for category in self._keyword_categories[keyword]:
+                totals[category] += occurrences
+
+        return totals
+
+    def distinct(self, text: str) -> Dict[str, Set[str]]:
+        """Distinct keywords matched per category"""
+        found = {category: set() for category in self.categories}
+
+        for keyword in self.keyword_counts(text):
+            for category in self._keyword_categories[keyword]:
+                found[category].add(keyword)
+
+        return found
+
+    def matches_any(self, text: str) -> bool:
+        """True if any keyword occurs (stops at the first match)"""
+        return self._pattern.search(text) is not None
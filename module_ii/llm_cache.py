@@ -0,0 +1,311 @@
+"""
+LLM Response Cache - Module II
+Content-addressed cache for Claude responses: in-process LRU over SQLite
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class LLMResponseCache:
+    """
+    Cache of LLM response text keyed by what determines the response
+
+    The key is a hash of (model, prompt hash, temperature, max_tokens), so
+    identical requests from any module share one entry. Lookups check an
+    in-process LRU first, then SQLite; misses call the API and store the
+    result in both. Each call site passes its own TTL and name, and hit
+    rates are tracked per call site.
+
+    Example:
+        cache = get_llm_cache()
+        analysis = cache.complete(
+            client, call_site="news_sentiment", ttl=7 * 86400, parse=json.loads,
+            model="claude-sonnet-4-20250514", max_tokens=300, messages=[...]
+        )
+    """
+
+    PURGE_EVERY = 100  # Writes between sweeps of expired SQLite rows
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        memory_entries: int = 512,
+        max_rows: int = 10000
+    ):
+        """
+        Initialize LLM response cache
+
+        Args:
+            db_path: SQLite file (default: LLM_CACHE_DB env var or the main
+                     database, wherever DatabaseManager resolves it)
+            memory_entries: Entries kept in the in-process LRU
+            max_rows: SQLite rows kept; oldest entries are evicted beyond this
+        """
+        if db_path is None:
+            from module_v.database import default_db_path  # Lazy: module_ii has no other module_v dependency
+            db_path = os.getenv("LLM_CACHE_DB") or default_db_path()
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self.max_rows = max_rows
+
+        self.local = threading.local()
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._writes = 0
+        self._stats = defaultdict(lambda: {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+
+        self._init_table()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get thread-local connection"""
+        if not hasattr(self.local, 'conn'):
+            self.local.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.local.conn.execute("PRAGMA journal_mode=WAL")
+            self.local.conn.execute("PRAGMA busy_timeout=5000")
+        return self.local.conn
+
+    def _init_table(self):
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    call_site TEXT,
+                    model TEXT,
+                    response_text TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at)")
+
+    # ========================================================================
+    # KEYS
+    # ========================================================================
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: list,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system: Any = None
+    ) -> str:
+        """
+        Content address for a request
+
+        The prompt (system + messages) is hashed canonically, then combined
+        with the sampling parameters that change the response.
+        """
+        prompt = json.dumps({"system": system, "messages": messages}, sort_keys=True, ensure_ascii=False)
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+        key = json.dumps([model, prompt_hash, temperature, max_tokens])
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    # ========================================================================
+    # LOOKUP / STORE
+    # ========================================================================
+
+    def get(self, key: str, call_site: str = "default") -> Optional[str]:
+        """Cached response text, or None if missing or expired"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                text, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats[call_site]["memory_hits"] += 1
+                    return text
+                del self._memory[key]
+
+        row = self._get_connection().execute(
+            "SELECT response_text, expires_at FROM llm_cache WHERE cache_key = ? AND expires_at > ?",
+            (key, now)
+        ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self._stats[call_site]["misses"] += 1
+                return None
+
+            self._stats[call_site]["disk_hits"] += 1
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def put(self, key: str, text: str, ttl: float, call_site: str = "default", model: Optional[str] = None):
+        """Store response text for ttl seconds"""
+        now = time.time()
+        expires_at = now + ttl
+
+        with self._lock:
+            self._remember(key, text, expires_at)
+            self._writes += 1
+            purge = self._writes % self.PURGE_EVERY == 0
+
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO llm_cache
+                    (cache_key, call_site, model, response_text, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (key, call_site, model, text, now, expires_at))
+
+        if purge:
+            self.purge()
+
+    def _remember(self, key: str, text: str, expires_at: float):
+        """Insert into the LRU, evicting the least recently used entry (caller holds lock)"""
+        self._memory[key] = (text, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def invalidate(self, key: str):
+        """Drop one entry"""
+        with self._lock:
+            self._memory.pop(key, None)
+
+        conn = self._get_connection()
+        with conn:
+            conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+
+    def purge(self) -> int:
+        """
+        Delete expired rows, then the oldest rows beyond max_rows
+
+        Returns:
+            Number of rows deleted
+        """
+        conn = self._get_connection()
+        with conn:
+            deleted = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            deleted += conn.execute("""
+                DELETE FROM llm_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_cache
+                    ORDER BY created_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+            """, (self.max_rows,)).rowcount
+        return deleted
+
+    # ========================================================================
+    # CACHED CALLS
+    # ========================================================================
+
+    def complete(
+        self,
+        client,
+        call_site: str,
+        ttl: float,
+        parse: Optional[Callable[[str], Any]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        messages.create through the cache
+
+        Args:
+            client: Anthropic client used on a miss
+            call_site: Name for per-call-site metrics
+            ttl: Seconds a response stays valid
+            parse: Optional parser applied to the text; a response it
+                   rejects (raises) is not cached and the error propagates
+            **kwargs: Arguments for messages.create
+
+        Returns:
+            Response text (or parse(text) if parse is given)
+        """
+        key = self.request_key(**kwargs)
+
+        text = self.get(key, call_site)
+        if text is not None:
+            return parse(text) if parse else text
+
+        response = client.messages.create(**kwargs)
+        text = response.content[0].text
+
+        result = parse(text) if parse else text
+        self.put(key, text, ttl, call_site, kwargs["model"])
+        return result
+
+    async def acomplete(
+        self,
+        create: Callable[..., Awaitable],
+        call_site: str,
+        ttl: float,
+        parse: Optional[Callable[[str], Any]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Async counterpart of complete()
+
+        Args:
+            create: Coroutine function called on a miss (e.g. LLMClient.create_message)
+            call_site, ttl, parse, **kwargs: As for complete()
+        """
+        key = self.request_key(**kwargs)
+
+        text = self.get(key, call_site)
+        if text is not None:
+            return parse(text) if parse else text
+
+        response = await create(**kwargs)
+        text = response.content[0].text
+
+        result = parse(text) if parse else text
+        self.put(key, text, ttl, call_site, kwargs["model"])
+        return result
+
+    def request_key(self, **kwargs) -> str:
+        """make_key() for messages.create keyword arguments"""
+        return self.make_key(
+            kwargs["model"], kwargs["messages"],
+            kwargs.get("temperature"), kwargs.get("max_tokens"), kwargs.get("system")
+        )
+
+    # ========================================================================
+    # METRICS
+    # ========================================================================
+
+    def get_metrics(self) -> Dict:
+        """Hit/miss counts and hit rate per call site and overall"""
+        with self._lock:
+            stats = {site: dict(counts) for site, counts in self._stats.items()}
+            memory_entries = len(self._memory)
+
+        def with_rate(counts: Dict) -> Dict:
+            hits = counts["memory_hits"] + counts["disk_hits"]
+            lookups = hits + counts["misses"]
+            return {**counts, "hit_rate": round(hits / lookups, 3) if lookups else None}
+
+        total = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        for counts in stats.values():
+            for name in total:
+                total[name] += counts[name]
+
+        return {
+            "memory_entries": memory_entries,
+            "overall": with_rate(total),
+            "call_sites": {site: with_rate(counts) for site, counts in stats.items()}
+        }
+
+
+# Singleton instance
+_llm_cache_instance = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get singleton LLM response cache"""
+    global _llm_cache_instance
+    if _llm_cache_instance is None:
+        _llm_cache_instance = LLMResponseCache()
+    return _llm_cache_instance
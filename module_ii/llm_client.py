@@ -0,0 +1,251 @@
+"""
+LLM Client Factory - Module II
+Shared Anthropic clients with a global cap on concurrent LLM calls
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from anthropic import Anthropic, AsyncAnthropic
+
+
+class LLMCallMetrics:
+    """
+    Queue-time and generation-time statistics for LLM calls
+
+    Queue time is spent waiting for a concurrency slot; generation time is
+    the API call itself. Percentiles cover the most recent samples, which
+    is what matters when sizing LLM_MAX_CONCURRENCY.
+    """
+
+    def __init__(self, window: int = 500):
+        """
+        Initialize metrics
+
+        Args:
+            window: Recent calls kept for percentile estimates
+        """
+        self._lock = threading.Lock()
+        self._queue_times = deque(maxlen=window)
+        self._generation_times = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.waiting = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def call_queued(self):
+        with self._lock:
+            self.waiting += 1
+
+    def call_abandoned(self):
+        with self._lock:
+            self.waiting -= 1
+
+    def call_started(self, queue_seconds: float):
+        with self._lock:
+            self.waiting -= 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self._queue_times.append(queue_seconds)
+
+    def call_finished(self, generation_seconds: float, error: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            self.calls += 1
+            if error:
+                self.errors += 1
+            self._generation_times.append(generation_seconds)
+
+    @staticmethod
+    def _summarize(samples) -> Dict:
+        if not samples:
+            return {"avg_ms": None, "p50_ms": None, "p95_ms": None, "max_ms": None}
+
+        ordered = sorted(samples)
+        return {
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1)
+        }
+
+    def snapshot(self) -> Dict:
+        """Current counters plus recent queue/generation time percentiles"""
+        with self._lock:
+            queue_times = list(self._queue_times)
+            generation_times = list(self._generation_times)
+            counters = {
+                "calls": self.calls,
+                "errors": self.errors,
+                "waiting": self.waiting,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight
+            }
+
+        return {
+            **counters,
+            "queue_time": self._summarize(queue_times),
+            "generation_time": self._summarize(generation_times)
+        }
+
+
+class LLMClient:
+    """
+    Process-wide access point for Anthropic API calls
+
+    Holds one AsyncAnthropic client per event loop (and one sync Anthropic
+    client) so connection pools are shared, and funnels async calls
+    through a semaphore so at most max_concurrency requests are in flight
+    at once. Extra callers wait for a slot without blocking the event loop.
+    An async client's pool is bound to the loop that opened it, so code
+    that calls asyncio.run() repeatedly should await close() before each
+    run ends.
+
+    Example:
+        llm = get_llm_client()
+        response = await llm.create_message(model=..., messages=[...])
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        async_client: Optional[AsyncAnthropic] = None
+    ):
+        """
+        Initialize LLM client
+
+        Args:
+            api_key: Anthropic API key (default: ANTHROPIC_API_KEY env var)
+            max_concurrency: Concurrent async calls allowed
+                             (default: LLM_MAX_CONCURRENCY env var or 4)
+            async_client: Pre-built async client used on every loop
+                          (default: one created per event loop on first use)
+        """
+        self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+        self.metrics = LLMCallMetrics()
+
+        self._async_client = async_client
+        self._loop_clients: Dict[asyncio.AbstractEventLoop, AsyncAnthropic] = {}
+        self._sync_client = None
+        self._client_lock = threading.Lock()
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    @property
+    def async_client(self) -> AsyncAnthropic:
+        """Shared AsyncAnthropic client for the running event loop"""
+        if self._async_client is not None:
+            return self._async_client
+
+        loop = asyncio.get_running_loop()
+        with self._client_lock:
+            client = self._loop_clients.get(loop)
+            if client is None:
+                # Clients of loops that ended without close() can only be dropped
+                for stale in [other for other in self._loop_clients if other.is_closed()]:
+                    del self._loop_clients[stale]
+                client = self._loop_clients[loop] = AsyncAnthropic(api_key=self.api_key)
+        return client
+
+    async def close(self):
+        """Close the running event loop's AsyncAnthropic client"""
+        with self._client_lock:
+            client = self._loop_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    @property
+    def sync_client(self) -> Anthropic:
+        """Shared synchronous Anthropic client (for non-async modules)"""
+        if self._sync_client is None:
+            with self._client_lock:
+                if self._sync_client is None:
+                    self._sync_client = Anthropic(api_key=self.api_key)
+        return self._sync_client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @contextlib.asynccontextmanager
+    async def _slot(self):
+        """Hold one concurrency slot, recording queue and generation time"""
+        semaphore = self._get_semaphore()
+
+        queued_at = time.perf_counter()
+        self.metrics.call_queued()
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            # Cancelled while waiting for a slot
+            self.metrics.call_abandoned()
+            raise
+
+        started_at = time.perf_counter()
+        self.metrics.call_started(started_at - queued_at)
+
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            semaphore.release()
+            self.metrics.call_finished(time.perf_counter() - started_at, error=failed)
+
+    async def create_message(self, **kwargs):
+        """
+        Call messages.create once a concurrency slot is free
+
+        Takes the same keyword arguments as AsyncAnthropic.messages.create.
+        """
+        async with self._slot():
+            return await self.async_client.messages.create(**kwargs)
+
+    @contextlib.asynccontextmanager
+    async def stream_message(self, **kwargs):
+        """
+        Stream a message once a concurrency slot is free
+
+        Takes the same keyword arguments as AsyncAnthropic.messages.stream
+        and yields its message stream; the slot is held until the block exits.
+
+        Example:
+            async with llm.stream_message(model=..., messages=[...]) as stream:
+                async for text in stream.text_stream:
+                    ...
+                message = await stream.get_final_message()
+        """
+        async with self._slot():
+            async with self.async_client.messages.stream(**kwargs) as stream:
+                yield stream
+
+    def get_metrics(self) -> Dict:
+        """Concurrency limit plus call metrics"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            **self.metrics.snapshot()
+        }
+
+
+# Singleton instance
+_llm_client_instance = None
+
+
+def get_llm_client() -> LLMClient:
+    """Get singleton LLM client"""
+    global _llm_client_instance
+    if _llm_client_instance is None:
+        _llm_client_instance = LLMClient()
+    return _llm_client_instance
@@ -0,0 +1,319 @@
+"""
+Near-Duplicate Detection - Module II
+URL canonicalization plus MinHash/LSH fingerprints of recent articles
+"""
+
+import hashlib
+import re
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+
+# Query parameters that identify the referrer, not the document
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "cmpid", "s_cid", "_ga", "outputtype", "amp"
+}
+TRACKING_PREFIXES = ("utm_",)
+
+_HOST_PREFIXES = ("www.", "m.", "amp.")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL
+
+    Lowercases the host, drops "www."/"m."/"amp." prefixes, default
+    ports, fragments, tracking parameters and AMP suffixes, sorts the
+    remaining query parameters and treats http and https as the same
+    document. Strings that are not absolute URLs are returned stripped.
+
+    Example:
+        canonicalize_url("http://WWW.ncaa.org/news/story/?utm_source=x#top")
+        # "https://ncaa.org/news/story"
+    """
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower() or "https"
+    if scheme == "http":
+        scheme = "https"
+
+    host = (parts.hostname or "").rstrip(".")
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in _DEFAULT_PORTS.values():
+        host = f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path)
+    path = re.sub(r"/amp/?$", "", path).rstrip("/")
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+@dataclass
+class DuplicateMatch:
+    """An indexed document a new one duplicates"""
+    key: Hashable
+    similarity: float
+    exact_url: bool = False
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of recently seen documents
+
+    Each document is reduced to word shingles and a MinHash signature;
+    the signature is split into bands, and documents sharing any band
+    bucket are candidates. Candidates are confirmed by estimated Jaccard
+    similarity, so a lookup touches a handful of documents rather than
+    the whole window. Canonical URLs are indexed too, so a re-fetched
+    story matches exactly before any hashing. Entries older than
+    window_seconds are dropped.
+
+    Example:
+        index = NearDuplicateIndex()
+        match = index.find(text=story, url=link)
+        if match is None:
+            index.add(article_id, text=story, url=link)
+    """
+
+    _PRIME = (1 << 61) - 1
+    _MAX_HASH = (1 << 32) - 1
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 3,
+        window_seconds: float = 7 * 86400,
+        seed: int = 1
+    ):
+        """
+        Initialize near-duplicate index
+
+        Args:
+            threshold: Estimated Jaccard similarity that counts as a duplicate
+            num_perm: MinHash permutations (signature length)
+            bands: LSH bands; num_perm must divide evenly into them
+            shingle_size: Words per shingle
+            window_seconds: How long documents stay in the index
+            seed: Seed for the permutation coefficients
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.window_seconds = window_seconds
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, self._MAX_HASH, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, self._MAX_HASH, size=num_perm, dtype=np.uint64)
+
+        # key -> (signature, canonical url, added_at); insertion order is age order
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._buckets: List[Dict[bytes, Set[Hashable]]] = [defaultdict(set) for _ in range(bands)]
+        self._urls: Dict[str, Hashable] = {}
+        self._stats = {"lookups": 0, "url_matches": 0, "near_matches": 0}
+
+    # ========================================================================
+    # FINGERPRINTS
+    # ========================================================================
+
+    def shingles(self, text: str) -> Set[str]:
+        """Word shingles of normalized text"""
+        words = re.findall(r"\w+", (text or "").lower())
+        if len(words) < self.shingle_size:
+            return {" ".join(words)} if words else set()
+
+        return {
+            " ".join(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of text (None for text without words)"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+             for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+
+        # (a * h + b) mod p for every shingle x permutation; h, a, b < 2^32 so no overflow
+        permuted = (np.outer(hashes, self._a) + self._b) % np.uint64(self._PRIME)
+        return (permuted & np.uint64(self._MAX_HASH)).min(axis=0)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.mean(first == second))
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    # ========================================================================
+    # INDEX
+    # ========================================================================
+
+    def find(
+        self,
+        text: Optional[str] = None,
+        url: Optional[str] = None,
+        signature: Optional[np.ndarray] = None,
+        now: Optional[float] = None
+    ) -> Optional[DuplicateMatch]:
+        """
+        Most similar indexed document at or above the threshold
+
+        Args:
+            text: Document text (ignored if signature is given)
+            url: Document URL, canonicalized before lookup
+            signature: Precomputed signature
+            now: Current time for expiry (default: time.time())
+
+        Returns:
+            DuplicateMatch, or None if the document is new
+        """
+        self.expire(now)
+        self._stats["lookups"] += 1
+
+        if url:
+            key = self._urls.get(canonicalize_url(url))
+            if key is not None:
+                self._stats["url_matches"] += 1
+                return DuplicateMatch(key=key, similarity=1.0, exact_url=True)
+
+        if signature is None:
+            signature = self.signature(text)
+        if signature is None:
+            return None
+
+        candidates: Set[Hashable] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        best = None
+        for key in candidates:
+            score = self.similarity(signature, self._entries[key][0])
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = DuplicateMatch(key=key, similarity=score)
+
+        if best is not None:
+            self._stats["near_matches"] += 1
+        return best
+
+    def add(
+        self,
+        key: Hashable,
+        text: Optional[str] = None,
+        url: Optional[str] = None,
+        signature: Optional[np.ndarray] = None,
+        added_at: Optional[float] = None
+    ) -> bool:
+        """
+        Index a document under key (replacing any previous entry for key)
+
+        Args:
+            key: Identifier returned in matches (e.g. article_id)
+            text: Document text (ignored if signature is given)
+            url: Document URL, canonicalized before indexing
+            signature: Precomputed signature
+            added_at: Time the document was seen (default: time.time());
+                      must not precede earlier adds, since expire() walks
+                      entries in insertion order
+
+        Returns:
+            False if there was nothing to index (no words and no URL)
+        """
+        if signature is None:
+            signature = self.signature(text)
+        canonical = canonicalize_url(url) if url else None
+        if signature is None and not canonical:
+            return False
+
+        self.remove(key)
+        self._entries[key] = (signature, canonical, time.time() if added_at is None else added_at)
+
+        if signature is not None:
+            for band, band_key in enumerate(self._band_keys(signature)):
+                self._buckets[band][band_key].add(key)
+        if canonical:
+            self._urls[canonical] = key
+
+        return True
+
+    def remove(self, key: Hashable):
+        """Drop one document"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        signature, canonical, _ = entry
+        if signature is not None:
+            for band, band_key in enumerate(self._band_keys(signature)):
+                bucket = self._buckets[band].get(band_key)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._buckets[band][band_key]
+        if canonical and self._urls.get(canonical) == key:
+            del self._urls[canonical]
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Drop documents older than the window
+
+        Returns:
+            Number of documents dropped
+        """
+        cutoff = (time.time() if now is None else now) - self.window_seconds
+        expired = 0
+        while self._entries:
+            # Oldest first, so stop at the first entry still in the window
+            key, (_, _, added_at) = next(iter(self._entries.items()))
+            if added_at >= cutoff:
+                break
+            self.remove(key)
+            expired += 1
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size and lookup/match counts"""
+        return {"documents": len(self._entries), **self._stats}
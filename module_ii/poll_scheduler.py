@@ -0,0 +1,280 @@
+"""
+Poll Scheduler - Module II
+Adaptive per-source polling: next-due priority queue, backoff, jitter, per-host caps
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass
+class SourceSchedule:
+    """Polling state of one source"""
+    name: str
+    host: str
+    interval: float
+    next_due: float = 0.0
+    publish_rate: Optional[float] = None  # EWMA of new items per second
+    failures: int = 0
+    last_success: Optional[float] = None
+    polls: int = 0
+    errors: int = 0
+    new_items: int = 0
+    version: int = field(default=0, repr=False)
+
+
+class PollScheduler:
+    """
+    Decides when each source is fetched next
+
+    Sources sit in a min-heap keyed by next-due time. After a successful
+    poll the interval adapts to the source's observed publish rate (an
+    EWMA of new items per second): the next poll is due when about
+    target_new_items new items are expected, clamped to
+    [min_interval, max_interval]. Failures retry after min_interval,
+    doubling with each consecutive failure up to max_interval. Every delay gets +/- jitter so sources drift
+    apart instead of firing together, and at most per_host_limit polls
+    run against one host at a time.
+
+    Example:
+        scheduler = PollScheduler(min_interval=300, max_interval=6 * 3600)
+        scheduler.add_source("techcrunch_ai", "techcrunch.com", interval=1800)
+        await scheduler.run(poll)  # poll(name) -> new item count (None if unknown)
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 300,
+        max_interval: float = 6 * 3600,
+        target_new_items: float = 1.0,
+        rate_smoothing: float = 0.3,
+        jitter: float = 0.1,
+        per_host_limit: int = 2,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize poll scheduler
+
+        Args:
+            min_interval: Shortest delay between polls of a source (seconds)
+            max_interval: Longest delay, also the cap on error backoff
+            target_new_items: New items a source should have when polled
+            rate_smoothing: EWMA weight of the latest publish-rate sample
+            jitter: Relative random spread applied to every delay
+            per_host_limit: Concurrent polls allowed per host
+            clock: Time source (seconds)
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new_items = target_new_items
+        self.rate_smoothing = rate_smoothing
+        self.jitter = jitter
+        self.per_host_limit = per_host_limit
+        self.clock = clock
+
+        self.sources: Dict[str, SourceSchedule] = {}
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._semaphore_loop = None
+
+    # ========================================================================
+    # QUEUE
+    # ========================================================================
+
+    def add_source(self, name: str, host: str, interval: Optional[float] = None, due_in: float = 0.0):
+        """
+        Register a source (due immediately unless due_in is given)
+
+        Args:
+            name: Source name passed to the poll callback
+            host: Host used for the per-host concurrency cap
+            interval: Starting interval before any rate is observed
+            due_in: Seconds until the first poll
+        """
+        interval = self._clamp(interval or self.min_interval)
+        self.sources[name] = SourceSchedule(name=name, host=host, interval=interval)
+        self._schedule(self.sources[name], self.clock() + due_in)
+
+    def _schedule(self, source: SourceSchedule, due: float):
+        source.version += 1
+        source.next_due = due
+        heapq.heappush(self._heap, (due, next(self._sequence), source.name, source.version))
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Remove and return every source due at now (each stays out until rescheduled)"""
+        now = self.clock() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, name, version = heapq.heappop(self._heap)
+            source = self.sources.get(name)
+            if source is not None and source.version == version:
+                due.append(name)
+        return due
+
+    def seconds_until_next(self, now: Optional[float] = None) -> Optional[float]:
+        """Delay until the earliest queued source is due (None if the queue is empty)"""
+        now = self.clock() if now is None else now
+        while self._heap:
+            due, _, name, version = self._heap[0]
+            source = self.sources.get(name)
+            if source is not None and source.version == version:
+                return max(0.0, due - now)
+            heapq.heappop(self._heap)  # Stale entry
+        return None
+
+    # ========================================================================
+    # ADAPTATION
+    # ========================================================================
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def record_success(self, name: str, new_items: Optional[int], now: Optional[float] = None) -> float:
+        """
+        Update the publish rate after a poll and schedule the next one
+
+        Args:
+            name: Source name
+            new_items: Items not seen on the previous poll (None if unknown,
+                       e.g. the first poll, which leaves the rate unchanged)
+            now: Poll completion time
+
+        Returns:
+            Seconds until the next poll
+        """
+        now = self.clock() if now is None else now
+        source = self.sources[name]
+        source.polls += 1
+        source.failures = 0
+
+        if new_items is not None and source.last_success is not None:
+            source.new_items += new_items
+            elapsed = max(now - source.last_success, 1.0)
+            sample = new_items / elapsed
+            if source.publish_rate is None:
+                source.publish_rate = sample
+            else:
+                source.publish_rate += self.rate_smoothing * (sample - source.publish_rate)
+
+            if source.publish_rate > 0:
+                source.interval = self._clamp(self.target_new_items / source.publish_rate)
+            else:
+                source.interval = self.max_interval
+
+        source.last_success = now
+        delay = self._jittered(source.interval)
+        self._schedule(source, now + delay)
+        return delay
+
+    def record_failure(self, name: str, now: Optional[float] = None) -> float:
+        """
+        Back off exponentially after a failed poll
+
+        Returns:
+            Seconds until the retry
+        """
+        now = self.clock() if now is None else now
+        source = self.sources[name]
+        source.polls += 1
+        source.errors += 1
+        source.failures += 1
+
+        delay = self._jittered(min(self.max_interval, self.min_interval * 2 ** (source.failures - 1)))
+        self._schedule(source, now + delay)
+        return delay
+
+    # ========================================================================
+    # RUN LOOP
+    # ========================================================================
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        """Per-host semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._host_semaphores = {}
+            self._semaphore_loop = loop
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def _poll_one(self, name: str, poll: Callable[[str], Awaitable[Optional[int]]]):
+        source = self.sources[name]
+        async with self._host_slot(source.host):
+            try:
+                new_items = await poll(name)
+            except Exception as e:
+                delay = self.record_failure(name)
+                print(f"[PollScheduler] {name} failed ({e}); retrying in {delay:.0f}s")
+                return
+        self.record_success(name, new_items)
+
+    async def run(
+        self,
+        poll: Callable[[str], Awaitable[Optional[int]]],
+        stop: Optional[asyncio.Event] = None
+    ):
+        """
+        Poll sources as they come due until stop is set
+
+        Each due source runs as its own task, so a slow source never
+        delays the others; the per-host cap bounds what runs at once.
+
+        Args:
+            poll: Coroutine function taking a source name and returning the
+                  number of new items it found (None if unknown)
+            stop: Event that ends the loop (default: run forever)
+        """
+        stop = stop or asyncio.Event()
+        tasks = set()
+        wakeup = asyncio.Event()
+
+        def finished(task):
+            tasks.discard(task)
+            wakeup.set()  # The finished source is queued again
+
+        try:
+            while not stop.is_set():
+                wakeup.clear()
+                for name in self.pop_due():
+                    task = asyncio.create_task(self._poll_one(name, poll))
+                    tasks.add(task)
+                    task.add_done_callback(finished)
+
+                delay = self.seconds_until_next()
+                waiters = [asyncio.ensure_future(stop.wait()), asyncio.ensure_future(wakeup.wait())]
+                await asyncio.wait(waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                for waiter in waiters:
+                    waiter.cancel()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Interval, rate and counters per source"""
+        now = self.clock()
+        return {
+            name: {
+                "host": source.host,
+                "interval_seconds": round(source.interval, 1),
+                "due_in_seconds": round(max(0.0, source.next_due - now), 1),
+                "publish_rate_per_hour": (
+                    None if source.publish_rate is None else round(source.publish_rate * 3600, 3)
+                ),
+                "polls": source.polls,
+                "errors": source.errors,
+                "consecutive_failures": source.failures,
+                "new_items": source.new_items
+            }
+            for name, source in self.sources.items()
+        }
@@ -9,6 +9,9 @@ import json
 from anthropic import Anthropic
 import asyncpg
 
+from .keyword_matcher import KeywordMatcher
+from .llm_cache import get_llm_cache
+
 
 class QualityAssurance:
     """
@@ -22,6 +25,22 @@ class QualityAssurance:
     - Readability
     """
 
+    # Brand pillars and signals scored by check_brand_alignment
+    PILLARS = ["AI Innovation", "Leadership", "Future of Sports"]
+    BRAND_MATCHER = KeywordMatcher({
+        "AI Innovation": ["ai", "artificial intelligence", "technology", "innovation", "data", "avatar", "synthesia", "heygen", "automation", "digital"],
+        "Leadership": ["leadership", "strategy", "vision", "culture", "team", "executive", "management", "organizational"],
+        "Future of Sports": ["future", "nil", "conference", "trend", "changing", "evolution", "reform", "ncaa"],
+        "innovator": ["first", "innovative", "pioneering", "leading", "ahead"],
+        "donor": ["donor", "fundraising"],
+        "ksu": ["ksu", "keuka"],
+        "generic": ["excited to announce", "thrilled to share", "honored to", "humbled"]
+    })
+
+    # Voice verdicts only change when the text or voice profile changes,
+    # and either change produces a different prompt
+    VOICE_CHECK_CACHE_TTL = 30 * 24 * 3600
+
     def __init__(self, anthropic_api_key: str, db_url: str):
         """
         Initialize QA system
@@ -31,6 +50,7 @@ class QualityAssurance:
             db_url: PostgreSQL connection URL
         """
         self.client = Anthropic(api_key=anthropic_api_key)
+        self.llm_cache = get_llm_cache()
         self.db_url = db_url
         self.db_pool = None
         self.voice_profile = {}
@@ -152,23 +172,26 @@ Return JSON:
 }}"""
 
         try:
-            response = self.client.messages.create(
+            def parse(result_text: str) -> Dict:
+                # Extract JSON
+                if "```json" in result_text:
+                    json_str = result_text.split("```json")[1].split("```")[0].strip()
+                else:
+                    json_str = result_text
+
+                return json.loads(json_str)
+
+            return self.llm_cache.complete(
+                self.client,
+                call_site="qa_voice_authenticity",
+                ttl=self.VOICE_CHECK_CACHE_TTL,
+                parse=parse,
                 model="claude-sonnet-4-20250514",
                 max_tokens=800,
                 temperature=0.3,
                 messages=[{"role": "user", "content": prompt}]
             )
 
-            result_text = response.content[0].text
-
-            # Extract JSON
-            if "```json" in result_text:
-                json_str = result_text.split("```json")[1].split("```")[0].strip()
-            else:
-                json_str = result_text
-
-            return json.loads(json_str)
-
         except Exception as e:
             print(f"[QA] Voice authenticity check error: {e}")
             # Return conservative score on error
@@ -194,28 +217,22 @@ Return JSON:
         aligned_pillars = []
         concerns = []
 
-        text_lower = text.lower()
+        # One pass counts every pillar and signal category
+        matches = self.BRAND_MATCHER.count(text)
 
         # Check pillar alignment
-        pillar_keywords = {
-            "AI Innovation": ["ai", "artificial intelligence", "technology", "innovation", "data", "avatar", "synthesia", "heygen", "automation", "digital"],
-            "Leadership": ["leadership", "strategy", "vision", "culture", "team", "executive", "management", "organizational"],
-            "Future of Sports": ["future", "nil", "conference", "trend", "changing", "evolution", "reform", "ncaa"]
-        }
-
-        for pillar, keywords in pillar_keywords.items():
-            if any(kw in text_lower for kw in keywords):
+        for pillar in self.PILLARS:
+            if matches[pillar]:
                 aligned_pillars.append(pillar)
                 score += 0.33
 
         # Check for positioning as innovator
-        innovator_indicators = ["first", "innovative", "pioneering", "leading", "ahead"]
-        if any(ind in text_lower for ind in innovator_indicators):
+        if matches["innovator"]:
             score += 0.1
 
         # Check for specific Milton branding (KSU Donor Fund)
-        if "donor" in text_lower or "fundraising" in text_lower:
-            if "ksu" in text_lower or "keuka" in text_lower:
+        if matches["donor"]:
+            if matches["ksu"]:
                 score += 0.1
             else:
                 concerns.append("Mentions donors but not the KSU Donor Fund initiative")
@@ -226,8 +243,7 @@ Return JSON:
             score -= 0.1
 
         # Avoid generic motivational speak
-        generic_phrases = ["excited to announce", "thrilled to share", "honored to", "humbled"]
-        if any(phrase in text_lower for phrase in generic_phrases):
+        if matches["generic"]:
             concerns.append("Contains generic corporate speak")
             score -= 0.05
 
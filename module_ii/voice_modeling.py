@@ -12,6 +12,8 @@ import asyncpg
 import os
 import json
 
+from .keyword_matcher import KeywordMatcher
+
 try:
     import spacy
     SPACY_AVAILABLE = True
@@ -32,6 +34,12 @@ class VoiceProfileModeler:
     - Tone indicators
     """
 
+    TONE_MATCHER = KeywordMatcher({
+        "optimistic": ["innovative", "exciting", "opportunity", "future", "success", "amazing", "incredible", "fantastic"],
+        "analytical": ["strategy", "data", "analysis", "framework", "system", "approach", "methodology"],
+        "personal": ["I", "we", "my", "our", "believe", "feel", "think"]
+    })
+
     def __init__(self, db_url: str):
         """
         Initialize Voice Profile Modeler
@@ -250,29 +258,17 @@ class VoiceProfileModeler:
     def analyze_tone(self, docs) -> Dict:
         """Analyze emotional tone and sentiment"""
 
-        # Keyword-based tone analysis
-        positive_words = ["innovative", "exciting", "opportunity", "future", "success", "amazing", "incredible", "fantastic"]
-        analytical_words = ["strategy", "data", "analysis", "framework", "system", "approach", "methodology"]
-        personal_words = ["I", "we", "my", "our", "believe", "feel", "think"]
-
+        # Keyword-based tone analysis (one pass per document)
         tone_scores = {
             "optimistic": 0,
             "analytical": 0,
             "personal": 0
         }
 
-        if SPACY_AVAILABLE and self.nlp:
-            for doc in docs:
-                text = doc.text.lower()
-                tone_scores["optimistic"] += sum(text.count(w.lower()) for w in positive_words)
-                tone_scores["analytical"] += sum(text.count(w.lower()) for w in analytical_words)
-                tone_scores["personal"] += sum(text.count(w.lower()) for w in personal_words)
-        else:
-            for text in docs:
-                text_lower = text.lower()
-                tone_scores["optimistic"] += sum(text_lower.count(w.lower()) for w in positive_words)
-                tone_scores["analytical"] += sum(text_lower.count(w.lower()) for w in analytical_words)
-                tone_scores["personal"] += sum(text_lower.count(w.lower()) for w in personal_words)
+        for doc in docs:
+            text = doc.text if SPACY_AVAILABLE and self.nlp else doc
+            for tone, occurrences in self.TONE_MATCHER.count(text).items():
+                tone_scores[tone] += occurrences
 
         total = sum(tone_scores.values()) or 1
         tone_distribution = {k: round(v/total, 2) for k, v in tone_scores.items()}
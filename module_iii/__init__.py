@@ -5,5 +5,6 @@ The Publicist - Social media publishing with OAuth authentication
 
 from .clerk_auth import ClerkSocialAuth
 from .social_media_publisher import SocialMediaPublisher
+from .retry_policy import RetryPolicy
 
-__all__ = ['ClerkSocialAuth', 'SocialMediaPublisher']
+__all__ = ['ClerkSocialAuth', 'SocialMediaPublisher', 'RetryPolicy']
@@ -0,0 +1,57 @@
+"""
+Retry Policy - When a failed publish is worth another attempt
+Shared by SchedulerDaemon and ContentScheduler so both treat failures alike
+"""
+
+import random
+from typing import Dict
+
+
+class RetryPolicy:
+    """
+    Classifies failed publish results and spaces out their retries
+
+    A failure is transient if the platform answered 5xx, 408, 425 or 429,
+    or if no answer came back at all: the publisher marks transport errors
+    "retryable": True, and callers do the same for exceptions they catch.
+    Anything else (bad credentials, a rejected post) is permanent. Retries
+    back off exponentially with jitter and stop after max_attempts.
+
+    Example:
+        policy = RetryPolicy(max_attempts=5, base_delay=60)
+        if policy.should_retry(result, attempts):
+            next_attempt_at = datetime.utcnow() + timedelta(seconds=policy.delay(attempts))
+    """
+
+    RETRYABLE_STATUS_CODES = {408, 425, 429}  # Plus every 5xx
+    JITTER = 0.2
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 60, max_delay: float = 3600):
+        """
+        Initialize retry policy
+
+        Args:
+            max_attempts: Publish attempts before a post is given up on
+            base_delay: Seconds before the first retry (doubling after each)
+            max_delay: Longest delay between retries
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable(self, result: Dict) -> bool:
+        """Whether a failed publish may succeed if tried again later"""
+        status_code = result.get("status_code")
+        if status_code is not None:
+            return status_code >= 500 or status_code in self.RETRYABLE_STATUS_CODES
+        # No HTTP answer: retry transport errors, not e.g. "LinkedIn not connected"
+        return bool(result.get("retryable"))
+
+    def should_retry(self, result: Dict, attempts: int) -> bool:
+        """Whether to try again after `attempts` attempts ending in result"""
+        return self.is_retryable(result) and attempts < self.max_attempts
+
+    def delay(self, attempts: int) -> float:
+        """Backoff before the next attempt, after `attempts` failed ones"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(1 - self.JITTER, 1 + self.JITTER)
@@ -4,6 +4,7 @@ Publishes content to LinkedIn, Twitter/X, and Instagram using Clerk OAuth
 """
 
 import asyncio
+import contextlib
 import aiohttp
 from typing import Dict, Optional, List
 from datetime import datetime
@@ -31,6 +32,52 @@ class SocialMediaPublisher:
             "twitter": True,
             "instagram": True
         }
+        self._session = None
+        self._session_loop = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session for the running event loop (one connection pool for all publishes)"""
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            await self._close_stale_session()
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20),
+                timeout=aiohttp.ClientTimeout(total=60)
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _close_stale_session(self):
+        """Close the session another event loop left behind (e.g. an earlier asyncio.run)"""
+        session, session_loop = self._session, self._session_loop
+        self._session = None
+        self._session_loop = None
+        if session.closed:
+            return
+
+        if session_loop.is_running():
+            # Still serving another thread: close it on its own loop
+            asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+            return
+
+        try:
+            await session.close()
+        except Exception as e:
+            print(f"[WARN] Could not close stale publisher session: {e}")
+
+    @contextlib.asynccontextmanager
+    async def _session_scope(self):
+        """Yield the shared session without closing it afterwards"""
+        yield await self._get_session()
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
 
     async def publish_to_linkedin(
         self,
@@ -56,6 +103,8 @@ class SocialMediaPublisher:
                 "post_id": str (if successful),
                 "url": str (if successful),
                 "error": str (if failed),
+                "status_code": int (if the API answered with an error),
+                "retryable": bool (if the request failed in transit),
                 "timestamp": str
             }
         """
@@ -70,7 +119,7 @@ class SocialMediaPublisher:
                 "timestamp": datetime.utcnow().isoformat()
             }
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
             try:
                 # Get LinkedIn person ID (URN)
                 person_id = await self._get_linkedin_person_id(token, session)
@@ -136,6 +185,7 @@ class SocialMediaPublisher:
                             "success": False,
                             "platform": "linkedin",
                             "error": f"HTTP {response.status}: {error_text}",
+                            "status_code": response.status,
                             "timestamp": datetime.utcnow().isoformat()
                         }
 
@@ -144,6 +194,7 @@ class SocialMediaPublisher:
                     "success": False,
                     "platform": "linkedin",
                     "error": str(e),
+                    "retryable": isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)),
                     "timestamp": datetime.utcnow().isoformat()
                 }
 
@@ -173,7 +224,7 @@ class SocialMediaPublisher:
                 "timestamp": datetime.utcnow().isoformat()
             }
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
             try:
                 headers = {
                     "Authorization": f"Bearer {token}",
@@ -211,6 +262,7 @@ class SocialMediaPublisher:
                             "success": False,
                             "platform": "twitter",
                             "error": f"HTTP {response.status}: {error_text}",
+                            "status_code": response.status,
                             "timestamp": datetime.utcnow().isoformat()
                         }
 
@@ -219,6 +271,7 @@ class SocialMediaPublisher:
                     "success": False,
                     "platform": "twitter",
                     "error": str(e),
+                    "retryable": isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)),
                     "timestamp": datetime.utcnow().isoformat()
                 }
 
@@ -259,7 +312,7 @@ class SocialMediaPublisher:
                 "timestamp": datetime.utcnow().isoformat()
             }
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
             try:
                 # Get Instagram Business Account ID
                 ig_account_id = await self._get_instagram_account_id(token, session)
@@ -281,6 +334,7 @@ class SocialMediaPublisher:
                             "success": False,
                             "platform": "instagram",
                             "error": f"Container creation failed: HTTP {response.status}: {error_text}",
+                            "status_code": response.status,
                             "timestamp": datetime.utcnow().isoformat()
                         }
 
@@ -311,6 +365,7 @@ class SocialMediaPublisher:
                             "success": False,
                             "platform": "instagram",
                             "error": f"Publish failed: HTTP {response.status}: {error_text}",
+                            "status_code": response.status,
                             "timestamp": datetime.utcnow().isoformat()
                         }
 
@@ -319,6 +374,7 @@ class SocialMediaPublisher:
                     "success": False,
                     "platform": "instagram",
                     "error": str(e),
+                    "retryable": isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)),
                     "timestamp": datetime.utcnow().isoformat()
                 }
 
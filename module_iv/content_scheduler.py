@@ -6,50 +6,149 @@ Optimizes posting times based on platform best practices
 import os
 import sys
 import asyncio
+import bisect
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from module_iii import ClerkSocialAuth, SocialMediaPublisher
+from module_iii import ClerkSocialAuth, RetryPolicy, SocialMediaPublisher
+from module_v.best_time_engine import BestTimeEngine
+from module_v.database import DatabaseManager, get_database
+from module_iv.slot_optimizer import Blackout, SlotOptimizer, engagement_grid
 
 class ContentScheduler:
     """
     Manages scheduled posts and automatic publishing
+
+    Posts persist in the database: each post is a posts row plus one
+    scheduled_posts row per platform, so the schedule survives restarts
+    and is shared with SchedulerDaemon (due rows are claimed under a
+    lease, so the two never publish the same row). In memory the
+    scheduler keeps an index by post id and a timeline sorted by
+    scheduled time; due posts are a prefix of the timeline, and the
+    cache is reloaded only when the database has changed.
+
+    Failed publishes are retried with exponential backoff when the error
+    is transient (5xx, 408/425/429, transport errors) and dead-lettered
+    when it is permanent or the attempts run out, by the same RetryPolicy
+    as SchedulerDaemon.
+
+    Times passed in and returned are local, as before; the table stores
+    UTC like the rest of the scheduling code.
     """
 
-    def __init__(self, auth: Optional[ClerkSocialAuth] = None):
+    HEATMAP_TTL_SECONDS = 300
+
+    # Best-practice posting hours (UTC, like the heatmap) when there is no engagement history
+    DEFAULT_OPTIMAL_HOURS = {
+        "linkedin": [7, 8, 12, 17, 18],  # Morning commute, lunch, evening
+        "twitter": [8, 12, 17, 20],       # Morning, lunch, evening, night
+        "instagram": [11, 13, 19, 21]     # Late morning, lunch, evening, night
+    }
+    FALLBACK_OPTIMAL_HOURS = [9, 12, 15]
+
+    def __init__(
+        self,
+        auth: Optional[ClerkSocialAuth] = None,
+        best_times: Optional[BestTimeEngine] = None,
+        db: Optional[DatabaseManager] = None,
+        publisher: Optional[SocialMediaPublisher] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 300,
+        max_attempts: int = 5,
+        retry_base_delay: float = 60,
+        retry_max_delay: float = 3600
+    ):
         """
         Initialize content scheduler
 
         Args:
-            auth: Optional ClerkSocialAuth instance (creates new if None)
+            auth: Optional ClerkSocialAuth instance (creates new if None,
+                  when the default publisher is first needed)
+            best_times: Optional BestTimeEngine; when given, optimal hours
+                        come from the historical engagement heatmap
+            db: Database holding the schedule (default: shared singleton)
+            publisher: Publisher to use (default: one using auth)
+            worker_id: Name used when claiming due posts
+            lease_seconds: How long a claimed post stays reserved
+            max_attempts: Publish attempts before a post is dead-lettered
+            retry_base_delay: Seconds before the first retry (doubling after each)
+            retry_max_delay: Longest delay between retries
         """
-        self.auth = auth or ClerkSocialAuth()
-        self.publisher = SocialMediaPublisher(auth=self.auth)
-        self.scheduled_posts: List[Dict] = []
+        self.auth = auth or getattr(publisher, "auth", None)
+        self._publisher = publisher
+        self.best_times = best_times
+        self.db = db or get_database()
+        self.worker_id = worker_id or f"content-scheduler:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.retry_policy = RetryPolicy(max_attempts, retry_base_delay, retry_max_delay)
         self.running = False
+        self._heatmaps: Dict[str, tuple] = {}
+
+        # Schedule cache: post id -> post, and (UTC scheduled time, post id) in order
+        self._posts: Dict[int, Dict] = {}
+        self._timeline: List[Tuple[str, int]] = []
+        self._data_version: Optional[int] = None
+        self._sync()
+
+    @property
+    def publisher(self) -> SocialMediaPublisher:
+        """Publisher (the default one is created on first use, so planning needs no credentials)"""
+        if self._publisher is None:
+            self.auth = self.auth or ClerkSocialAuth()
+            self._publisher = SocialMediaPublisher(clerk_auth=self.auth)
+        return self._publisher
+
+    def get_heatmap(self, platform: str) -> Optional[Dict]:
+        """
+        Get the engagement heatmap for a platform (cached for HEATMAP_TTL_SECONDS)
 
-    def get_optimal_posting_times(self, platform: str) -> List[int]:
+        Returns:
+            Heatmap dict, or None if no BestTimeEngine is configured
         """
-        Get optimal posting hours for a platform (in 24-hour format)
+        if self.best_times is None:
+            return None
+
+        platform = platform.lower()
+        cached = self._heatmaps.get(platform)
+        if cached and time.monotonic() - cached[0] < self.HEATMAP_TTL_SECONDS:
+            return cached[1]
+
+        heatmap = self.best_times.get_heatmap(platform)
+        self._heatmaps[platform] = (time.monotonic(), heatmap)
+        return heatmap
+
+    def get_optimal_posting_times(self, platform: str, day_of_week: Optional[int] = None) -> List[int]:
+        """
+        Get optimal posting hours for a platform (UTC, 24-hour format)
+
+        Uses the historical heatmap for the given weekday when one is
+        available and has enough data; otherwise falls back to platform
+        best practices. The heatmap's cells are UTC weekdays and hours,
+        so day_of_week and the returned hours are UTC too.
 
         Args:
             platform: Platform name (linkedin, twitter, instagram)
+            day_of_week: UTC weekday, 0=Monday .. 6=Sunday (None = platform defaults)
 
         Returns:
-            List of optimal hours (0-23)
+            List of optimal UTC hours (0-23), ascending
         """
-        optimal_times = {
-            "linkedin": [7, 8, 12, 17, 18],  # Morning commute, lunch, evening
-            "twitter": [8, 12, 17, 20],       # Morning, lunch, evening, night
-            "instagram": [11, 13, 19, 21]     # Late morning, lunch, evening, night
-        }
+        if day_of_week is not None:
+            heatmap = self.get_heatmap(platform)
+            if heatmap:
+                hours = BestTimeEngine.best_hours(heatmap, day_of_week)
+                if hours:
+                    return hours
 
-        return optimal_times.get(platform.lower(), [9, 12, 15])
+        return self.DEFAULT_OPTIMAL_HOURS.get(platform.lower(), self.FALLBACK_OPTIMAL_HOURS)
 
     def calculate_next_optimal_time(
         self,
@@ -61,77 +160,288 @@ class ContentScheduler:
 
         Args:
             platform: Platform name
-            from_time: Start time (defaults to now)
+            from_time: Start time, local or aware (defaults to now)
 
         Returns:
-            Next optimal posting datetime
+            Next optimal posting datetime, in local time
         """
-        if from_time is None:
-            from_time = datetime.now()
-
-        optimal_hours = self.get_optimal_posting_times(platform)
-
-        # Check today's remaining optimal times
-        current_hour = from_time.hour
+        # Optimal hours are UTC, so walk the calendar in UTC
+        from_time = (from_time or datetime.now()).astimezone(timezone.utc)
+
+        # Check today's remaining optimal times, then the following days
+        day = from_time
+        while True:
+            for hour in self.get_optimal_posting_times(platform, day.weekday()):
+                if day.date() > from_time.date() or hour > from_time.hour:
+                    slot = day.replace(hour=hour, minute=0, second=0, microsecond=0)
+                    return slot.astimezone().replace(tzinfo=None)
+
+            day += timedelta(days=1)
+
+    # ========================================================================
+    # SCHEDULE CACHE
+    # ========================================================================
+
+    @staticmethod
+    def _to_utc(local_time: datetime) -> str:
+        """Local (or aware) datetime -> naive UTC ISO string, as stored in the table"""
+        return local_time.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+
+    @staticmethod
+    def _to_local(utc_time: str) -> str:
+        """Stored UTC ISO string -> naive local ISO string"""
+        parsed = datetime.fromisoformat(utc_time)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone().replace(tzinfo=None).isoformat()
+
+    @staticmethod
+    def _blackout_to_utc(blackout: Blackout, start: datetime) -> Blackout:
+        """
+        Blackout window -> naive UTC, like the optimizer's slots
 
-        for hour in optimal_hours:
-            if hour > current_hour:
-                # Found an optimal time today
-                next_time = from_time.replace(
-                    hour=hour,
-                    minute=0,
-                    second=0,
-                    microsecond=0
-                )
-                return next_time
-
-        # No optimal times left today, use first optimal time tomorrow
-        tomorrow = from_time + timedelta(days=1)
-        next_time = tomorrow.replace(
-            hour=optimal_hours[0],
-            minute=0,
-            second=0,
-            microsecond=0
+        Naive times are local and aware ones keep their own offset, as for
+        every other time the scheduler takes. Daily windows are converted
+        with the offset in effect on start's date (naive UTC), so across a
+        DST change they may be an hour off.
+        """
+        window_start, window_end = blackout
+        if isinstance(window_start, datetime):
+            return (
+                datetime.fromisoformat(ContentScheduler._to_utc(window_start)),
+                datetime.fromisoformat(ContentScheduler._to_utc(window_end))
+            )
+
+        day = start.date()
+        return (
+            datetime.combine(day, window_start).astimezone(timezone.utc).time(),
+            datetime.combine(day, window_end).astimezone(timezone.utc).time()
         )
 
-        return next_time
+    @staticmethod
+    def _post_status(platform_status: Dict[str, str]) -> str:
+        """Overall status from the per-platform row statuses"""
+        statuses = set(platform_status.values())
+        if statuses & {"pending", "in_flight"}:
+            return "scheduled"
+        if statuses == {"published"}:
+            return "published"
+        if statuses == {"cancelled"}:
+            return "cancelled"
+        return "failed"
+
+    def _sync(self):
+        """Reload the cache if anything wrote to the database since the last load"""
+        version = self.db.get_data_version()
+        if version == self._data_version:
+            return
+        self._data_version = version
+
+        posts: Dict[int, Dict] = {}
+        for row in self.db.get_all_scheduled_posts():
+            post = posts.get(row["post_id"])
+            if post is None:
+                post = posts[row["post_id"]] = {
+                    "id": row["post_id"],
+                    "content": row["content"],
+                    "platforms": [],
+                    "scheduled_time": row["scheduled_time"],
+                    "metadata": json.loads(row["metadata"]) if row.get("metadata") else {},
+                    "created_at": row["created_at"],
+                    "schedule_ids": {},
+                    "platform_status": {}
+                }
+            post["platforms"].append(row["platform"])
+            post["schedule_ids"][row["platform"]] = row["id"]
+            post["platform_status"][row["platform"]] = row["status"]
+            post["scheduled_time"] = min(post["scheduled_time"], row["scheduled_time"])
+
+        self._posts = {}
+        self._timeline = []
+        for post in posts.values():
+            self._cache_post(post, post["scheduled_time"])
+        self._timeline.sort()
+
+    @contextmanager
+    def _own_writes(self):
+        """
+        Writes made in this block are applied to the cache by hand, so
+        they should not make the next read reload the whole table
+        """
+        current = self.db.get_data_version() == self._data_version
+        yield
+        if current:
+            self._data_version = self.db.get_data_version()
+
+    def _cache_post(self, post: Dict, utc_time: str, keep_sorted: bool = False):
+        """Add a post to the index and timeline (scheduled_time is shown in local time)"""
+        post["status"] = self._post_status(post["platform_status"])
+        post["scheduled_time"] = self._to_local(utc_time)
+        post["_utc_time"] = utc_time
+        self._posts[post["id"]] = post
+        if keep_sorted:
+            bisect.insort(self._timeline, (utc_time, post["id"]))
+        else:
+            self._timeline.append((utc_time, post["id"]))
+
+    def _public(self, post: Dict) -> Dict:
+        return {key: value for key, value in post.items() if not key.startswith("_")}
+
+    @property
+    def scheduled_posts(self) -> List[Dict]:
+        """All posts, by scheduled time"""
+        return self.get_scheduled_posts()
+
+    # ========================================================================
+    # SCHEDULING
+    # ========================================================================
 
     def schedule_post(
         self,
-        content: str,
+        content: Optional[str],
         platforms: List[str],
         scheduled_time: Optional[datetime] = None,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        post_id: Optional[int] = None
     ) -> Dict:
         """
         Schedule a post for future publishing
 
         Args:
-            content: Post content
+            content: Post content (None with post_id = the stored post's)
             platforms: List of platforms to post to
             scheduled_time: When to post (None = next optimal time for first platform)
             metadata: Additional metadata (media_url, etc.)
+            post_id: Existing post to schedule instead of creating a new one
 
         Returns:
             Scheduled post object
+
+        Raises:
+            ValueError: If post_id does not exist
         """
         if scheduled_time is None:
             # Use next optimal time for first platform
             scheduled_time = self.calculate_next_optimal_time(platforms[0])
 
+        metadata = metadata or {}
+        utc_time = self._to_utc(scheduled_time)
+
+        if post_id is not None and content is None:
+            stored = self.db.get_post(post_id)
+            if stored is None:
+                raise ValueError(f"Post {post_id} not found")
+            content = stored["content"]
+
+        with self._own_writes():
+            if post_id is None:
+                post_id = self.db.create_post(
+                    content=content,
+                    voice_type=metadata.get("voice_type", "scheduled"),
+                    scenario=metadata.get("scenario", "Content scheduler"),
+                    graphic_url=metadata.get("media_url")
+                )
+            schedule_ids = {
+                platform: self.db.schedule_post(post_id, platform, utc_time, metadata=metadata)
+                for platform in platforms
+            }
+
         post = {
-            "id": len(self.scheduled_posts) + 1,
+            "id": post_id,
             "content": content,
-            "platforms": platforms,
-            "scheduled_time": scheduled_time.isoformat(),
-            "metadata": metadata or {},
-            "status": "scheduled",
-            "created_at": datetime.now().isoformat()
+            "platforms": list(platforms),
+            "scheduled_time": utc_time,
+            "metadata": metadata,
+            "created_at": datetime.now().isoformat(),
+            "schedule_ids": schedule_ids,
+            "platform_status": {platform: "pending" for platform in platforms}
         }
+        if post_id in self._posts:
+            # Already on the calendar: the next read regroups all of its rows
+            self._data_version = None
+        self._cache_post(post, utc_time, keep_sorted=True)
+
+        return self._public(post)
+
+    def schedule_batch(
+        self,
+        posts: List[Dict],
+        start: Optional[datetime] = None,
+        days: int = 7,
+        min_spacing: timedelta = timedelta(hours=2),
+        daily_cap: Optional[int] = 3,
+        blackouts: Optional[List[Blackout]] = None
+    ) -> Dict:
+        """
+        Schedule a batch of posts across the calendar at once
+
+        Unlike calling schedule_post for each (which sends every post to
+        the same next optimal hour), slots are assigned jointly by
+        SlotOptimizer: highest predicted engagement first, keeping posts
+        on each platform min_spacing apart and within daily_cap per day,
+        and counting posts already scheduled.
+
+        Naive times (start, blackouts) are local and aware ones keep their
+        own offset; the dashboard's batch API passes aware UTC times.
 
-        self.scheduled_posts.append(post)
+        Args:
+            posts: Dicts with "platforms", either "content" or the
+                   "post_id" of an existing post, and optional "metadata"
+                   and "weight" (relative importance, default 1)
+            start: Earliest slot (defaults to now)
+            days: Planning horizon in days
+            min_spacing: Minimum gap between posts on the same platform
+            daily_cap: Posts per platform per day (None = no cap)
+            blackouts: (start, end) windows to avoid; datetime pairs are
+                       absolute, time pairs repeat daily
+
+        Returns:
+            {"scheduled": [scheduled post objects, with the slot's
+            "predicted_engagement"], "unscheduled": [input posts that
+            found no slot]}
+        """
+        # The heatmap grid is in UTC, so the optimizer works in naive UTC throughout
+        start = datetime.fromisoformat(self._to_utc(start or datetime.now()))
+        blackouts = [self._blackout_to_utc(blackout, start) for blackout in blackouts or []]
+
+        platforms = {platform.lower() for post in posts for platform in post["platforms"]}
+        grids = {
+            platform: engagement_grid(self.get_heatmap(platform), self.get_optimal_posting_times(platform))
+            for platform in platforms
+        }
+        self._sync()
+        existing = [
+            (platform.lower(), datetime.fromisoformat(post["_utc_time"]))
+            for post in self._posts.values() if post["status"] == "scheduled"
+            for platform in post["platforms"]
+        ]
+
+        optimizer = SlotOptimizer(min_spacing=min_spacing, daily_cap=daily_cap, blackouts=blackouts)
+        assignments = optimizer.assign(
+            [{**post, "platforms": [p.lower() for p in post["platforms"]]} for post in posts],
+            grids=grids,
+            start=start,
+            days=days,
+            existing=existing
+        )
 
-        return post
+        result = {"scheduled": [], "unscheduled": []}
+        for post, assignment in zip(posts, assignments):
+            if assignment.scheduled_time is None:
+                result["unscheduled"].append(post)
+                continue
+            scheduled = self.schedule_post(
+                content=post.get("content"),
+                platforms=post["platforms"],
+                scheduled_time=assignment.scheduled_time.replace(tzinfo=timezone.utc),
+                metadata=post.get("metadata"),
+                post_id=post.get("post_id")
+            )
+            scheduled["predicted_engagement"] = assignment.score
+            result["scheduled"].append(scheduled)
+
+        result["scheduled"].sort(key=lambda p: p["scheduled_time"])
+        return result
 
     def get_scheduled_posts(
         self,
@@ -146,20 +456,33 @@ class ContentScheduler:
             status: Filter by status (None = all)
 
         Returns:
-            List of scheduled posts
+            List of scheduled posts, by scheduled time
         """
-        posts = self.scheduled_posts
+        self._sync()
 
-        if platform:
-            posts = [p for p in posts if platform in p.get("platforms", [])]
+        posts = (self._posts[post_id] for _, post_id in self._timeline)
+        return [
+            self._public(post) for post in posts
+            if (not platform or platform in post["platforms"])
+            and (not status or post["status"] == status)
+        ]
 
-        if status:
-            posts = [p for p in posts if p.get("status") == status]
+    def get_due_posts(self, now: Optional[datetime] = None) -> List[Dict]:
+        """
+        Scheduled posts whose time has come (a range scan of the timeline)
 
-        # Sort by scheduled time
-        posts.sort(key=lambda p: p.get("scheduled_time", ""))
+        Args:
+            now: Cut-off time (defaults to now)
+        """
+        self._sync()
 
-        return posts
+        cutoff = self._to_utc(now or datetime.now())
+        end = bisect.bisect_right(self._timeline, (cutoff, float("inf")))
+        return [
+            self._public(self._posts[post_id])
+            for _, post_id in self._timeline[:end]
+            if self._posts[post_id]["status"] == "scheduled"
+        ]
 
     def cancel_scheduled_post(self, post_id: int) -> bool:
         """
@@ -171,12 +494,19 @@ class ContentScheduler:
         Returns:
             True if cancelled, False if not found
         """
-        for post in self.scheduled_posts:
-            if post.get("id") == post_id:
-                post["status"] = "cancelled"
-                return True
+        self._sync()
+
+        post = self._posts.get(post_id)
+        if post is None:
+            return False
+
+        with self._own_writes():
+            for platform, schedule_id in post["schedule_ids"].items():
+                if self.db.cancel_scheduled_post(schedule_id):
+                    post["platform_status"][platform] = "cancelled"
+        post["status"] = self._post_status(post["platform_status"])
 
-        return False
+        return True
 
     def reschedule_post(self, post_id: int, new_time: datetime) -> bool:
         """
@@ -189,19 +519,79 @@ class ContentScheduler:
         Returns:
             True if rescheduled, False if not found
         """
-        for post in self.scheduled_posts:
-            if post.get("id") == post_id:
-                post["scheduled_time"] = new_time.isoformat()
-                return True
+        self._sync()
+
+        post = self._posts.get(post_id)
+        if post is None:
+            return False
+
+        utc_time = self._to_utc(new_time)
+        with self._own_writes():
+            for schedule_id in post["schedule_ids"].values():
+                self.db.reschedule_scheduled_post(schedule_id, utc_time)
+
+        # Move the post within the timeline
+        old_key = (post["_utc_time"], post_id)
+        index = bisect.bisect_left(self._timeline, old_key)
+        if index < len(self._timeline) and self._timeline[index] == old_key:
+            del self._timeline[index]
+        self._cache_post(post, utc_time, keep_sorted=True)
+
+        return True
+
+    # ========================================================================
+    # PUBLISHING
+    # ========================================================================
+
+    async def _publish_to_platform(self, platform: str, content: str, media_url: Optional[str]) -> Dict:
+        """Publish to one platform, never raising"""
+        try:
+            if platform.lower() == "linkedin":
+                return await self.publisher.publish_to_linkedin(content, media_url)
+            elif platform.lower() == "twitter":
+                return await self.publisher.publish_to_twitter(content)
+            elif platform.lower() == "instagram":
+                if not media_url:
+                    return {"success": False, "error": "Instagram requires media_url"}
+                return await self.publisher.publish_to_instagram(content, media_url)
+            else:
+                return {"success": False, "error": f"Unknown platform: {platform}"}
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "retryable": True
+            }
+
+    def _handle_failure(self, schedule_id: int, attempts: int, result: Dict, worker_id: Optional[str]) -> str:
+        """
+        Schedule a retry for a transient failure, or dead-letter the row
+
+        Returns:
+            The row's new status ("pending" or "dead_letter")
+        """
+        error = result.get("error", "Unknown error")
+        if self.retry_policy.should_retry(result, attempts):
+            next_attempt_at = datetime.utcnow() + timedelta(seconds=self.retry_policy.delay(attempts))
+            self.db.retry_scheduled_post(schedule_id, error, next_attempt_at, worker_id)
+            return "pending"
 
-        return False
+        self.db.dead_letter_scheduled_post(schedule_id, error, worker_id)
+        return "dead_letter"
 
-    async def publish_scheduled_post(self, post: Dict) -> Dict:
+    async def publish_scheduled_post(self, post: Dict, worker_id: Optional[str] = None) -> Dict:
         """
-        Publish a scheduled post to all platforms
+        Publish a scheduled post to all of its platforms concurrently
+
+        Platforms that fail are retried later or dead-lettered (see
+        _handle_failure); the post is "scheduled" again while any
+        platform still has a retry pending.
 
         Args:
-            post: Scheduled post object
+            post: Scheduled post object (post["attempts"] maps platform to
+                  attempts made so far, counting this one; default 1)
+            worker_id: Lease holder the rows were claimed by (None = unconditional)
 
         Returns:
             Publishing results
@@ -210,6 +600,9 @@ class ContentScheduler:
         platforms = post.get("platforms", [])
         metadata = post.get("metadata", {})
         media_url = metadata.get("media_url")
+        schedule_ids = post.get("schedule_ids", {})
+        attempts = post.get("attempts", {})
+        statuses = {}
 
         results = {
             "post_id": post.get("id"),
@@ -217,32 +610,36 @@ class ContentScheduler:
             "published_at": datetime.now().isoformat()
         }
 
-        # Publish to each platform
-        for platform in platforms:
-            try:
-                if platform.lower() == "linkedin":
-                    result = await self.publisher.publish_to_linkedin(content, media_url)
-                elif platform.lower() == "twitter":
-                    result = await self.publisher.publish_to_twitter(content, media_url)
-                elif platform.lower() == "instagram":
-                    if not media_url:
-                        result = {"success": False, "error": "Instagram requires media_url"}
-                    else:
-                        result = await self.publisher.publish_to_instagram(content, media_url)
-                else:
-                    result = {"success": False, "error": f"Unknown platform: {platform}"}
-
-                results["platforms"][platform] = result
+        platform_results = await asyncio.gather(*(
+            self._publish_to_platform(platform, content, media_url)
+            for platform in platforms
+        ))
 
-            except Exception as e:
-                results["platforms"][platform] = {
-                    "success": False,
-                    "error": str(e)
-                }
+        for platform, result in zip(platforms, platform_results):
+            results["platforms"][platform] = result
+
+            schedule_id = schedule_ids.get(platform)
+            if schedule_id is None:
+                statuses[platform] = "published" if result.get("success") else "failed"
+                continue
+            if result.get("success"):
+                self.db.mark_scheduled_post_published(schedule_id, worker_id)
+                self.db.mark_post_published(post["id"], result.get("url"))
+                statuses[platform] = "published"
+            else:
+                statuses[platform] = self._handle_failure(
+                    schedule_id, attempts.get(platform) or 1, result, worker_id
+                )
+            self.db.log_publishing_result(
+                post_id=post["id"],
+                platform=platform,
+                success=bool(result.get("success")),
+                post_url=result.get("url"),
+                error_message=result.get("error")
+            )
 
         # Update post status
-        all_success = all(r.get("success") for r in results["platforms"].values())
-        post["status"] = "published" if all_success else "failed"
+        post["status"] = self._post_status(statuses) if statuses else "published"
         post["published_at"] = results["published_at"]
         post["results"] = results
 
@@ -255,22 +652,30 @@ class ContentScheduler:
         Returns:
             List of publishing results
         """
-        now = datetime.now()
-        due_posts = []
-
-        for post in self.scheduled_posts:
-            if post.get("status") != "scheduled":
-                continue
-
-            scheduled_time = datetime.fromisoformat(post.get("scheduled_time"))
-
-            if scheduled_time <= now:
-                due_posts.append(post)
+        if not self.get_due_posts():
+            return []
+
+        # Claim the due rows so a running SchedulerDaemon cannot publish them too
+        claimed = self.db.claim_due_scheduled_posts(self.worker_id, self.lease_seconds)
+
+        by_post: Dict[int, Dict] = {}
+        for row in claimed:
+            post = by_post.setdefault(row["post_id"], {
+                "id": row["post_id"],
+                "content": row["content"],
+                "platforms": [],
+                "metadata": json.loads(row["metadata"]) if row.get("metadata") else {},
+                "schedule_ids": {},
+                "attempts": {}
+            })
+            post["platforms"].append(row["platform"])
+            post["schedule_ids"][row["platform"]] = row["id"]
+            post["attempts"][row["platform"]] = row.get("attempts") or 1
 
         results = []
 
-        for post in due_posts:
-            result = await self.publish_scheduled_post(post)
+        for post in by_post.values():
+            result = await self.publish_scheduled_post(post, worker_id=self.worker_id)
             results.append(result)
 
         return results
@@ -338,26 +743,33 @@ class ContentScheduler:
             "by_platform": {}
         }
 
-        for post in self.scheduled_posts:
-            if post.get("status") != "scheduled":
+        self._sync()
+
+        # Posts in [now, end_date] are one slice of the timeline
+        start = bisect.bisect_left(self._timeline, (self._to_utc(now), -1))
+        end = bisect.bisect_right(self._timeline, (self._to_utc(end_date), float("inf")))
+
+        for _, post_id in self._timeline[start:end]:
+            post = self._posts[post_id]
+            if post["status"] != "scheduled":
                 continue
 
-            scheduled_time = datetime.fromisoformat(post.get("scheduled_time"))
+            scheduled_time = datetime.fromisoformat(post["scheduled_time"])
+            post = self._public(post)
 
-            if now <= scheduled_time <= end_date:
-                summary["total_scheduled"] += 1
+            summary["total_scheduled"] += 1
 
-                # Group by day
-                day_key = scheduled_time.strftime("%Y-%m-%d")
-                if day_key not in summary["by_day"]:
-                    summary["by_day"][day_key] = []
-                summary["by_day"][day_key].append(post)
+            # Group by day
+            day_key = scheduled_time.strftime("%Y-%m-%d")
+            if day_key not in summary["by_day"]:
+                summary["by_day"][day_key] = []
+            summary["by_day"][day_key].append(post)
 
-                # Count by platform
-                for platform in post.get("platforms", []):
-                    if platform not in summary["by_platform"]:
-                        summary["by_platform"][platform] = 0
-                    summary["by_platform"][platform] += 1
+            # Count by platform
+            for platform in post.get("platforms", []):
+                if platform not in summary["by_platform"]:
+                    summary["by_platform"][platform] = 0
+                summary["by_platform"][platform] += 1
 
         return summary
 
@@ -399,7 +811,7 @@ async def main():
     print()
 
     # Example 3: Get optimal posting times
-    print("[INFO] Optimal posting times:")
+    print("[INFO] Optimal posting times (UTC):")
     for platform in ["linkedin", "twitter", "instagram"]:
         times = scheduler.get_optimal_posting_times(platform)
         print(f"       {platform.capitalize()}: {', '.join(f'{t}:00' for t in times)}")
@@ -3,15 +3,23 @@ News Monitoring Module - Milton AI Publicist
 Automatically monitor KSU Athletics news and generate post suggestions
 """
 
+import aiohttp
+import asyncio
 import feedparser
+import json
 import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import logging
+import time
 from anthropic import Anthropic
 import os
 from dotenv import load_dotenv
 
+from module_ii.llm_cache import get_llm_cache
+from module_ii.llm_client import get_llm_client
+from module_ii.keyword_matcher import KeywordMatcher
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -30,10 +38,29 @@ class NewsMonitor:
     - Priority scoring for newsworthy content
     """
 
+    MODEL = "claude-sonnet-4-20250514"
+
+    KSU_MATCHER = KeywordMatcher([
+        "kennesaw", "ksu", "owls", "milton overton",
+        "kennesaw state", "ksuowls"
+    ])
+
+    # Sentiment for an unchanged news item stays valid for a week
+    SENTIMENT_CACHE_TTL = 7 * 24 * 3600
+
+    # Items scored per prompt in batch triage
+    TRIAGE_BATCH_SIZE = 10
+
+    # Feeds checked within this many seconds are served from cache without a request
+    FEED_MIN_REFRESH_SECONDS = 60
+    FEED_TIMEOUT_SECONDS = 20
+
     def __init__(self, anthropic_api_key: Optional[str] = None):
         """Initialize news monitor"""
         self.api_key = anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
         self.anthropic_client = Anthropic(api_key=self.api_key)
+        self.llm_cache = get_llm_cache()
+        self.llm = get_llm_client()  # Async calls share the global concurrency cap
 
         # News sources for KSU Athletics
         self.news_sources = {
@@ -42,63 +69,136 @@ class NewsMonitor:
             "sports_reference": "https://www.sports-reference.com/cbb/schools/kennesaw-state/"
         }
 
+        # Per-feed validators and parsed items: {source: {"etag", "last_modified", "items", "checked_at"}}
+        self._feed_cache: Dict[str, Dict] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+
         logger.info("News Monitor initialized")
 
-    def fetch_rss_feeds(self) -> List[Dict]:
-        """Fetch latest news from RSS feeds"""
-        all_news = []
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Shared pooled HTTP session for the running event loop
+
+        A session cannot outlive its loop, so the blocking wrappers close
+        it before their asyncio.run() returns.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.FEED_TIMEOUT_SECONDS),
+                headers={"User-Agent": "MiltonAIPublicist/1.0 (+news monitor)"}
+            )
+            self._session_loop = loop
+        return self._session
 
-        for source_name, feed_url in self.news_sources.items():
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    def fetch_rss_feeds(self) -> List[Dict]:
+        """Fetch latest news from RSS feeds (blocking wrapper for scripts)"""
+        async def run():
             try:
-                logger.info(f"Fetching RSS feed: {source_name}")
-                feed = feedparser.parse(feed_url)
-
-                for entry in feed.entries[:10]:  # Get last 10 items
-                    news_item = {
-                        "title": entry.get("title", ""),
-                        "link": entry.get("link", ""),
-                        "published": entry.get("published", ""),
-                        "summary": entry.get("summary", ""),
-                        "source": source_name
-                    }
-
-                    # Filter for KSU-related content
-                    if self._is_ksu_related(news_item):
-                        all_news.append(news_item)
-
-                logger.info(f"Found {len([n for n in all_news if n['source'] == source_name])} KSU-related items from {source_name}")
-
-            except Exception as e:
-                logger.error(f"Error fetching {source_name}: {e}")
-                continue
+                return await self.fetch_rss_feeds_async()
+            finally:
+                await self.close()
+
+        return asyncio.run(run())
+
+    async def fetch_rss_feeds_async(self) -> List[Dict]:
+        """
+        Fetch latest news from all RSS feeds concurrently
+
+        Each feed is requested with its stored ETag / Last-Modified, so an
+        unchanged feed answers 304 and its cached items are reused without
+        re-parsing. Feeds checked within FEED_MIN_REFRESH_SECONDS are not
+        requested at all. If a fetch fails, the last good items are served.
+        """
+        results = await asyncio.gather(*[
+            self._fetch_feed(source_name, feed_url)
+            for source_name, feed_url in self.news_sources.items()
+        ])
+
+        all_news = []
+        for items in results:
+            all_news.extend(items)
 
         return all_news
 
-    def _is_ksu_related(self, news_item: Dict) -> bool:
-        """Check if news item is related to KSU"""
-        ksu_keywords = [
-            "kennesaw", "ksu", "owls", "milton overton",
-            "kennesaw state", "ksuowls"
-        ]
+    async def _fetch_feed(self, source_name: str, feed_url: str) -> List[Dict]:
+        """Fetch one feed with a conditional GET; returns its KSU-related items"""
+        cached = self._feed_cache.get(source_name)
+        now = time.time()
 
-        text = f"{news_item['title']} {news_item.get('summary', '')}".lower()
+        if cached and now - cached["checked_at"] < self.FEED_MIN_REFRESH_SECONDS:
+            return cached["items"]
 
-        return any(keyword in text for keyword in ksu_keywords)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
 
-    def analyze_sentiment(self, news_item: Dict) -> Dict:
-        """
-        Analyze sentiment and newsworthiness of a news item
+        try:
+            logger.info(f"Fetching RSS feed: {source_name}")
+            async with self._get_session().get(feed_url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    logger.info(f"{source_name} not modified; using {len(cached['items'])} cached items")
+                    cached["checked_at"] = now
+                    return cached["items"]
 
-        Returns:
-            {
-                "sentiment": "positive" | "negative" | "neutral",
-                "priority": 1-10 (10 = most newsworthy),
-                "post_worthy": bool,
-                "reasoning": str
+                response.raise_for_status()
+                body = await response.read()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+            # Parse off the event loop
+            feed = await asyncio.to_thread(feedparser.parse, body)
+
+        except Exception as e:
+            logger.error(f"Error fetching {source_name}: {e}")
+            return cached["items"] if cached else []
+
+        items = []
+        for entry in feed.entries[:10]:  # Get last 10 items
+            news_item = {
+                "title": entry.get("title", ""),
+                "link": entry.get("link", ""),
+                "published": entry.get("published", ""),
+                "summary": entry.get("summary", ""),
+                "source": source_name
             }
-        """
-        try:
-            prompt = f"""Analyze this KSU Athletics news item:
+
+            # Filter for KSU-related content
+            if self._is_ksu_related(news_item):
+                items.append(news_item)
+
+        logger.info(f"Found {len(items)} KSU-related items from {source_name}")
+
+        self._feed_cache[source_name] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "items": items,
+            "checked_at": now
+        }
+
+        return items
+
+    def _is_ksu_related(self, news_item: Dict) -> bool:
+        """Check if news item is related to KSU"""
+        text = f"{news_item['title']} {news_item.get('summary', '')}"
+
+        return self.KSU_MATCHER.matches_any(text)
+
+    def _sentiment_prompt(self, news_item: Dict) -> str:
+        """Prompt asking Claude to score one news item"""
+        return f"""Analyze this KSU Athletics news item:
 
 Title: {news_item['title']}
 Summary: {news_item.get('summary', 'N/A')}
@@ -124,49 +224,227 @@ Format your response as JSON:
   "reasoning": "brief explanation"
 }}"""
 
-            response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
+    def _sentiment_request(self, news_item: Dict) -> Dict:
+        """messages.create arguments for scoring one news item"""
+        return {
+            "model": self.MODEL,
+            "max_tokens": 300,
+            "messages": [{"role": "user", "content": self._sentiment_prompt(news_item)}]
+        }
+
+    @staticmethod
+    def _fallback_analysis() -> Dict:
+        """Neutral, not post-worthy result used when analysis fails"""
+        return {
+            "sentiment": "neutral",
+            "priority": 5,
+            "post_worthy": False,
+            "reasoning": "Analysis failed"
+        }
+
+    @staticmethod
+    def _validate_analysis(analysis: Dict) -> Dict:
+        """
+        Coerce a model-supplied analysis to the expected types
+
+        Raises:
+            ValueError: If priority is not a number or post_worthy not a yes/no value
+        """
+        if not isinstance(analysis, dict):
+            raise ValueError("Analysis is not an object")
+
+        priority = analysis.get("priority")
+        if isinstance(priority, bool) or not isinstance(priority, (int, float, str)):
+            raise ValueError(f"Invalid priority: {priority!r}")
+        priority = int(float(priority))
 
-            import json
-            analysis = json.loads(response.content[0].text.strip())
+        post_worthy = analysis.get("post_worthy")
+        if isinstance(post_worthy, str) and post_worthy.strip().lower() in ("true", "yes", "false", "no"):
+            post_worthy = post_worthy.strip().lower() in ("true", "yes")
+        if not isinstance(post_worthy, bool):
+            raise ValueError(f"Invalid post_worthy: {post_worthy!r}")
+
+        return {**analysis, "priority": priority, "post_worthy": post_worthy}
+
+    def _parse_analysis(self, text: str) -> Dict:
+        """Parse and validate one analysis from response text"""
+        return self._validate_analysis(json.loads(text.strip()))
+
+    def analyze_sentiment(self, news_item: Dict) -> Dict:
+        """
+        Analyze sentiment and newsworthiness of a news item
+
+        Returns:
+            {
+                "sentiment": "positive" | "negative" | "neutral",
+                "priority": 1-10 (10 = most newsworthy),
+                "post_worthy": bool,
+                "reasoning": str
+            }
+        """
+        try:
+            analysis = self.llm_cache.complete(
+                self.anthropic_client,
+                call_site="news_sentiment",
+                ttl=self.SENTIMENT_CACHE_TTL,
+                parse=self._parse_analysis,
+                **self._sentiment_request(news_item)
+            )
 
             return analysis
 
         except Exception as e:
             logger.error(f"Sentiment analysis failed: {e}")
-            return {
-                "sentiment": "neutral",
-                "priority": 5,
-                "post_worthy": False,
-                "reasoning": "Analysis failed"
-            }
+            return self._fallback_analysis()
 
-    def generate_post_suggestion(
-        self,
-        news_item: Dict,
-        voice_type: str = "personal"
-    ) -> Optional[Dict]:
+    async def analyze_sentiment_async(self, news_item: Dict) -> Dict:
+        """Async analyze_sentiment(); runs under the shared LLM concurrency cap"""
+        try:
+            return await self.llm_cache.acomplete(
+                self.llm.create_message,
+                call_site="news_sentiment",
+                ttl=self.SENTIMENT_CACHE_TTL,
+                parse=self._parse_analysis,
+                **self._sentiment_request(news_item)
+            )
+
+        except Exception as e:
+            logger.error(f"Sentiment analysis failed: {e}")
+            return self._fallback_analysis()
+
+    async def analyze_sentiment_batch(self, news_items: List[Dict]) -> List[Dict]:
         """
-        Generate a social media post suggestion based on news
+        Score several news items with one structured-output prompt
 
-        Args:
-            news_item: News article data
-            voice_type: "personal" or "coach"
+        Items already in the sentiment cache are not re-sent. Each batch
+        result is cached under that item's single-item request, so later
+        runs hit regardless of how items were grouped. Items missing from
+        the batch response fall back to per-item analysis.
 
         Returns:
-            {
-                "content": str (suggested post text),
-                "scenario": str (scenario type),
-                "context": str (additional context),
-                "media_suggestion": str (suggestion for graphics/video)
-            }
+            Analyses in the same order as news_items
         """
+        results: List[Optional[Dict]] = [None] * len(news_items)
+        pending = []
+
+        for i, item in enumerate(news_items):
+            cached = self.llm_cache.get(self.llm_cache.request_key(**self._sentiment_request(item)), "news_sentiment")
+            if cached is not None:
+                try:
+                    results[i] = self._parse_analysis(cached)
+                    continue
+                except ValueError:  # Includes json.JSONDecodeError
+                    pass
+            pending.append(i)
+
+        batches = [
+            pending[start:start + self.TRIAGE_BATCH_SIZE]
+            for start in range(0, len(pending), self.TRIAGE_BATCH_SIZE)
+        ]
+        scored = await asyncio.gather(*[
+            self._score_batch([news_items[i] for i in batch]) for batch in batches
+        ])
+
+        retry = []
+        for batch, analyses in zip(batches, scored):
+            for position, i in enumerate(batch):
+                analysis = analyses.get(position)
+                if analysis is None:
+                    retry.append(i)
+                    continue
+
+                results[i] = analysis
+                self.llm_cache.put(
+                    self.llm_cache.request_key(**self._sentiment_request(news_items[i])),
+                    json.dumps(analysis),
+                    self.SENTIMENT_CACHE_TTL,
+                    "news_sentiment",
+                    self.MODEL
+                )
+
+        if retry:
+            logger.info(f"Batch triage missed {len(retry)} items; analyzing individually")
+            fallbacks = await asyncio.gather(*[
+                self.analyze_sentiment_async(news_items[i]) for i in retry
+            ])
+            for i, analysis in zip(retry, fallbacks):
+                results[i] = analysis
+
+        return results
+
+    async def _score_batch(self, news_items: List[Dict]) -> Dict[int, Dict]:
+        """
+        One LLM call scoring a batch of news items
+
+        Returns:
+            Position in news_items -> analysis (positions the model skipped
+            or answered malformed, e.g. a non-numeric priority, are absent)
+        """
+        listing = "\n\n".join(
+            f"[{i}] Title: {item['title']}\nSummary: {item.get('summary', 'N/A')}"
+            for i, item in enumerate(news_items)
+        )
+
+        prompt = f"""Analyze each of these KSU Athletics news items:
+
+{listing}
+
+For EACH item provide:
+1. Sentiment (positive/negative/neutral)
+2. Priority score (1-10, where 10 = urgent/important news worth posting about immediately)
+3. Is this worth posting about? (yes/no)
+4. Brief reasoning (1 sentence)
+
+Examples:
+- "KSU wins championship" = positive, priority 10, yes, major achievement
+- "Player injured" = negative, priority 7, yes if starter, newsworthy
+- "Practice schedule change" = neutral, priority 2, no, internal matter
+- "New recruit commitment" = positive, priority 8-9, yes, excellent content
+- "Coach interview" = positive, priority 5-6, maybe, depends on content
+
+Format your response as JSON, one entry per item, using the item numbers above:
+{{
+  "results": [
+    {{
+      "index": 0,
+      "sentiment": "positive|negative|neutral",
+      "priority": 1-10,
+      "post_worthy": true|false,
+      "reasoning": "brief explanation"
+    }}
+  ]
+}}"""
+
         try:
-            if voice_type == "personal":
-                prompt = f"""You are Milton Overton, Athletic Director at Kennesaw State University.
+            response = await self.llm.create_message(
+                model=self.MODEL,
+                max_tokens=150 * len(news_items) + 200,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            parsed = json.loads(response.content[0].text.strip())
+
+        except Exception as e:
+            logger.error(f"Batch sentiment analysis failed: {e}")
+            return {}
+
+        analyses = {}
+        for entry in parsed.get("results", []):
+            if not isinstance(entry, dict):
+                continue
+            index = entry.pop("index", None)
+            if not isinstance(index, int) or not 0 <= index < len(news_items):
+                continue
+            try:
+                analyses[index] = self._validate_analysis(entry)
+            except ValueError as e:
+                logger.warning(f"Batch triage entry {index} malformed ({e}); analyzing individually")
+
+        return analyses
+
+    def _suggestion_prompt(self, news_item: Dict, voice_type: str) -> str:
+        """Prompt asking Claude for a post reacting to a news item"""
+        if voice_type == "personal":
+            return f"""You are Milton Overton, Athletic Director at Kennesaw State University.
 
 Generate a PERSONAL LinkedIn post (20-80 words) reacting to this news:
 
@@ -183,8 +461,8 @@ Guidelines:
 
 Write ONLY the LinkedIn post. No explanations."""
 
-            else:  # coach voice
-                prompt = f"""You are Milton Overton, Athletic Director at Kennesaw State University.
+        else:  # coach voice
+            return f"""You are Milton Overton, Athletic Director at Kennesaw State University.
 
 Generate a COACH-STYLE motivational post (50-100 words) reacting to this news:
 
@@ -201,28 +479,74 @@ Guidelines:
 
 Write ONLY the post. No explanations."""
 
+    def _suggestion_request(self, news_item: Dict, voice_type: str) -> Dict:
+        """messages.create arguments for a post suggestion"""
+        return {
+            "model": self.MODEL,
+            "max_tokens": 200,
+            "temperature": 0.7,
+            "messages": [{"role": "user", "content": self._suggestion_prompt(news_item, voice_type)}]
+        }
+
+    def _build_suggestion(self, news_item: Dict, suggested_post: str) -> Dict:
+        """Wrap generated post text with scenario, context and media suggestion"""
+        # Determine scenario based on news content
+        scenario = self._determine_scenario(news_item)
+
+        # Media suggestion
+        media_suggestion = self._suggest_media(news_item)
+
+        return {
+            "content": suggested_post,
+            "scenario": scenario,
+            "context": f"{news_item['title']} - {news_item.get('link', '')}",
+            "media_suggestion": media_suggestion,
+            "news_item": news_item
+        }
+
+    def generate_post_suggestion(
+        self,
+        news_item: Dict,
+        voice_type: str = "personal"
+    ) -> Optional[Dict]:
+        """
+        Generate a social media post suggestion based on news
+
+        Args:
+            news_item: News article data
+            voice_type: "personal" or "coach"
+
+        Returns:
+            {
+                "content": str (suggested post text),
+                "scenario": str (scenario type),
+                "context": str (additional context),
+                "media_suggestion": str (suggestion for graphics/video)
+            }
+        """
+        try:
             response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=200,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}]
+                **self._suggestion_request(news_item, voice_type)
             )
 
-            suggested_post = response.content[0].text.strip()
+            return self._build_suggestion(news_item, response.content[0].text.strip())
 
-            # Determine scenario based on news content
-            scenario = self._determine_scenario(news_item)
+        except Exception as e:
+            logger.error(f"Post generation failed: {e}")
+            return None
 
-            # Media suggestion
-            media_suggestion = self._suggest_media(news_item)
+    async def generate_post_suggestion_async(
+        self,
+        news_item: Dict,
+        voice_type: str = "personal"
+    ) -> Optional[Dict]:
+        """Async generate_post_suggestion(); runs under the shared LLM concurrency cap"""
+        try:
+            response = await self.llm.create_message(
+                **self._suggestion_request(news_item, voice_type)
+            )
 
-            return {
-                "content": suggested_post,
-                "scenario": scenario,
-                "context": f"{news_item['title']} - {news_item.get('link', '')}",
-                "media_suggestion": media_suggestion,
-                "news_item": news_item
-            }
+            return self._build_suggestion(news_item, response.content[0].text.strip())
 
         except Exception as e:
             logger.error(f"Post generation failed: {e}")
@@ -265,39 +589,92 @@ Write ONLY the post. No explanations."""
     def monitor_and_suggest(
         self,
         hours_back: int = 24,
-        min_priority: int = 7
+        min_priority: int = 7,
+        mode: str = "batch"
     ) -> List[Dict]:
         """
         Main monitoring function - fetch news and generate suggestions
 
+        Blocking wrapper around monitor_and_suggest_async() for scripts;
+        async callers should await that directly.
+
+        Args:
+            hours_back: How many hours back to check (default 24)
+            min_priority: Minimum priority score to generate suggestions (1-10)
+            mode: Triage mode, "batch" or "concurrent"
+
+        Returns:
+            List of post suggestions sorted by priority
+        """
+        async def run():
+            try:
+                return await self.monitor_and_suggest_async(hours_back, min_priority, mode)
+            finally:
+                # Connections die with this loop
+                await self.close()
+                await self.llm.close()
+
+        return asyncio.run(run())
+
+    async def monitor_and_suggest_async(
+        self,
+        hours_back: int = 24,
+        min_priority: int = 7,
+        mode: str = "batch"
+    ) -> List[Dict]:
+        """
+        Fetch news, triage it, and generate suggestions for items that pass
+
+        Triage modes:
+        - "batch": TRIAGE_BATCH_SIZE items scored per prompt, batches in parallel
+        - "concurrent": one prompt per item, all in parallel
+
+        Either way, suggestions for passing items are then generated in
+        parallel, so the whole run takes about two LLM round-trips. All
+        calls share the global LLM concurrency cap.
+
         Args:
             hours_back: How many hours back to check (default 24)
             min_priority: Minimum priority score to generate suggestions (1-10)
+            mode: Triage mode, "batch" or "concurrent"
 
         Returns:
             List of post suggestions sorted by priority
         """
+        if mode not in ("batch", "concurrent"):
+            raise ValueError(f"Unknown triage mode: {mode}")
+
         logger.info(f"Monitoring news from last {hours_back} hours...")
 
         # Fetch all news
-        all_news = self.fetch_rss_feeds()
+        all_news = await self.fetch_rss_feeds_async()
         logger.info(f"Found {len(all_news)} total news items")
 
-        suggestions = []
-
-        for news_item in all_news:
-            # Analyze sentiment and newsworthiness
-            analysis = self.analyze_sentiment(news_item)
-
-            if not analysis["post_worthy"] or analysis["priority"] < min_priority:
-                logger.info(f"Skipping (priority {analysis['priority']}): {news_item['title']}")
+        # Analyze sentiment and newsworthiness
+        if mode == "batch":
+            analyses = await self.analyze_sentiment_batch(all_news)
+        else:
+            analyses = await asyncio.gather(*[
+                self.analyze_sentiment_async(news_item) for news_item in all_news
+            ])
+
+        passing = []
+        for news_item, analysis in zip(all_news, analyses):
+            if not analysis.get("post_worthy") or analysis.get("priority", 0) < min_priority:
+                logger.info(f"Skipping (priority {analysis.get('priority')}): {news_item['title']}")
                 continue
 
-            # Generate post suggestion
             logger.info(f"Generating suggestion (priority {analysis['priority']}): {news_item['title']}")
+            passing.append((news_item, analysis))
 
-            suggestion = self.generate_post_suggestion(news_item, voice_type="personal")
+        # Generate post suggestions
+        generated = await asyncio.gather(*[
+            self.generate_post_suggestion_async(news_item, voice_type="personal")
+            for news_item, _ in passing
+        ])
 
+        suggestions = []
+        for (_, analysis), suggestion in zip(passing, generated):
             if suggestion:
                 suggestion["analysis"] = analysis
                 suggestion["priority"] = analysis["priority"]
@@ -7,11 +7,14 @@ from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 import re
+import json
 import logging
 from anthropic import Anthropic
 import os
 from dotenv import load_dotenv
 
+from module_ii.llm_cache import get_llm_cache
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -30,10 +33,14 @@ class PROpportunityFinder:
     - Engagement opportunity scoring
     """
 
+    # Trending topics are re-analyzed a few times a day
+    TRENDING_CACHE_TTL = 6 * 3600
+
     def __init__(self, anthropic_api_key: Optional[str] = None):
         """Initialize PR opportunity finder"""
         self.api_key = anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
         self.anthropic_client = Anthropic(api_key=self.api_key)
+        self.llm_cache = get_llm_cache()
 
         # College athletics trends and events
         self.sports_calendar = {
@@ -103,15 +110,16 @@ Format as JSON:
   ]
 }}"""
 
-            response = self.anthropic_client.messages.create(
+            analysis = self.llm_cache.complete(
+                self.anthropic_client,
+                call_site="trending_topics",
+                ttl=self.TRENDING_CACHE_TTL,
+                parse=lambda text: json.loads(text.strip()),
                 model="claude-sonnet-4-20250514",
                 max_tokens=1500,
                 messages=[{"role": "user", "content": prompt}]
             )
 
-            import json
-            analysis = json.loads(response.content[0].text.strip())
-
             return {
                 "analyzed_at": datetime.now().isoformat(),
                 "sport_focus": sport,
@@ -0,0 +1,253 @@
+"""
+Slot Optimizer - Calendar-wide posting slots for a batch of posts
+Greedy assignment by predicted engagement under spacing, daily-cap and blackout rules
+"""
+
+import bisect
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# A blackout is an absolute (start, end) datetime window, or a daily
+# (start, end) time-of-day window that may wrap past midnight
+Blackout = Union[Tuple[datetime, datetime], Tuple[time, time]]
+
+
+def parse_blackout(start: str, end: str) -> Blackout:
+    """
+    Blackout window from ISO strings: "22:00"/"06:00" is a daily window,
+    full timestamps an absolute one
+
+    Raises:
+        ValueError: If the strings are neither times nor datetimes
+    """
+    try:
+        return time.fromisoformat(start), time.fromisoformat(end)
+    except ValueError:
+        return datetime.fromisoformat(start), datetime.fromisoformat(end)
+
+
+def engagement_grid(
+    heatmap: Optional[Dict],
+    default_hours: Sequence[int],
+    min_samples: int = 3
+) -> np.ndarray:
+    """
+    7x24 predicted-engagement grid (0=Monday) for one platform
+
+    Cells with at least min_samples published posts use their historical
+    mean. Other cells fall back to a prior: the mean of the known cells
+    (1.0 without history), halved outside the platform's default hours.
+
+    Args:
+        heatmap: BestTimeEngine.get_heatmap() result (None = no history)
+        default_hours: Best-practice hours for the platform
+        min_samples: Samples a cell needs before its mean is trusted
+    """
+    means = np.full((7, 24), np.nan)
+    if heatmap:
+        mean = np.array(heatmap["mean"], dtype=float)  # None -> nan
+        count = np.array(heatmap["count"])
+        trusted = (count >= min_samples) & ~np.isnan(mean)
+        means[trusted] = mean[trusted]
+
+    known = means[~np.isnan(means)]
+    base = float(known.mean()) if known.size else 1.0
+    prior = np.full(24, base * 0.5)
+    prior[list(default_hours)] = base
+
+    return np.where(np.isnan(means), prior[np.newaxis, :], means)
+
+
+@dataclass
+class SlotAssignment:
+    """Where one post of the batch was placed"""
+    index: int
+    scheduled_time: Optional[datetime]
+    score: float = 0.0
+    platforms: List[str] = field(default_factory=list)
+
+
+class SlotOptimizer:
+    """
+    Assigns a batch of posts to calendar slots
+
+    Every (post, slot) pair is scored by the post's weight times the
+    summed predicted engagement of its platforms at that slot. Pairs are
+    taken best-first from one sorted candidate queue: a pair is accepted
+    if its post is still unplaced and the slot keeps every one of the
+    post's platforms within the minimum spacing and daily cap, and
+    skipped otherwise. Constraints only tighten as posts are placed, so
+    a skipped pair never becomes feasible again and one pass suffices;
+    cost is dominated by sorting posts x slots scores.
+
+    Example:
+        optimizer = SlotOptimizer(min_spacing=timedelta(hours=3), daily_cap=2)
+        assignments = optimizer.assign(
+            [{"platforms": ["linkedin"]}, {"platforms": ["linkedin", "twitter"]}],
+            grids={"linkedin": linkedin_grid, "twitter": twitter_grid},
+            start=datetime(2026, 1, 5), days=7
+        )
+    """
+
+    def __init__(
+        self,
+        min_spacing: timedelta = timedelta(hours=2),
+        daily_cap: Optional[int] = 3,
+        blackouts: Optional[Iterable[Blackout]] = None,
+        slot_minutes: int = 60
+    ):
+        """
+        Initialize slot optimizer
+
+        Args:
+            min_spacing: Minimum gap between two posts on the same platform
+            daily_cap: Posts allowed per platform per calendar day (None = no cap)
+            blackouts: Windows in which nothing is posted
+            slot_minutes: Granularity of candidate slots
+        """
+        self.min_spacing = min_spacing
+        self.daily_cap = daily_cap
+        self.blackouts = list(blackouts or [])
+        self.slot_minutes = slot_minutes
+
+    # ========================================================================
+    # SLOTS
+    # ========================================================================
+
+    def candidate_slots(self, start: datetime, days: int) -> List[datetime]:
+        """Slot start times in [start, start + days), aligned to slot_minutes, outside blackouts"""
+        step = timedelta(minutes=self.slot_minutes)
+        midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        steps_since_midnight = -(-(start - midnight) // step)  # Round up to the next slot boundary
+        slot = midnight + steps_since_midnight * step
+        end = start + timedelta(days=days)
+
+        slots = []
+        while slot < end:
+            if not self.is_blacked_out(slot):
+                slots.append(slot)
+            slot += step
+        return slots
+
+    def is_blacked_out(self, moment: datetime) -> bool:
+        """Whether moment falls in any blackout window"""
+        for window_start, window_end in self.blackouts:
+            if isinstance(window_start, datetime):
+                if window_start <= moment < window_end:
+                    return True
+            else:
+                clock = moment.time()
+                if window_start <= window_end:
+                    if window_start <= clock < window_end:
+                        return True
+                elif clock >= window_start or clock < window_end:  # Wraps past midnight
+                    return True
+        return False
+
+    # ========================================================================
+    # ASSIGNMENT
+    # ========================================================================
+
+    def assign(
+        self,
+        posts: List[Dict],
+        grids: Dict[str, np.ndarray],
+        start: datetime,
+        days: int = 7,
+        existing: Iterable[Tuple[str, datetime]] = ()
+    ) -> List[SlotAssignment]:
+        """
+        Place a batch of posts
+
+        Args:
+            posts: Dicts with "platforms" and optionally "weight" (default 1.0)
+            grids: Platform -> 7x24 engagement grid (see engagement_grid);
+                   platforms without a grid score zero
+            start: Earliest slot
+            days: Planning horizon
+            existing: (platform, time) of posts already on the calendar,
+                      which count toward spacing and daily caps
+
+        Returns:
+            One SlotAssignment per post, in input order; scheduled_time is
+            None for posts that could not be placed
+        """
+        slots = self.candidate_slots(start, days)
+        assignments = [
+            SlotAssignment(index=i, scheduled_time=None, platforms=list(post.get("platforms", [])))
+            for i, post in enumerate(posts)
+        ]
+        if not posts or not slots:
+            return assignments
+
+        # Engagement of every platform at every slot, then every post at every slot
+        weekdays = np.array([slot.weekday() for slot in slots])
+        hours = np.array([slot.hour for slot in slots])
+        platform_scores: Dict[str, np.ndarray] = {}
+        for platform in {p for a in assignments for p in a.platforms}:
+            grid = grids.get(platform)
+            platform_scores[platform] = grid[weekdays, hours] if grid is not None else np.zeros(len(slots))
+
+        scores = np.zeros((len(posts), len(slots)))
+        for i, (post, assignment) in enumerate(zip(posts, assignments)):
+            for platform in assignment.platforms:
+                scores[i] += platform_scores[platform]
+            scores[i] *= post.get("weight", 1.0)
+
+        # Calendar state per platform
+        placed: Dict[str, List[datetime]] = {}
+        per_day: Counter = Counter()
+        for platform, moment in existing:
+            bisect.insort(placed.setdefault(platform, []), moment)
+            per_day[(platform, moment.date())] += 1
+
+        # Best pairs first; ties go to earlier posts, then earlier slots
+        remaining = len(posts)
+        for flat in np.argsort(-scores, axis=None, kind="stable"):
+            post_index, slot_index = divmod(int(flat), len(slots))
+            assignment = assignments[post_index]
+            if assignment.scheduled_time is not None:
+                continue
+
+            slot = slots[slot_index]
+            if not all(self._fits(platform, slot, placed, per_day) for platform in assignment.platforms):
+                continue
+
+            assignment.scheduled_time = slot
+            assignment.score = round(float(scores[post_index, slot_index]), 4)
+            for platform in assignment.platforms:
+                bisect.insort(placed.setdefault(platform, []), slot)
+                per_day[(platform, slot.date())] += 1
+
+            remaining -= 1
+            if remaining == 0:
+                break
+
+        return assignments
+
+    def _fits(
+        self,
+        platform: str,
+        slot: datetime,
+        placed: Dict[str, List[datetime]],
+        per_day: Counter
+    ) -> bool:
+        """Whether one more post on platform at slot respects spacing and the daily cap"""
+        if self.daily_cap is not None and per_day[(platform, slot.date())] >= self.daily_cap:
+            return False
+
+        times = placed.get(platform)
+        if not times:
+            return True
+
+        position = bisect.bisect_left(times, slot)
+        if position < len(times) and times[position] - slot < self.min_spacing:
+            return False
+        if position > 0 and slot - times[position - 1] < self.min_spacing:
+            return False
+        return True
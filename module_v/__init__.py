@@ -5,5 +5,13 @@ Module V: Analytics & Performance Tracking + Database
 from .analytics_tracker import AnalyticsTracker
 from .database import get_database, DatabaseManager
 from .analytics_engine import AnalyticsEngine
+from .async_database import get_async_database, AsyncDatabaseManager
+from .article_store import PostgresArticleStore, SQLiteArticleStore, create_article_store
+from .vector_index import VectorIndex, get_vector_index
 
-__all__ = ["AnalyticsTracker", "get_database", "DatabaseManager", "AnalyticsEngine"]
+__all__ = [
+    "AnalyticsTracker", "get_database", "DatabaseManager", "AnalyticsEngine",
+    "get_async_database", "AsyncDatabaseManager",
+    "PostgresArticleStore", "SQLiteArticleStore", "create_article_store",
+    "VectorIndex", "get_vector_index"
+]
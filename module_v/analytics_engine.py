@@ -6,9 +6,65 @@ Track engagement, analyze performance, and provide insights
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
-import statistics
 import json
+import threading
+import time
 from .database import get_database
+from .best_time_engine import BestTimeEngine
+
+
+def _chunked(values: List, size: int = 500):
+    """Yield successive slices of values (keeps IN (...) under SQLite's variable limit)"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class AnalyticsSnapshot:
+    """
+    Point-in-time view of the analytics queries behind the dashboard
+
+    Each section is computed at most once per snapshot and shared by every
+    consumer (summary, insights), so one dashboard load never runs the same
+    query twice. AnalyticsEngine caches a snapshot for a short TTL and drops
+    it whenever engagement is written.
+    """
+
+    def __init__(self, engine: "AnalyticsEngine", ttl_seconds: float = 30):
+        self.engine = engine
+        self.ttl_seconds = ttl_seconds
+        self.created_at = time.monotonic()
+        self.generated_at = datetime.now().isoformat()
+        self._results = {}
+        self._lock = threading.RLock()
+
+    def is_expired(self) -> bool:
+        """Check whether the snapshot has outlived its TTL"""
+        return time.monotonic() - self.created_at > self.ttl_seconds
+
+    def _get(self, key: Tuple, compute):
+        """Compute a section once; concurrent callers wait for the first"""
+        with self._lock:
+            if key not in self._results:
+                self._results[key] = compute()
+            return self._results[key]
+
+    def overall_performance(self, days: int = 30) -> Dict:
+        return self._get(("overall", days), lambda: self.engine.get_overall_performance(days=days))
+
+    def best_times(self, platform: str = "linkedin") -> Dict:
+        return self._get(("best_times", platform), lambda: self.engine.analyze_best_times(platform=platform))
+
+    def content_performance(self, metric: str = "engagement_rate") -> Dict:
+        return self._get(("content", metric), lambda: self.engine.analyze_content_performance(metric=metric))
+
+    def top_posts(self, limit: int = 5) -> List[Dict]:
+        return self._get(("top_posts", limit), lambda: self.engine.get_top_performing_posts(limit=limit))
+
+    def recent_post_count(self, days: int = 7) -> int:
+        return self._get(("recent_posts", days), lambda: self.engine.count_recent_posts(days=days))
+
+    def insights(self) -> Dict:
+        return self._get(("insights",), lambda: self.engine.generate_insights(snapshot=self))
 
 
 class AnalyticsEngine:
@@ -24,14 +80,113 @@ class AnalyticsEngine:
     - Voice type comparison
     """
 
-    def __init__(self):
-        """Initialize analytics engine"""
-        self.db = get_database()
+    def __init__(self, snapshot_ttl: float = 30, db=None):
+        """
+        Initialize analytics engine
+
+        Args:
+            snapshot_ttl: Seconds a cached dashboard snapshot stays valid
+            db: DatabaseManager to use (default: the shared instance)
+        """
+        self.db = db or get_database()
+        self.best_times = BestTimeEngine(self.db)
+        self.snapshot_ttl = snapshot_ttl
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
+        self._last_downsample = None  # time.monotonic() of the last run
+
+        # Backfill rollups for databases created before they existed
+        if self._rollups_stale():
+            self.rebuild_rollups()
 
     # ========================================================================
     # ENGAGEMENT TRACKING
     # ========================================================================
 
+    ENGAGEMENT_METRICS = ("views", "likes", "comments", "shares", "clicks")
+
+    _UPSERT_ENGAGEMENT_SQL = """
+        INSERT INTO analytics (post_id, platform, views, likes, comments, shares, engagement_rate)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(post_id, platform) DO UPDATE SET
+            views = excluded.views,
+            likes = excluded.likes,
+            comments = excluded.comments,
+            shares = excluded.shares,
+            engagement_rate = excluded.engagement_rate,
+            last_updated = CURRENT_TIMESTAMP
+    """
+
+    _UPSERT_DAILY_ROLLUP_SQL = """
+        INSERT INTO analytics_daily_rollup (
+            day, platform, voice_type, scenario, has_media, day_of_week, hour,
+            post_count, row_count, total_views, total_likes, total_comments, total_shares,
+            total_engagement_rate, max_views, max_likes, max_comments, max_shares
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(day, platform, voice_type, scenario, has_media, day_of_week, hour) DO UPDATE SET
+            post_count = post_count + excluded.post_count,
+            row_count = row_count + excluded.row_count,
+            total_views = total_views + excluded.total_views,
+            total_likes = total_likes + excluded.total_likes,
+            total_comments = total_comments + excluded.total_comments,
+            total_shares = total_shares + excluded.total_shares,
+            total_engagement_rate = total_engagement_rate + excluded.total_engagement_rate,
+            max_views = MAX(max_views, excluded.max_views),
+            max_likes = MAX(max_likes, excluded.max_likes),
+            max_comments = MAX(max_comments, excluded.max_comments),
+            max_shares = MAX(max_shares, excluded.max_shares)
+    """
+
+    _UPSERT_POST_ROLLUP_SQL = """
+        INSERT INTO analytics_post_rollup (post_id, row_count, total_engagement_rate, performance)
+        VALUES (?, ?, ?, ? / MAX(?, 1))
+        ON CONFLICT(post_id) DO UPDATE SET
+            row_count = row_count + excluded.row_count,
+            total_engagement_rate = total_engagement_rate + excluded.total_engagement_rate,
+            performance = (total_engagement_rate + excluded.total_engagement_rate)
+                          / MAX(row_count + excluded.row_count, 1)
+    """
+
+    _UPSERT_SNAPSHOT_SQL = """
+        INSERT INTO engagement_snapshots (
+            post_id, platform, bucket_start, resolution, d_views, d_likes, d_comments, d_shares
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(post_id, platform, bucket_start) DO UPDATE SET
+            resolution = MAX(resolution, excluded.resolution),
+            d_views = d_views + excluded.d_views,
+            d_likes = d_likes + excluded.d_likes,
+            d_comments = d_comments + excluded.d_comments,
+            d_shares = d_shares + excluded.d_shares
+    """
+
+    # Engagement history retention: raw polls, then hourly, then daily buckets
+    RAW_HISTORY_SECONDS = 2 * 86400
+    HOURLY_HISTORY_SECONDS = 30 * 86400
+    DOWNSAMPLE_INTERVAL_SECONDS = 3600
+
+    # Offsets from publish time for cohort engagement curves
+    COHORT_HORIZONS = {"1h": 3600, "24h": 86400, "7d": 7 * 86400}
+
+    @staticmethod
+    def _engagement_params(
+        post_id: int,
+        platform: str,
+        views: int = 0,
+        likes: int = 0,
+        comments: int = 0,
+        shares: int = 0,
+        clicks: int = 0
+    ) -> Tuple:
+        """Build UPSERT parameters for one (post_id, platform) row"""
+        engagement_rate = 0.0
+        if views > 0:
+            total_engagement = likes + comments + shares + clicks
+            engagement_rate = (total_engagement / views) * 100
+
+        return (post_id, platform, views, likes, comments, shares, engagement_rate)
+
     def record_engagement(
         self,
         post_id: int,
@@ -58,45 +213,597 @@ class AnalyticsEngine:
             bool: Success status
         """
         try:
-            # Calculate engagement rate
-            engagement_rate = 0.0
-            if views > 0:
-                total_engagement = likes + comments + shares + clicks
-                engagement_rate = (total_engagement / views) * 100
-
-            # Record metrics using flat schema
             conn = self.db._get_connection()
-            cursor = conn.cursor()
-
-            # Check if record exists
-            cursor.execute("""
-                SELECT id FROM analytics WHERE post_id = ? AND platform = ?
-            """, (post_id, platform))
-
-            existing = cursor.fetchone()
-
-            if existing:
-                # Update existing record
-                cursor.execute("""
-                    UPDATE analytics
-                    SET views = ?, likes = ?, comments = ?, shares = ?,
-                        engagement_rate = ?, last_updated = CURRENT_TIMESTAMP
-                    WHERE post_id = ? AND platform = ?
-                """, (views, likes, comments, shares, engagement_rate, post_id, platform))
-            else:
-                # Insert new record
-                cursor.execute("""
-                    INSERT INTO analytics (post_id, platform, views, likes, comments, shares, engagement_rate)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (post_id, platform, views, likes, comments, shares, engagement_rate))
+            params = self._engagement_params(post_id, platform, views, likes, comments, shares, clicks)
+
+            with conn:
+                posts, current = self._load_rollup_state(conn, [post_id])
+                self._write_engagement(conn, [params], posts, current)
 
-            conn.commit()
+            self.invalidate_snapshot()
+            self._maybe_downsample_history()
             return True
 
         except Exception as e:
             print(f"[ERROR] Failed to record engagement: {e}")
             return False
 
+    def record_engagement_many(self, records: List[Dict]) -> Dict:
+        """
+        Record engagement metrics for many posts in one transaction
+
+        Intended for backfills (Zapier, CSV exports). Rows are validated up
+        front; valid rows are UPSERTed with a single executemany and one
+        commit, invalid rows are reported back by index and skipped.
+
+        Args:
+            records: List of dicts with post_id, platform and any of
+                     views, likes, comments, shares, clicks
+
+        Returns:
+            Dict with counts and per-row errors:
+            {"recorded": 98, "failed": 2, "errors": [{"index": 3, "error": "..."}]}
+        """
+        errors = []
+        candidates = []
+
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                errors.append({"index": index, "error": "Record must be an object"})
+                continue
+
+            post_id = record.get("post_id")
+            platform = record.get("platform", "linkedin")
+
+            if not isinstance(post_id, int) or isinstance(post_id, bool):
+                errors.append({"index": index, "error": "post_id must be an integer"})
+                continue
+
+            if not isinstance(platform, str) or not platform:
+                errors.append({"index": index, "error": "platform must be a non-empty string"})
+                continue
+
+            metrics = {}
+            for metric in self.ENGAGEMENT_METRICS:
+                value = record.get(metric, 0)
+                if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                    errors.append({"index": index, "error": f"{metric} must be a non-negative integer"})
+                    break
+                metrics[metric] = value
+            else:
+                candidates.append((index, self._engagement_params(post_id, platform, **metrics)))
+
+        conn = self.db._get_connection()
+
+        try:
+            with conn:
+                # One lookup for the batch: post dimensions plus current analytics rows
+                posts, current = self._load_rollup_state(
+                    conn, sorted({params[0] for _, params in candidates})
+                )
+
+                rows_to_write = []
+                for index, params in candidates:
+                    if params[0] in posts:
+                        rows_to_write.append(params)
+                    else:
+                        errors.append({"index": index, "error": f"Post {params[0]} not found"})
+
+                self._write_engagement(conn, rows_to_write, posts, current)
+
+            if rows_to_write:
+                self.invalidate_snapshot()
+                self._maybe_downsample_history()
+        except Exception as e:
+            print(f"[ERROR] Failed to record bulk engagement: {e}")
+            return {
+                "recorded": 0,
+                "failed": len(records),
+                "errors": errors + [{"index": None, "error": str(e)}]
+            }
+
+        errors.sort(key=lambda err: err["index"])
+        return {
+            "recorded": len(rows_to_write),
+            "failed": len(errors),
+            "errors": errors
+        }
+
+    # ========================================================================
+    # ROLLUP MAINTENANCE
+    # ========================================================================
+
+    @staticmethod
+    def _rollup_dimensions(post) -> Optional[Tuple]:
+        """
+        Rollup key fields for a post row: (day, voice_type, scenario,
+        has_media, day_of_week, hour), or None if the post is unpublished
+        """
+        if post['status'] != 'published':
+            return None
+
+        day, day_of_week, hour = '', -1, -1
+        if post['published_at']:
+            try:
+                dt = datetime.fromisoformat(str(post['published_at']).replace('Z', '+00:00'))
+                day, day_of_week, hour = dt.date().isoformat(), dt.weekday(), dt.hour
+            except ValueError:
+                pass
+
+        has_media = 1 if (post['graphic_url'] or post['video_url']) else 0
+        return (day, post['voice_type'], post['scenario'], has_media, day_of_week, hour)
+
+    @classmethod
+    def load_post_dimensions(cls, conn, post_ids: List[int]) -> Dict[int, Optional[Tuple]]:
+        """Rollup dimensions of existing posts: post_id -> _rollup_dimensions()"""
+        posts = {}
+        for chunk in _chunked(list(post_ids)):
+            placeholders = ", ".join("?" * len(chunk))
+            for row in conn.execute(f"""
+                SELECT id, status, published_at, voice_type, scenario, graphic_url, video_url
+                FROM posts WHERE id IN ({placeholders})
+            """, chunk):
+                posts[row['id']] = cls._rollup_dimensions(row)
+        return posts
+
+    def _load_rollup_state(self, conn, post_ids: List[int]) -> Tuple[Dict, Dict]:
+        """
+        Load what the rollups need to compute deltas for a set of posts
+
+        Returns:
+            (posts, current) where posts maps post_id -> rollup dimensions
+            (None if unpublished; missing if the post does not exist) and
+            current maps (post_id, platform) -> existing analytics values
+        """
+        posts = self.load_post_dimensions(conn, post_ids)
+        current = {}
+
+        for chunk in _chunked(post_ids):
+            placeholders = ", ".join("?" * len(chunk))
+            for row in conn.execute(f"""
+                SELECT post_id, platform, views, likes, comments, shares, engagement_rate
+                FROM analytics WHERE post_id IN ({placeholders})
+            """, chunk):
+                current[(row['post_id'], row['platform'])] = tuple(row)[2:]
+
+        return posts, current
+
+    def _write_engagement(self, conn, rows: List[Tuple], posts: Dict, current: Dict):
+        """
+        UPSERT analytics rows and fold the old->new differences into the
+        rollup tables. Runs inside the caller's transaction.
+        """
+        if not rows:
+            return
+
+        conn.executemany(self._UPSERT_ENGAGEMENT_SQL, rows)
+        conn.executemany(self._UPSERT_SNAPSHOT_SQL, self._snapshot_deltas(rows, posts, current))
+        daily, per_post = self._fold_rollup_deltas(rows, posts, current)
+
+        conn.executemany(self._UPSERT_DAILY_ROLLUP_SQL, [
+            key + tuple(values) for key, values in daily.items()
+        ])
+        conn.executemany(self._UPSERT_POST_ROLLUP_SQL, [
+            (post_id, row_count, rate, rate, row_count)
+            for post_id, (row_count, rate) in per_post.items()
+        ])
+
+    @staticmethod
+    def _snapshot_deltas(rows: List[Tuple], posts: Dict, current: Dict) -> List[Tuple]:
+        """
+        Engagement history rows for one poll: the net change per
+        (post_id, platform), skipping pairs whose metrics did not change
+        """
+        poll_time = int(time.time())
+        latest = {}
+        deltas = defaultdict(lambda: [0, 0, 0, 0])
+
+        for post_id, platform, views, likes, comments, shares, _ in rows:
+            if post_id not in posts:
+                continue
+
+            key = (post_id, platform)
+            old = latest.get(key) or current.get(key) or (0, 0, 0, 0)
+            new = (views, likes, comments, shares)
+            latest[key] = new
+
+            delta = deltas[key]
+            for i in range(4):
+                delta[i] += new[i] - old[i]
+
+        return [
+            (post_id, platform, poll_time, 0, *delta)
+            for (post_id, platform), delta in deltas.items()
+            if any(delta)
+        ]
+
+    @staticmethod
+    def _fold_rollup_deltas(rows: List[Tuple], posts: Dict, current: Dict) -> Tuple[Dict, Dict]:
+        """
+        Accumulate rollup deltas for a batch of analytics rows
+
+        current is updated in place so repeated (post_id, platform) rows in
+        one batch only contribute their net change. Max columns assume
+        engagement counts only grow between polls.
+        """
+        posts_with_rows = {post_id for post_id, _ in current}
+        # post_count, row_count, views, likes, comments, shares, rate, 4x max
+        daily = defaultdict(lambda: [0, 0, 0, 0, 0, 0, 0.0, 0, 0, 0, 0])
+        per_post = defaultdict(lambda: [0, 0.0])
+
+        for post_id, platform, views, likes, comments, shares, rate in rows:
+            new = (views, likes, comments, shares, rate)
+            old = current.get((post_id, platform))
+            current[(post_id, platform)] = new
+
+            first_row_for_post = post_id not in posts_with_rows
+            posts_with_rows.add(post_id)
+
+            if post_id not in posts:
+                continue
+
+            old_values = old or (0, 0, 0, 0, 0.0)
+            new_row = 1 if old is None else 0
+
+            post_delta = per_post[post_id]
+            post_delta[0] += new_row
+            post_delta[1] += rate - old_values[4]
+
+            dimensions = posts[post_id]
+            if dimensions is None:
+                continue
+
+            day, voice_type, scenario, has_media, day_of_week, hour = dimensions
+            acc = daily[(day, platform, voice_type, scenario, has_media, day_of_week, hour)]
+            acc[0] += 1 if first_row_for_post else 0
+            acc[1] += new_row
+            for i in range(5):
+                acc[2 + i] += new[i] - old_values[i]
+            for i in range(4):
+                acc[7 + i] = max(acc[7 + i], new[i])
+
+        return daily, per_post
+
+    @classmethod
+    def refresh_post_rollups(cls, conn, old_dimensions: Dict[int, Optional[Tuple]]):
+        """
+        Bring the rollups up to date after posts were edited or deleted
+
+        DatabaseManager calls this when a post's rollup dimensions change
+        (e.g. it is published after engagement was recorded) or the post is
+        deleted. Every daily rollup row the posts fed before or after the
+        change is recomputed from analytics (max columns cannot be
+        decremented), and a deleted post's per-post rollup is dropped.
+        Runs inside the caller's transaction.
+
+        Args:
+            conn: Connection holding the uncommitted post change
+            old_dimensions: post_id -> _rollup_dimensions() before the change
+        """
+        post_ids = list(old_dimensions)
+        new_dimensions = cls.load_post_dimensions(conn, post_ids)
+
+        with_engagement = set()
+        for chunk in _chunked(post_ids):
+            placeholders = ", ".join("?" * len(chunk))
+            with_engagement.update(row[0] for row in conn.execute(
+                f"SELECT DISTINCT post_id FROM analytics WHERE post_id IN ({placeholders})", chunk
+            ))
+
+            deleted = [post_id for post_id in chunk if post_id not in new_dimensions]
+            if deleted:
+                conn.execute(
+                    f"DELETE FROM analytics_post_rollup WHERE post_id IN ({', '.join('?' * len(deleted))})",
+                    deleted
+                )
+
+        affected = set()
+        for post_id in with_engagement:
+            old, new = old_dimensions[post_id], new_dimensions.get(post_id)
+            if old != new:
+                affected.update(dimensions for dimensions in (old, new) if dimensions is not None)
+
+        for dimensions in affected:
+            cls._recompute_daily_rollup(conn, dimensions)
+
+    @classmethod
+    def _recompute_daily_rollup(cls, conn, dimensions: Tuple):
+        """Replace the daily rollup rows (all platforms) for one set of post dimensions"""
+        day, voice_type, scenario, has_media, day_of_week, hour = dimensions
+        conn.execute("""
+            DELETE FROM analytics_daily_rollup
+            WHERE day = ? AND voice_type = ? AND scenario = ?
+              AND has_media = ? AND day_of_week = ? AND hour = ?
+        """, dimensions)
+
+        posts = {}
+        for row in conn.execute("""
+            SELECT id, status, published_at, voice_type, scenario, graphic_url, video_url
+            FROM posts WHERE status = 'published' AND voice_type = ? AND scenario = ?
+        """, (voice_type, scenario)):
+            if cls._rollup_dimensions(row) == dimensions:
+                posts[row['id']] = dimensions
+
+        rows = []
+        for chunk in _chunked(sorted(posts)):
+            placeholders = ", ".join("?" * len(chunk))
+            rows.extend(tuple(row) for row in conn.execute(f"""
+                SELECT id, post_id, platform, views, likes, comments, shares, engagement_rate
+                FROM analytics WHERE post_id IN ({placeholders})
+            """, chunk))
+        rows = [row[1:] for row in sorted(rows)]  # Analytics id order, as in rebuild_rollups
+
+        daily, _ = cls._fold_rollup_deltas(rows, posts, {})
+        conn.executemany(cls._UPSERT_DAILY_ROLLUP_SQL, [
+            key + tuple(values) for key, values in daily.items()
+        ])
+
+    def rebuild_rollups(self):
+        """
+        Recompute the rollup tables from scratch
+
+        Run after bulk edits that bypass both record_engagement and
+        DatabaseManager's post methods (e.g. raw SQL).
+        """
+        conn = self.db._get_connection()
+
+        with conn:
+            conn.execute("DELETE FROM analytics_daily_rollup")
+            conn.execute("DELETE FROM analytics_post_rollup")
+
+            posts = {
+                row['id']: self._rollup_dimensions(row)
+                for row in conn.execute("""
+                    SELECT id, status, published_at, voice_type, scenario, graphic_url, video_url
+                    FROM posts
+                """)
+            }
+            rows = [
+                tuple(row) for row in conn.execute("""
+                    SELECT post_id, platform, views, likes, comments, shares, engagement_rate
+                    FROM analytics ORDER BY id
+                """)
+            ]
+
+            daily, per_post = self._fold_rollup_deltas(rows, posts, {})
+            conn.executemany(self._UPSERT_DAILY_ROLLUP_SQL, [
+                key + tuple(values) for key, values in daily.items()
+            ])
+            conn.executemany(self._UPSERT_POST_ROLLUP_SQL, [
+                (post_id, row_count, rate, rate, row_count)
+                for post_id, (row_count, rate) in per_post.items()
+            ])
+
+        self.invalidate_snapshot()
+
+    def _rollups_stale(self) -> bool:
+        """
+        Check whether the rollups disagree with analytics JOIN posts
+
+        Compares row counts and engagement totals of both rollup tables,
+        which catches databases created before the rollups existed and
+        edits made behind DatabaseManager's back.
+        """
+        conn = self.db._get_connection()
+        expected = conn.execute("""
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(a.engagement_rate), 0),
+                COALESCE(SUM(CASE WHEN p.status = 'published' THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN p.status = 'published' THEN a.views ELSE 0 END), 0)
+            FROM analytics a JOIN posts p ON a.post_id = p.id
+        """).fetchone()
+        per_post = conn.execute("""
+            SELECT COALESCE(SUM(row_count), 0), COALESCE(SUM(total_engagement_rate), 0)
+            FROM analytics_post_rollup
+        """).fetchone()
+        daily = conn.execute("""
+            SELECT COALESCE(SUM(row_count), 0), COALESCE(SUM(total_views), 0)
+            FROM analytics_daily_rollup
+        """).fetchone()
+
+        return (
+            expected[0] != per_post[0]
+            or abs(expected[1] - per_post[1]) > 1e-6 * max(1.0, abs(expected[1]))
+            or expected[2] != daily[0]
+            or expected[3] != daily[1]
+        )
+
+    # ========================================================================
+    # ENGAGEMENT HISTORY
+    # ========================================================================
+
+    def _maybe_downsample_history(self):
+        """Downsample engagement history at most once per interval"""
+        now = time.monotonic()
+        if self._last_downsample is not None and now - self._last_downsample < self.DOWNSAMPLE_INTERVAL_SECONDS:
+            return
+
+        self._last_downsample = now
+        try:
+            self.downsample_engagement_history()
+        except Exception as e:
+            print(f"[WARN] Engagement history downsampling failed: {e}")
+
+    def downsample_engagement_history(self, now: Optional[float] = None) -> Dict:
+        """
+        Merge old engagement history into coarser buckets
+
+        Raw polls older than RAW_HISTORY_SECONDS become hourly buckets;
+        hourly buckets older than HOURLY_HISTORY_SECONDS become daily
+        buckets. Deltas are additive, so merging never changes a curve's
+        cumulative values, only its time resolution.
+
+        Returns:
+            Number of buckets written at each resolution
+        """
+        now = int(now if now is not None else time.time())
+        raw_cutoff = (now - self.RAW_HISTORY_SECONDS) // 3600 * 3600
+        hourly_cutoff = (now - self.HOURLY_HISTORY_SECONDS) // 86400 * 86400
+
+        conn = self.db._get_connection()
+        with conn:
+            hourly = self._merge_history_buckets(conn, 0, 3600, raw_cutoff)
+            daily = self._merge_history_buckets(conn, 3600, 86400, hourly_cutoff)
+
+        return {"hourly_buckets": hourly, "daily_buckets": daily}
+
+    def _merge_history_buckets(self, conn, from_resolution: int, to_resolution: int, cutoff: int) -> int:
+        """Replace rows older than cutoff at one resolution with coarser buckets"""
+        buckets = conn.execute("""
+            SELECT
+                post_id, platform, (bucket_start / ?) * ? as bucket,
+                SUM(d_views), SUM(d_likes), SUM(d_comments), SUM(d_shares)
+            FROM engagement_snapshots
+            WHERE resolution = ? AND bucket_start < ?
+            GROUP BY post_id, platform, bucket
+        """, (to_resolution, to_resolution, from_resolution, cutoff)).fetchall()
+
+        conn.execute("""
+            DELETE FROM engagement_snapshots
+            WHERE resolution = ? AND bucket_start < ?
+        """, (from_resolution, cutoff))
+
+        conn.executemany(self._UPSERT_SNAPSHOT_SQL, [
+            (post_id, platform, bucket, to_resolution, views, likes, comments, shares)
+            for post_id, platform, bucket, views, likes, comments, shares in buckets
+        ])
+
+        return len(buckets)
+
+    def get_engagement_curve(self, post_id: int, platform: Optional[str] = None) -> Dict:
+        """
+        Cumulative engagement over time for one post
+
+        Each point is the running total at the end of a history bucket.
+
+        Args:
+            post_id: Post ID
+            platform: Limit to one platform (None = all)
+
+        Returns:
+            Dict with one list of points per platform
+        """
+        conn = self.db._get_connection()
+
+        post = conn.execute("""
+            SELECT id, CAST(strftime('%s', published_at) AS INTEGER) as published_epoch
+            FROM posts WHERE id = ?
+        """, (post_id,)).fetchone()
+
+        if not post:
+            return {"error": "Post not found"}
+
+        query = """
+            SELECT platform, bucket_start, resolution, d_views, d_likes, d_comments, d_shares
+            FROM engagement_snapshots
+            WHERE post_id = ?
+        """
+        params = [post_id]
+        if platform:
+            query += " AND platform = ?"
+            params.append(platform)
+        query += " ORDER BY platform, bucket_start"
+
+        published_epoch = post['published_epoch']
+        curves = defaultdict(list)
+        totals = defaultdict(lambda: [0, 0, 0, 0])
+
+        for row in conn.execute(query, params):
+            running = totals[row['platform']]
+            running[0] += row['d_views']
+            running[1] += row['d_likes']
+            running[2] += row['d_comments']
+            running[3] += row['d_shares']
+
+            point_epoch = row['bucket_start'] + row['resolution']
+            curves[row['platform']].append({
+                "time": datetime.utcfromtimestamp(point_epoch).isoformat(),
+                "hours_since_publish": (
+                    round((point_epoch - published_epoch) / 3600, 2)
+                    if published_epoch is not None else None
+                ),
+                "resolution_seconds": row['resolution'],
+                "views": running[0],
+                "likes": running[1],
+                "comments": running[2],
+                "shares": running[3]
+            })
+
+        return {
+            "post_id": post_id,
+            "curves": dict(curves)
+        }
+
+    def get_cohort_curve(
+        self,
+        platform: str = "linkedin",
+        voice_type: Optional[str] = None,
+        scenario: Optional[str] = None
+    ) -> Dict:
+        """
+        Average cumulative engagement at fixed offsets after publishing
+
+        For each horizon in COHORT_HORIZONS (t+1h, t+24h, t+7d), averages
+        over published posts that are at least that old. A history bucket
+        counts toward a horizon only if it ends by then.
+
+        Args:
+            platform: Platform to analyze
+            voice_type: Optional voice type filter
+            scenario: Optional scenario filter
+
+        Returns:
+            Dict of horizon -> post count and average views/likes/comments/shares
+        """
+        conn = self.db._get_connection()
+        metrics = ("views", "likes", "comments", "shares")
+
+        columns = ",\n".join(
+            f"SUM(CASE WHEN s.bucket_start + s.resolution <= p.published_epoch + {offset} "
+            f"THEN s.d_{metric} ELSE 0 END) as {metric}_{label}"
+            for label, offset in self.COHORT_HORIZONS.items()
+            for metric in metrics
+        )
+
+        filters = ""
+        params = []
+        if voice_type:
+            filters += " AND voice_type = ?"
+            params.append(voice_type)
+        if scenario:
+            filters += " AND scenario = ?"
+            params.append(scenario)
+
+        rows = conn.execute(f"""
+            SELECT p.published_epoch, {columns}
+            FROM engagement_snapshots s
+            JOIN (
+                SELECT id, CAST(strftime('%s', published_at) AS INTEGER) as published_epoch
+                FROM posts
+                WHERE status = 'published' AND published_at IS NOT NULL{filters}
+            ) p ON s.post_id = p.id
+            WHERE s.platform = ?
+            AND p.published_epoch IS NOT NULL
+            GROUP BY p.id
+        """, params + [platform]).fetchall()
+
+        now = time.time()
+        horizons = {}
+        for label, offset in self.COHORT_HORIZONS.items():
+            cohort = [row for row in rows if row['published_epoch'] + offset <= now]
+            horizons[label] = {"posts": len(cohort)}
+            for metric in metrics:
+                values = [row[f"{metric}_{label}"] for row in cohort]
+                horizons[label][f"avg_{metric}"] = round(sum(values) / len(values), 2) if values else None
+
+        return {
+            "platform": platform,
+            "voice_type": voice_type,
+            "scenario": scenario,
+            "horizons": horizons
+        }
+
     # ========================================================================
     # PERFORMANCE METRICS
     # ========================================================================
@@ -159,28 +866,27 @@ class AnalyticsEngine:
 
         total_posts = cursor.fetchone()['total_posts']
 
-        # Get aggregated metrics (adapted for flat schema)
+        # Get aggregated metrics from the daily rollups
         cursor.execute("""
             SELECT
                 platform,
-                SUM(views) as total_views,
-                AVG(views) as avg_views,
-                MAX(views) as best_views,
-                SUM(likes) as total_likes,
-                AVG(likes) as avg_likes,
-                MAX(likes) as best_likes,
-                SUM(comments) as total_comments,
-                AVG(comments) as avg_comments,
-                MAX(comments) as best_comments,
-                SUM(shares) as total_shares,
-                AVG(shares) as avg_shares,
-                MAX(shares) as best_shares,
-                AVG(engagement_rate) as avg_engagement
-            FROM analytics a
-            JOIN posts p ON a.post_id = p.id
-            WHERE p.published_at >= ?
+                SUM(total_views) as total_views,
+                SUM(total_views) * 1.0 / NULLIF(SUM(row_count), 0) as avg_views,
+                MAX(max_views) as best_views,
+                SUM(total_likes) as total_likes,
+                SUM(total_likes) * 1.0 / NULLIF(SUM(row_count), 0) as avg_likes,
+                MAX(max_likes) as best_likes,
+                SUM(total_comments) as total_comments,
+                SUM(total_comments) * 1.0 / NULLIF(SUM(row_count), 0) as avg_comments,
+                MAX(max_comments) as best_comments,
+                SUM(total_shares) as total_shares,
+                SUM(total_shares) * 1.0 / NULLIF(SUM(row_count), 0) as avg_shares,
+                MAX(max_shares) as best_shares,
+                SUM(total_engagement_rate) / NULLIF(SUM(row_count), 0) as avg_engagement
+            FROM analytics_daily_rollup
+            WHERE day >= ?
             GROUP BY platform
-        """, (cutoff_date,))
+        """, (cutoff_date[:10],))
 
         metrics = defaultdict(lambda: defaultdict(dict))
 
@@ -231,90 +937,11 @@ class AnalyticsEngine:
         - Hour of day
         - Day/hour combination
         """
-        conn = self.db._get_connection()
-        cursor = conn.cursor()
-
-        # Get all posts with their engagement (adapted for flat schema)
-        cursor.execute("""
-            SELECT
-                p.id,
-                p.published_at,
-                COALESCE(a.engagement_rate, 0) as avg_engagement
-            FROM posts p
-            LEFT JOIN analytics a ON p.id = a.post_id AND a.platform = ?
-            WHERE p.status = 'published'
-            AND p.published_at IS NOT NULL
-            AND a.engagement_rate > 0
-        """, (platform,))
-
-        posts = cursor.fetchall()
-
-        if not posts:
-            return {
-                "message": "Not enough data yet",
-                "recommendation": "Post consistently for 2-4 weeks to get insights"
-            }
-
-        # Analyze by day of week
-        by_day = defaultdict(list)
-        by_hour = defaultdict(list)
-        by_day_hour = defaultdict(list)
-
-        for post in posts:
-            try:
-                dt = datetime.fromisoformat(post['published_at'].replace('Z', '+00:00'))
-                day_name = dt.strftime('%A')
-                hour = dt.hour
-                engagement = post['avg_engagement']
-
-                by_day[day_name].append(engagement)
-                by_hour[hour].append(engagement)
-                by_day_hour[(day_name, hour)].append(engagement)
+        return self.best_times.analyze_best_times(platform=platform)
 
-            except Exception as e:
-                continue
-
-        # Calculate averages
-        day_averages = {
-            day: round(statistics.mean(engagements), 2)
-            for day, engagements in by_day.items()
-        }
-
-        hour_averages = {
-            hour: round(statistics.mean(engagements), 2)
-            for hour, engagements in by_hour.items()
-        }
-
-        # Find best times
-        best_day = max(day_averages.items(), key=lambda x: x[1]) if day_averages else None
-        best_hour = max(hour_averages.items(), key=lambda x: x[1]) if hour_averages else None
-
-        # Top 3 day/hour combinations
-        combo_averages = {
-            f"{day} at {hour:02d}:00": round(statistics.mean(engagements), 2)
-            for (day, hour), engagements in by_day_hour.items()
-        }
-
-        top_combos = sorted(combo_averages.items(), key=lambda x: x[1], reverse=True)[:3]
-
-        return {
-            "platform": platform,
-            "data_points": len(posts),
-            "best_day": {
-                "day": best_day[0] if best_day else None,
-                "avg_engagement": best_day[1] if best_day else 0
-            },
-            "best_hour": {
-                "hour": best_hour[0] if best_hour else None,
-                "avg_engagement": best_hour[1] if best_hour else 0
-            },
-            "top_combinations": [
-                {"time": combo[0], "avg_engagement": combo[1]}
-                for combo in top_combos
-            ],
-            "all_days": day_averages,
-            "all_hours": {f"{h:02d}:00": v for h, v in hour_averages.items()}
-        }
+    def get_heatmap(self, platform: str = "linkedin") -> Dict:
+        """Get the 7x24 day/hour engagement heatmap for a platform"""
+        return self.best_times.get_heatmap(platform=platform)
 
     # ========================================================================
     # CONTENT ANALYSIS
@@ -332,16 +959,14 @@ class AnalyticsEngine:
         conn = self.db._get_connection()
         cursor = conn.cursor()
 
-        # Performance by voice type (adapted for flat schema)
+        # Performance by voice type (from daily rollups)
         cursor.execute("""
             SELECT
-                p.voice_type,
-                COUNT(DISTINCT p.id) as post_count,
-                AVG(a.engagement_rate) as avg_metric
-            FROM posts p
-            LEFT JOIN analytics a ON p.id = a.post_id
-            WHERE p.status = 'published'
-            GROUP BY p.voice_type
+                voice_type,
+                SUM(post_count) as post_count,
+                SUM(total_engagement_rate) / NULLIF(SUM(row_count), 0) as avg_metric
+            FROM analytics_daily_rollup
+            GROUP BY voice_type
             HAVING avg_metric IS NOT NULL
         """)
 
@@ -353,16 +978,14 @@ class AnalyticsEngine:
             for row in cursor.fetchall()
         }
 
-        # Performance by scenario (adapted for flat schema)
+        # Performance by scenario (from daily rollups)
         cursor.execute("""
             SELECT
-                p.scenario,
-                COUNT(DISTINCT p.id) as post_count,
-                AVG(a.engagement_rate) as avg_metric
-            FROM posts p
-            LEFT JOIN analytics a ON p.id = a.post_id
-            WHERE p.status = 'published'
-            GROUP BY p.scenario
+                scenario,
+                SUM(post_count) as post_count,
+                SUM(total_engagement_rate) / NULLIF(SUM(row_count), 0) as avg_metric
+            FROM analytics_daily_rollup
+            GROUP BY scenario
             HAVING avg_metric IS NOT NULL
             ORDER BY avg_metric DESC
         """)
@@ -376,18 +999,13 @@ class AnalyticsEngine:
             for row in cursor.fetchall()
         ]
 
-        # Performance with vs without media (adapted for flat schema)
+        # Performance with vs without media (from daily rollups)
         cursor.execute("""
             SELECT
-                CASE
-                    WHEN p.graphic_url IS NOT NULL OR p.video_url IS NOT NULL THEN 'with_media'
-                    ELSE 'without_media'
-                END as media_status,
-                COUNT(DISTINCT p.id) as post_count,
-                AVG(a.engagement_rate) as avg_metric
-            FROM posts p
-            LEFT JOIN analytics a ON p.id = a.post_id
-            WHERE p.status = 'published'
+                CASE WHEN has_media = 1 THEN 'with_media' ELSE 'without_media' END as media_status,
+                SUM(post_count) as post_count,
+                SUM(total_engagement_rate) / NULLIF(SUM(row_count), 0) as avg_metric
+            FROM analytics_daily_rollup
             GROUP BY media_status
             HAVING avg_metric IS NOT NULL
         """)
@@ -408,7 +1026,7 @@ class AnalyticsEngine:
         }
 
     def get_top_performing_posts(self, limit: int = 10, metric: str = "engagement_rate") -> List[Dict]:
-        """Get top performing posts (adapted for flat schema)"""
+        """Get top performing posts (walks the per-post rollup by performance)"""
         conn = self.db._get_connection()
         cursor = conn.cursor()
 
@@ -419,13 +1037,12 @@ class AnalyticsEngine:
                 p.voice_type,
                 p.scenario,
                 p.published_at,
-                AVG(a.engagement_rate) as performance
-            FROM posts p
-            JOIN analytics a ON p.id = a.post_id
+                r.performance
+            FROM analytics_post_rollup r
+            JOIN posts p ON r.post_id = p.id
             WHERE p.status = 'published'
-            GROUP BY p.id, p.content, p.voice_type, p.scenario, p.published_at
-            HAVING performance IS NOT NULL
-            ORDER BY performance DESC
+            AND r.row_count > 0
+            ORDER BY r.performance DESC
             LIMIT ?
         """, (limit,))
 
@@ -445,12 +1062,29 @@ class AnalyticsEngine:
     # INSIGHTS & RECOMMENDATIONS
     # ========================================================================
 
-    def generate_insights(self) -> Dict:
-        """Generate actionable insights from analytics data"""
+    def count_recent_posts(self, days: int = 7) -> int:
+        """Count posts created in the last N days"""
+        cutoff_date = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+        conn = self.db._get_connection()
+        cursor = conn.execute(
+            "SELECT COUNT(*) as count FROM posts WHERE created_at >= ?",
+            (cutoff_date,)
+        )
+        return cursor.fetchone()['count']
+
+    def generate_insights(self, snapshot: Optional[AnalyticsSnapshot] = None) -> Dict:
+        """
+        Generate actionable insights from analytics data
+
+        Args:
+            snapshot: Snapshot to read from (default: the cached snapshot)
+        """
+        snapshot = snapshot or self.get_snapshot()
         insights = []
 
         # Check posting frequency
-        posts_last_7days = len(self.db.get_all_posts(limit=1000))
+        posts_last_7days = snapshot.recent_post_count(days=7)
         if posts_last_7days < 3:
             insights.append({
                 "type": "frequency",
@@ -459,7 +1093,7 @@ class AnalyticsEngine:
             })
 
         # Best time analysis
-        best_times = self.analyze_best_times()
+        best_times = snapshot.best_times()
         if best_times.get('best_day'):
             insights.append({
                 "type": "timing",
@@ -468,7 +1102,7 @@ class AnalyticsEngine:
             })
 
         # Content performance
-        content_analysis = self.analyze_content_performance()
+        content_analysis = snapshot.content_performance()
         scenarios = content_analysis.get('by_scenario', [])
         if scenarios:
             best_scenario = scenarios[0]
@@ -500,21 +1134,29 @@ class AnalyticsEngine:
     # DASHBOARD SUMMARY
     # ========================================================================
 
+    def get_snapshot(self) -> AnalyticsSnapshot:
+        """Get the cached analytics snapshot, starting a new one if it expired"""
+        with self._snapshot_lock:
+            if self._snapshot is None or self._snapshot.is_expired():
+                self._snapshot = AnalyticsSnapshot(self, ttl_seconds=self.snapshot_ttl)
+            return self._snapshot
+
+    def invalidate_snapshot(self):
+        """Drop the cached snapshot (called after engagement writes)"""
+        with self._snapshot_lock:
+            self._snapshot = None
+
     def get_dashboard_summary(self) -> Dict:
         """Get complete analytics summary for dashboard"""
-        overall = self.get_overall_performance(days=30)
-        best_times = self.analyze_best_times()
-        content = self.analyze_content_performance()
-        top_posts = self.get_top_performing_posts(limit=5)
-        insights = self.generate_insights()
+        snapshot = self.get_snapshot()
 
         return {
-            "summary": overall,
-            "best_times": best_times,
-            "content_performance": content,
-            "top_posts": top_posts,
-            "insights": insights,
-            "generated_at": datetime.now().isoformat()
+            "summary": snapshot.overall_performance(days=30),
+            "best_times": snapshot.best_times(),
+            "content_performance": snapshot.content_performance(),
+            "top_posts": snapshot.top_posts(limit=5),
+            "insights": snapshot.insights(),
+            "generated_at": snapshot.generated_at
         }
 
 
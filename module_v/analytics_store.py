@@ -0,0 +1,289 @@
+"""
+Analytics Event Store - Append-only storage for AnalyticsTracker
+JSONL event log + in-memory state, compacted into a JSON snapshot
+"""
+
+import bisect
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class TimeIndex:
+    """
+    Posts kept sorted by publish time, with timestamps parsed once
+
+    Parallel lists of epoch seconds, publish hour and the post dicts
+    themselves (shared with the store, so metric updates are visible).
+    Window queries are bisect range scans.
+    """
+
+    def __init__(self):
+        self.epochs: List[float] = []
+        self.hours: List[int] = []
+        self.posts: List[Dict] = []
+
+    def add(self, epoch: float, hour: int, post: Dict):
+        """Insert a post; O(1) when posts arrive in time order"""
+        position = bisect.bisect_right(self.epochs, epoch)
+        self.epochs.insert(position, epoch)
+        self.hours.insert(position, hour)
+        self.posts.insert(position, post)
+
+    def _start(self, since: Optional[datetime]) -> int:
+        if since is None:
+            return 0
+        return bisect.bisect_left(self.epochs, since.timestamp())
+
+    def since(self, since: Optional[datetime] = None) -> List[Dict]:
+        """Posts published at or after since, oldest first"""
+        return self.posts[self._start(since):]
+
+    def hours_since(self, since: Optional[datetime] = None) -> List[int]:
+        """Publish hours of the posts returned by since()"""
+        return self.hours[self._start(since):]
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+
+class AnalyticsEventStore:
+    """
+    Append-only storage engine for tracked post analytics
+
+    Every write is one JSON line appended to the event log, so writes are
+    O(1) regardless of history size. State lives in memory (the legacy
+    {"posts": [...], "summary": {}} shape plus a dict index by post id).
+    Once enough events accumulate, a background thread folds them into the
+    snapshot file and trims the log.
+
+    Events carry a sequence number and the snapshot records the last one it
+    contains, so replay is idempotent: a crash at any point loses at most
+    the last partially written line.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        log_path: Optional[str] = None,
+        compact_every: int = 1000,
+        fsync: bool = False
+    ):
+        """
+        Initialize event store and replay existing data
+
+        Args:
+            snapshot_path: Compacted snapshot (JSON, legacy analytics.json format)
+            log_path: Event log (JSONL, default: snapshot path with .jsonl suffix)
+            compact_every: Log events before a background compaction starts
+            fsync: fsync after every append (durable across power loss, slower)
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.log_path = Path(log_path) if log_path else self.snapshot_path.with_suffix(".jsonl")
+        self.compact_every = compact_every
+        self.fsync = fsync
+
+        self.data: Dict = {"posts": [], "summary": {}}
+        self.index: Dict[str, Dict] = {}
+        self.by_time = TimeIndex()
+        self.by_platform: Dict[str, TimeIndex] = {}
+
+        self._seq = 0
+        self._log_events = 0
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+        self._load()
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._log = open(self.log_path, "ab")
+
+    # ========================================================================
+    # LOADING / REPLAY
+    # ========================================================================
+
+    def _load(self):
+        """Load the snapshot, then replay the log tail"""
+        snapshot_seq = 0
+
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                snapshot_seq = snapshot.pop("last_seq", 0)
+                self.data = snapshot
+                self.data.setdefault("posts", [])
+                self.data.setdefault("summary", {})
+            except Exception as e:
+                print(f"[WARN] Could not load analytics snapshot: {e}")
+
+        for post in self.data["posts"]:
+            self._index_post(post)
+
+        self._seq = snapshot_seq
+
+        if not self.log_path.exists():
+            return
+
+        with open(self.log_path, "rb") as f:
+            raw = f.read()
+
+        # Anything after the last newline is a torn write; drop it so the
+        # next append starts on a clean line
+        complete_length = raw.rfind(b"\n") + 1
+        if complete_length < len(raw):
+            print(f"[WARN] Discarding partial analytics log entry ({len(raw) - complete_length} bytes)")
+            with open(self.log_path, "r+b") as f:
+                f.truncate(complete_length)
+
+        for line_number, line in enumerate(raw[:complete_length].splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"[WARN] Skipping corrupt analytics log line {line_number}")
+                continue
+
+            self._log_events += 1
+            if event.get("seq", 0) > snapshot_seq:
+                self._apply(event)
+                self._seq = max(self._seq, event["seq"])
+
+    def _apply(self, event: Dict):
+        """Apply one event to in-memory state"""
+        op = event.get("op")
+
+        if op == "track":
+            post = event["post"]
+            self.data["posts"].append(post)
+            self._index_post(post)
+
+        elif op == "update":
+            post = self.index.get(event["id"])
+            if post is not None:
+                post.setdefault("metrics", {}).update(event["metrics"])
+                post["last_updated"] = event["last_updated"]
+
+    def _index_post(self, post: Dict):
+        """Add a post to the secondary indexes"""
+        self.index.setdefault(post["id"], post)
+
+        try:
+            published_at = datetime.fromisoformat(post["published_at"])
+        except (KeyError, TypeError, ValueError):
+            print(f"[WARN] Post {post.get('id')} has no valid published_at; not time-indexed")
+            return
+
+        epoch = published_at.timestamp()
+        self.by_time.add(epoch, published_at.hour, post)
+        self.by_platform.setdefault(post.get("platform", ""), TimeIndex()).add(
+            epoch, published_at.hour, post
+        )
+
+    # ========================================================================
+    # WRITES
+    # ========================================================================
+
+    def append(self, event: Dict):
+        """
+        Durably record an event and apply it to in-memory state
+
+        Args:
+            event: {"op": "track", "post": {...}} or
+                   {"op": "update", "id": ..., "metrics": {...}, "last_updated": ...}
+        """
+        with self._lock:
+            event = {**event, "seq": self._seq + 1}
+
+            self._log.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+
+            self._seq = event["seq"]
+            self._apply(event)
+            self._log_events += 1
+
+            if self._log_events >= self.compact_every and not self._compaction_running():
+                self._compaction_thread = threading.Thread(
+                    target=self.compact,
+                    name="analytics-compaction",
+                    daemon=True
+                )
+                self._compaction_thread.start()
+
+    def _compaction_running(self) -> bool:
+        return self._compaction_thread is not None and self._compaction_thread.is_alive()
+
+    # ========================================================================
+    # COMPACTION
+    # ========================================================================
+
+    def compact(self):
+        """
+        Fold the event log into the snapshot and trim the log
+
+        The state copy is taken under the lock; serialization and the
+        snapshot write happen outside it so writers are not blocked.
+        Events appended meanwhile stay in the trimmed log.
+        """
+        with self._compaction_lock:
+            self._compact()
+
+    def _compact(self):
+        """Compaction body (caller holds the compaction lock)"""
+        try:
+            with self._lock:
+                posts = [
+                    {**post, "metrics": dict(post.get("metrics", {}))}
+                    for post in self.data["posts"]
+                ]
+                snapshot = {**self.data, "posts": posts, "last_seq": self._seq}
+                self._log.flush()
+                log_offset = self._log.tell()
+
+            tmp_path = self.snapshot_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            with self._lock:
+                self._log.flush()
+                self._log.close()
+
+                with open(self.log_path, "rb") as f:
+                    f.seek(log_offset)
+                    tail = f.read()
+
+                tmp_log = self.log_path.with_suffix(".jsonl.tmp")
+                with open(tmp_log, "wb") as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_log, self.log_path)
+
+                self._log = open(self.log_path, "ab")
+                self._log_events = tail.count(b"\n")
+
+        except Exception as e:
+            print(f"[ERROR] Analytics compaction failed: {e}")
+            with self._lock:
+                if self._log.closed:
+                    self._log = open(self.log_path, "ab")
+
+    def close(self):
+        """Wait for any running compaction and close the log"""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+
+        with self._lock:
+            if not self._log.closed:
+                self._log.close()
@@ -5,7 +5,7 @@ Provides insights and recommendations for content optimization
 
 import os
 import sys
-import json
+import heapq
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pathlib import Path
@@ -14,6 +14,8 @@ from collections import defaultdict
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from module_v.analytics_store import AnalyticsEventStore, TimeIndex
+
 class AnalyticsTracker:
     """
     Tracks and analyzes post performance across platforms
@@ -24,37 +26,17 @@ class AnalyticsTracker:
         Initialize analytics tracker
 
         Args:
-            storage_path: Path to store analytics data (JSON file)
+            storage_path: Path to the analytics snapshot (JSON file); events
+                          are appended to a .jsonl log beside it
         """
         if storage_path is None:
             storage_path = Path(__file__).parent.parent / "data" / "analytics.json"
 
         self.storage_path = Path(storage_path)
-        self.analytics_data: Dict = {
-            "posts": [],
-            "summary": {}
-        }
-
-        # Load existing data if available
-        self._load_data()
 
-    def _load_data(self):
-        """Load analytics data from file"""
-        if self.storage_path.exists():
-            try:
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    self.analytics_data = json.load(f)
-            except Exception as e:
-                print(f"[WARN] Could not load analytics data: {e}")
-
-    def _save_data(self):
-        """Save analytics data to file"""
-        try:
-            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(self.analytics_data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"[ERROR] Could not save analytics data: {e}")
+        # Append-only event log + snapshot; loads existing data on startup
+        self._store = AnalyticsEventStore(self.storage_path)
+        self.analytics_data: Dict = self._store.data
 
     def track_post(
         self,
@@ -83,8 +65,10 @@ class AnalyticsTracker:
             "tracked_at": datetime.now().isoformat()
         }
 
-        self.analytics_data["posts"].append(post_data)
-        self._save_data()
+        try:
+            self._store.append({"op": "track", "post": post_data})
+        except Exception as e:
+            print(f"[ERROR] Could not save analytics data: {e}")
 
     def update_post_metrics(
         self,
@@ -98,14 +82,33 @@ class AnalyticsTracker:
             post_id: Post identifier
             metrics: Updated metrics dict
         """
-        for post in self.analytics_data["posts"]:
-            if post["id"] == post_id:
-                post["metrics"].update(metrics)
-                post["last_updated"] = datetime.now().isoformat()
-                self._save_data()
-                return
+        if post_id not in self._store.index:
+            print(f"[WARN] Post {post_id} not found in analytics data")
+            return
 
-        print(f"[WARN] Post {post_id} not found in analytics data")
+        try:
+            self._store.append({
+                "op": "update",
+                "id": post_id,
+                "metrics": metrics,
+                "last_updated": datetime.now().isoformat()
+            })
+        except Exception as e:
+            print(f"[ERROR] Could not save analytics data: {e}")
+
+    def _time_index(self, platform: Optional[str] = None) -> TimeIndex:
+        """Time-sorted view over all posts or one platform's posts"""
+        if platform is None:
+            return self._store.by_time
+        return self._store.by_platform.get(platform.lower(), TimeIndex())
+
+    def compact(self):
+        """Fold the event log into the snapshot file now"""
+        self._store.compact()
+
+    def close(self):
+        """Flush and close the analytics log"""
+        self._store.close()
 
     def get_post_metrics(self, post_id: str) -> Optional[Dict]:
         """
@@ -117,11 +120,11 @@ class AnalyticsTracker:
         Returns:
             Metrics dict or None if not found
         """
-        for post in self.analytics_data["posts"]:
-            if post["id"] == post_id:
-                return post.get("metrics", {})
+        post = self._store.index.get(post_id)
+        if post is None:
+            return None
 
-        return None
+        return post.get("metrics", {})
 
     def get_platform_performance(
         self,
@@ -140,11 +143,7 @@ class AnalyticsTracker:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
 
-        platform_posts = [
-            p for p in self.analytics_data["posts"]
-            if p["platform"] == platform.lower()
-            and datetime.fromisoformat(p["published_at"]) >= cutoff_date
-        ]
+        platform_posts = self._time_index(platform).since(cutoff_date)
 
         if not platform_posts:
             return {
@@ -191,20 +190,18 @@ class AnalyticsTracker:
         Returns:
             List of top posts
         """
-        posts = self.analytics_data["posts"]
-
         if platform:
-            posts = [p for p in posts if p["platform"] == platform.lower()]
+            posts = self._time_index(platform).posts
+        else:
+            posts = self.analytics_data["posts"]
 
-        # Sort by metric
-        sorted_posts = sorted(
+        # Partial sort: O(n log limit)
+        return heapq.nlargest(
+            limit,
             posts,
-            key=lambda p: p.get("metrics", {}).get(metric, 0),
-            reverse=True
+            key=lambda p: p.get("metrics", {}).get(metric, 0)
         )
 
-        return sorted_posts[:limit]
-
     def get_posting_time_analysis(
         self,
         platform: str,
@@ -222,11 +219,8 @@ class AnalyticsTracker:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
 
-        platform_posts = [
-            p for p in self.analytics_data["posts"]
-            if p["platform"] == platform.lower()
-            and datetime.fromisoformat(p["published_at"]) >= cutoff_date
-        ]
+        index = self._time_index(platform)
+        platform_posts = index.since(cutoff_date)
 
         if not platform_posts:
             return {
@@ -234,13 +228,10 @@ class AnalyticsTracker:
                 "analysis": "Not enough data"
             }
 
-        # Group by hour
+        # Group by hour (publish hours are pre-parsed in the index)
         hourly_performance = defaultdict(list)
 
-        for post in platform_posts:
-            published_at = datetime.fromisoformat(post["published_at"])
-            hour = published_at.hour
-
+        for post, hour in zip(platform_posts, index.hours_since(cutoff_date)):
             engagement = post.get("metrics", {}).get("engagement", 0)
             hourly_performance[hour].append(engagement)
 
@@ -288,13 +279,7 @@ class AnalyticsTracker:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
 
-        posts = [
-            p for p in self.analytics_data["posts"]
-            if datetime.fromisoformat(p["published_at"]) >= cutoff_date
-        ]
-
-        if platform:
-            posts = [p for p in posts if p["platform"] == platform.lower()]
+        posts = self._time_index(platform).since(cutoff_date)
 
         if not posts:
             return {"error": "Not enough data"}
@@ -377,15 +362,12 @@ class AnalyticsTracker:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
 
-        recent_posts = [
-            p for p in self.analytics_data["posts"]
-            if datetime.fromisoformat(p["published_at"]) >= cutoff_date
-        ]
+        recent_posts = self._time_index().since(cutoff_date)
 
         if len(recent_posts) < 2:
             return {"error": "Not enough data"}
 
-        # Split into first half and second half
+        # Split into first half and second half (posts are in publish order)
         midpoint = len(recent_posts) // 2
         first_half = recent_posts[:midpoint]
         second_half = recent_posts[midpoint:]
@@ -0,0 +1,564 @@
+"""
+Article Store - Batched, idempotent news article ingestion
+Stages a monitor cycle's articles in bulk and inserts only new URLs,
+creating their content opportunities in the same transaction, and serves
+ranked full-text lookups over stored articles
+"""
+
+import asyncio
+import json
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+
+
+# Columns of an ingestion record: the article, then its opportunity.
+# url is stored as published; canonical_url (default: url) is the conflict key.
+ARTICLE_COLUMNS = (
+    "title", "url", "canonical_url", "source", "published_date", "content",
+    "categories", "relevance_score", "key_entities"
+)
+OPPORTUNITY_COLUMNS = ("suggested_angle", "urgency", "pillar_alignment")
+STAGING_COLUMNS = ARTICLE_COLUMNS + OPPORTUNITY_COLUMNS
+
+DEFAULT_PLATFORMS = ["linkedin"]
+
+SEARCH_COLUMNS = (
+    "article_id", "title", "url", "source", "published_date",
+    "content", "relevance_score", "categories"
+)
+
+# A duplicate to record on a stored article: (article_id, url, source, relevance_score)
+DuplicateRecord = Tuple[int, str, str, float]
+
+
+def _unique_by_url(records: List[Dict]) -> List[Dict]:
+    """One record per canonical URL, keeping the most relevant"""
+    best: Dict[str, Dict] = {}
+    for record in records:
+        record = {**record, "canonical_url": record.get("canonical_url") or record["url"]}
+        current = best.get(record["canonical_url"])
+        if current is None or record["relevance_score"] > current["relevance_score"]:
+            best[record["canonical_url"]] = record
+    return list(best.values())
+
+
+def _search_terms(terms: List[str]) -> List[str]:
+    """Lowercased alphanumeric search terms, deduplicated in order"""
+    cleaned = []
+    for term in terms:
+        for word in re.findall(r"\w+", term.lower()):
+            if word not in cleaned:
+                cleaned.append(word)
+    return cleaned
+
+
+class PostgresArticleStore:
+    """
+    Article ingestion on PostgreSQL (asyncpg)
+
+    One cycle is a single transaction: COPY the batch into a temporary
+    staging table, then one statement inserts new articles with
+    ON CONFLICT DO NOTHING ... RETURNING and creates opportunities
+    for exactly the returned rows. An article is new unless its canonical
+    URL (or, for rows stored before canonical_url existed, its URL) is
+    already stored. Duplicate merges are one executemany.
+
+    Search uses the generated news_articles.search_vector column and its
+    GIN index, ranked with length-normalized ts_rank_cd (PostgreSQL has no
+    built-in BM25; this is its closest ranking).
+    """
+
+    def __init__(self, db_url: str, db_pool=None):
+        """
+        Initialize PostgreSQL article store
+
+        Args:
+            db_url: PostgreSQL connection URL
+            db_pool: Existing asyncpg pool to share (default: create one)
+        """
+        self.db_url = db_url
+        self.db_pool = db_pool
+        self._owns_pool = db_pool is None
+
+    async def initialize(self):
+        """Create the connection pool (unless one was shared)"""
+        if self.db_pool is not None:
+            return
+        if not ASYNCPG_AVAILABLE:
+            raise RuntimeError("asyncpg is required for PostgreSQL article storage")
+        self.db_pool = await asyncpg.create_pool(self.db_url, min_size=2, max_size=10)
+
+    async def close(self):
+        if self.db_pool and self._owns_pool:
+            await self.db_pool.close()
+
+    async def recent_articles(self, days: int) -> List[Dict]:
+        """Articles stored in the last days (article_id, url, title, content, created_at)"""
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT article_id, url, title, content, created_at
+                FROM news_articles
+                WHERE created_at > NOW() - ($1 * INTERVAL '1 day')
+                ORDER BY created_at
+            """, days)
+        return [dict(row) for row in rows]
+
+    async def all_articles(self) -> List[Dict]:
+        """Every stored article (article_id, title, content)"""
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch("SELECT article_id, title, content FROM news_articles ORDER BY article_id")
+        return [dict(row) for row in rows]
+
+    async def ingest(self, records: List[Dict]) -> Dict[str, int]:
+        """
+        Insert new articles and their content opportunities
+
+        Args:
+            records: One dict per article with STAGING_COLUMNS keys
+
+        Returns:
+            {canonical_url: article_id} for the articles actually inserted
+        """
+        records = _unique_by_url(records)
+        if not records:
+            return {}
+
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS news_articles_staging (
+                        title TEXT,
+                        url TEXT,
+                        canonical_url TEXT,
+                        source TEXT,
+                        published_date TIMESTAMP WITH TIME ZONE,
+                        content TEXT,
+                        categories TEXT[],
+                        relevance_score DOUBLE PRECISION,
+                        key_entities TEXT[],
+                        suggested_angle TEXT,
+                        urgency TEXT,
+                        pillar_alignment TEXT[]
+                    ) ON COMMIT DELETE ROWS
+                """)
+
+                await conn.copy_records_to_table(
+                    "news_articles_staging",
+                    records=[tuple(record[column] for column in STAGING_COLUMNS) for record in records],
+                    columns=list(STAGING_COLUMNS)
+                )
+
+                rows = await conn.fetch("""
+                    WITH inserted AS (
+                        INSERT INTO news_articles (
+                            title, url, canonical_url, source, published_date, content,
+                            categories, relevance_score, key_entities
+                        )
+                        SELECT title, url, canonical_url, source, published_date, content,
+                               categories, relevance_score, key_entities
+                        FROM news_articles_staging
+                        ON CONFLICT DO NOTHING
+                        RETURNING article_id, canonical_url
+                    ), opportunities AS (
+                        INSERT INTO content_opportunities (
+                            type, article_id, suggested_angle, urgency,
+                            pillar_alignment, target_platforms, status
+                        )
+                        SELECT 'news_reaction', i.article_id, s.suggested_angle, s.urgency,
+                               s.pillar_alignment, $1::TEXT[], 'pending'
+                        FROM inserted i
+                        JOIN news_articles_staging s ON s.canonical_url = i.canonical_url
+                    )
+                    SELECT article_id, canonical_url FROM inserted
+                """, DEFAULT_PLATFORMS)
+
+        return {row["canonical_url"]: row["article_id"] for row in rows}
+
+    async def merge_duplicates(self, duplicates: List[DuplicateRecord]):
+        """Record near-duplicate URLs/sources on the articles they duplicate"""
+        if not duplicates:
+            return
+
+        async with self.db_pool.acquire() as conn:
+            await conn.executemany("""
+                UPDATE news_articles SET
+                    duplicate_urls = CASE
+                        WHEN url = $2 OR $2 = ANY(duplicate_urls) THEN duplicate_urls
+                        ELSE array_append(duplicate_urls, $2)
+                    END,
+                    duplicate_sources = CASE
+                        WHEN source = $3 OR $3 = ANY(duplicate_sources) THEN duplicate_sources
+                        ELSE array_append(duplicate_sources, $3)
+                    END,
+                    relevance_score = GREATEST(relevance_score, $4),
+                    updated_at = NOW()
+                WHERE article_id = $1
+            """, duplicates)
+
+    async def search(self, terms: List[str], limit: int = 5, unprocessed_only: bool = True) -> List[Dict]:
+        """
+        Articles matching any term, best match first
+
+        Args:
+            terms: Search terms (OR semantics); empty returns the most
+                   relevant articles instead
+            limit: Maximum articles to return
+            unprocessed_only: Skip articles already used for synthesis
+
+        Returns:
+            Article dicts with SEARCH_COLUMNS keys
+        """
+        terms = _search_terms(terms)
+        processed_filter = "AND processed = FALSE" if unprocessed_only else ""
+
+        async with self.db_pool.acquire() as conn:
+            if not terms:
+                rows = await conn.fetch(f"""
+                    SELECT {", ".join(SEARCH_COLUMNS)}
+                    FROM news_articles
+                    WHERE TRUE {processed_filter}
+                    ORDER BY relevance_score DESC, published_date DESC
+                    LIMIT $1
+                """, limit)
+            else:
+                rows = await conn.fetch(f"""
+                    SELECT {", ".join(SEARCH_COLUMNS)}
+                    FROM news_articles, to_tsquery('english', $1) AS query
+                    WHERE search_vector @@ query {processed_filter}
+                    ORDER BY ts_rank_cd(search_vector, query, 1) DESC,
+                             relevance_score DESC, published_date DESC
+                    LIMIT $2
+                """, " | ".join(terms), limit)
+
+        return [dict(row) for row in rows]
+
+
+class SQLiteArticleStore:
+    """
+    Article ingestion on SQLite (local stand-in for PostgreSQL)
+
+    Same contract as PostgresArticleStore: executemany into a temporary
+    staging table, INSERT ... SELECT ... ON CONFLICT DO NOTHING
+    RETURNING, then the opportunities for the returned rows, all in one
+    transaction. Array columns are stored as JSON text. Calls run in a
+    worker thread so the event loop is never blocked.
+
+    Search uses an FTS5 index over title and content, kept current by
+    triggers and ranked with FTS5's bm25() (title weighted double).
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize SQLite article store
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    async def initialize(self):
+        """Create the article tables if missing"""
+        await asyncio.to_thread(self._create_tables)
+
+    def _create_tables(self):
+        conn = self._connect()
+        try:
+            fts_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'news_articles_fts'"
+            ).fetchone() is not None
+
+            with conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS news_articles (
+                        article_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        title TEXT NOT NULL,
+                        url TEXT UNIQUE NOT NULL,
+                        canonical_url TEXT,
+                        source TEXT NOT NULL,
+                        published_date TEXT NOT NULL,
+                        content TEXT,
+                        summary TEXT,
+                        categories TEXT DEFAULT '[]',
+                        relevance_score REAL DEFAULT 0.0,
+                        key_entities TEXT DEFAULT '[]',
+                        duplicate_urls TEXT DEFAULT '[]',
+                        duplicate_sources TEXT DEFAULT '[]',
+                        processed BOOLEAN DEFAULT 0,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_articles_created ON news_articles(created_at);
+
+                    CREATE TABLE IF NOT EXISTS content_opportunities (
+                        opportunity_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        type TEXT NOT NULL,
+                        insight_id TEXT,
+                        article_id INTEGER REFERENCES news_articles(article_id),
+                        suggested_angle TEXT NOT NULL,
+                        urgency TEXT DEFAULT 'standard',
+                        pillar_alignment TEXT NOT NULL,
+                        target_platforms TEXT DEFAULT '["linkedin"]',
+                        status TEXT DEFAULT 'pending',
+                        metadata TEXT DEFAULT '{}',
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    );
+
+                    CREATE VIRTUAL TABLE IF NOT EXISTS news_articles_fts USING fts5(
+                        title, content,
+                        content='news_articles', content_rowid='article_id',
+                        tokenize='porter unicode61'
+                    );
+
+                    CREATE TRIGGER IF NOT EXISTS news_articles_fts_insert
+                    AFTER INSERT ON news_articles BEGIN
+                        INSERT INTO news_articles_fts(rowid, title, content)
+                        VALUES (new.article_id, new.title, new.content);
+                    END;
+
+                    CREATE TRIGGER IF NOT EXISTS news_articles_fts_delete
+                    AFTER DELETE ON news_articles BEGIN
+                        INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content)
+                        VALUES ('delete', old.article_id, old.title, old.content);
+                    END;
+
+                    CREATE TRIGGER IF NOT EXISTS news_articles_fts_update
+                    AFTER UPDATE OF title, content ON news_articles BEGIN
+                        INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content)
+                        VALUES ('delete', old.article_id, old.title, old.content);
+                        INSERT INTO news_articles_fts(rowid, title, content)
+                        VALUES (new.article_id, new.title, new.content);
+                    END;
+                """)
+
+                # Index articles stored before the search index existed
+                if not fts_exists:
+                    conn.execute("INSERT INTO news_articles_fts(news_articles_fts) VALUES ('rebuild')")
+
+                # Articles stored before canonical_url existed are keyed by their url
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(news_articles)")}
+                if "canonical_url" not in columns:
+                    conn.execute("ALTER TABLE news_articles ADD COLUMN canonical_url TEXT")
+                conn.execute("UPDATE news_articles SET canonical_url = url WHERE canonical_url IS NULL")
+                conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_canonical_url ON news_articles(canonical_url)"
+                )
+        finally:
+            conn.close()
+
+    async def close(self):
+        pass
+
+    async def recent_articles(self, days: int) -> List[Dict]:
+        """Articles stored in the last days (article_id, url, title, content, created_at)"""
+        return await asyncio.to_thread(self._recent_articles, days)
+
+    def _recent_articles(self, days: int) -> List[Dict]:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        conn = self._connect()
+        try:
+            rows = conn.execute("""
+                SELECT article_id, url, title, content, created_at
+                FROM news_articles
+                WHERE created_at > ?
+                ORDER BY created_at
+            """, (cutoff,)).fetchall()
+        finally:
+            conn.close()
+
+        articles = []
+        for row in rows:
+            article = dict(row)
+            # CURRENT_TIMESTAMP is UTC
+            article["created_at"] = datetime.fromisoformat(article["created_at"]).replace(tzinfo=timezone.utc)
+            articles.append(article)
+        return articles
+
+    async def all_articles(self) -> List[Dict]:
+        """Every stored article (article_id, title, content)"""
+        return await asyncio.to_thread(self._all_articles)
+
+    def _all_articles(self) -> List[Dict]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT article_id, title, content FROM news_articles ORDER BY article_id").fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    async def ingest(self, records: List[Dict]) -> Dict[str, int]:
+        """
+        Insert new articles and their content opportunities
+
+        Args:
+            records: One dict per article with STAGING_COLUMNS keys
+
+        Returns:
+            {canonical_url: article_id} for the articles actually inserted
+        """
+        records = _unique_by_url(records)
+        if not records:
+            return {}
+        return await asyncio.to_thread(self._ingest, records)
+
+    @staticmethod
+    def _staging_row(record: Dict) -> tuple:
+        row = []
+        for column in STAGING_COLUMNS:
+            value = record[column]
+            if isinstance(value, (list, tuple)):
+                value = json.dumps(list(value))
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            row.append(value)
+        return tuple(row)
+
+    def _ingest(self, records: List[Dict]) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(f"""
+                    CREATE TEMP TABLE IF NOT EXISTS news_articles_staging (
+                        {", ".join(STAGING_COLUMNS)}
+                    )
+                """)
+                conn.execute("DELETE FROM news_articles_staging")
+                conn.executemany(
+                    f"INSERT INTO news_articles_staging VALUES ({', '.join('?' * len(STAGING_COLUMNS))})",
+                    [self._staging_row(record) for record in records]
+                )
+
+                # WHERE true keeps the parser from reading ON CONFLICT as a join constraint
+                inserted = conn.execute("""
+                    INSERT INTO news_articles (
+                        title, url, canonical_url, source, published_date, content,
+                        categories, relevance_score, key_entities
+                    )
+                    SELECT title, url, canonical_url, source, published_date, content,
+                           categories, relevance_score, key_entities
+                    FROM news_articles_staging WHERE true
+                    ON CONFLICT DO NOTHING
+                    RETURNING article_id, canonical_url
+                """).fetchall()
+                inserted = {row["canonical_url"]: row["article_id"] for row in inserted}
+
+                conn.executemany("""
+                    INSERT INTO content_opportunities (
+                        type, article_id, suggested_angle, urgency,
+                        pillar_alignment, target_platforms, status
+                    )
+                    SELECT 'news_reaction', ?, suggested_angle, urgency, pillar_alignment, ?, 'pending'
+                    FROM news_articles_staging WHERE canonical_url = ?
+                """, [
+                    (article_id, json.dumps(DEFAULT_PLATFORMS), canonical_url)
+                    for canonical_url, article_id in inserted.items()
+                ])
+        finally:
+            conn.close()
+
+        return inserted
+
+    async def merge_duplicates(self, duplicates: List[DuplicateRecord]):
+        """Record near-duplicate URLs/sources on the articles they duplicate"""
+        if duplicates:
+            await asyncio.to_thread(self._merge_duplicates, duplicates)
+
+    def _merge_duplicates(self, duplicates: List[DuplicateRecord]):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("""
+                    UPDATE news_articles SET
+                        duplicate_urls = CASE
+                            WHEN url = ?2 OR EXISTS (SELECT 1 FROM json_each(duplicate_urls) WHERE value = ?2)
+                                THEN duplicate_urls
+                            ELSE json_insert(duplicate_urls, '$[#]', ?2)
+                        END,
+                        duplicate_sources = CASE
+                            WHEN source = ?3 OR EXISTS (SELECT 1 FROM json_each(duplicate_sources) WHERE value = ?3)
+                                THEN duplicate_sources
+                            ELSE json_insert(duplicate_sources, '$[#]', ?3)
+                        END,
+                        relevance_score = MAX(relevance_score, ?4),
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE article_id = ?1
+                """, duplicates)
+        finally:
+            conn.close()
+
+    async def search(self, terms: List[str], limit: int = 5, unprocessed_only: bool = True) -> List[Dict]:
+        """
+        Articles matching any term, best match first
+
+        Args:
+            terms: Search terms (OR semantics); empty returns the most
+                   relevant articles instead
+            limit: Maximum articles to return
+            unprocessed_only: Skip articles already used for synthesis
+
+        Returns:
+            Article dicts with SEARCH_COLUMNS keys
+        """
+        return await asyncio.to_thread(self._search, _search_terms(terms), limit, unprocessed_only)
+
+    def _search(self, terms: List[str], limit: int, unprocessed_only: bool) -> List[Dict]:
+        columns = ", ".join(f"a.{column}" for column in SEARCH_COLUMNS)
+        processed_filter = "AND a.processed = 0" if unprocessed_only else ""
+
+        conn = self._connect()
+        try:
+            if not terms:
+                rows = conn.execute(f"""
+                    SELECT {columns}
+                    FROM news_articles a
+                    WHERE 1 {processed_filter}
+                    ORDER BY a.relevance_score DESC, a.published_date DESC
+                    LIMIT ?
+                """, (limit,)).fetchall()
+            else:
+                # bm25() is lower-is-better; title counts double
+                rows = conn.execute(f"""
+                    SELECT {columns}
+                    FROM news_articles_fts
+                    JOIN news_articles a ON a.article_id = news_articles_fts.rowid
+                    WHERE news_articles_fts MATCH ? {processed_filter}
+                    ORDER BY bm25(news_articles_fts, 2.0, 1.0),
+                             a.relevance_score DESC, a.published_date DESC
+                    LIMIT ?
+                """, (" OR ".join(f'"{term}"' for term in terms), limit)).fetchall()
+        finally:
+            conn.close()
+
+        articles = []
+        for row in rows:
+            article = dict(row)
+            article["categories"] = json.loads(article["categories"] or "[]")
+            articles.append(article)
+        return articles
+
+
+def create_article_store(db_url: str, db_pool=None):
+    """
+    Article store for a database URL
+
+    Args:
+        db_url: PostgreSQL URL, or sqlite:///path/to/file.db for the SQLite stand-in
+        db_pool: Existing asyncpg pool for the PostgreSQL store to share
+    """
+    if db_url.startswith("sqlite:///"):
+        return SQLiteArticleStore(db_url[len("sqlite:///"):])
+    return PostgresArticleStore(db_url, db_pool=db_pool)
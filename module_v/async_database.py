@@ -0,0 +1,90 @@
+"""
+Async Database Facade for Milton AI Publicist
+Runs DatabaseManager queries on a bounded worker pool so async handlers
+never block the event loop on SQLite I/O
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .database import DatabaseManager, get_database
+
+
+class AsyncDatabaseManager:
+    """
+    Async facade over DatabaseManager
+
+    Every public DatabaseManager method is exposed as a coroutine with the
+    same name and signature. Calls are dispatched to a fixed-size thread
+    pool; each worker thread keeps its own WAL-mode connection (see
+    DatabaseManager._get_connection), so the pool doubles as a connection
+    pool and readers never wait on each other.
+
+    Example:
+        adb = get_async_database()
+        post = await adb.get_post(42)
+        summary = await adb.run(analytics.get_dashboard_summary)
+    """
+
+    def __init__(self, db: Optional[DatabaseManager] = None, max_workers: Optional[int] = None):
+        """
+        Initialize async database facade
+
+        Args:
+            db: DatabaseManager to wrap (default: shared singleton)
+            max_workers: Worker threads / pooled connections
+                         (default: DB_POOL_SIZE env var or 8)
+        """
+        self.db = db or get_database()
+        self.max_workers = max_workers or int(os.getenv("DB_POOL_SIZE", "8"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="db-worker"
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run any blocking callable on the database worker pool
+
+        Use this for helpers that query through DatabaseManager internally
+        (e.g. AnalyticsEngine methods) so they share the same bounded pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(func, *args, **kwargs)
+        )
+
+    def __getattr__(self, name: str):
+        """Expose DatabaseManager methods as awaitables"""
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        return wrapper
+
+    def close(self):
+        """Shut down the worker pool"""
+        self._executor.shutdown(wait=True)
+
+
+# Singleton instance
+_async_db_instance = None
+
+
+def get_async_database() -> AsyncDatabaseManager:
+    """Get singleton async database facade"""
+    global _async_db_instance
+    if _async_db_instance is None:
+        _async_db_instance = AsyncDatabaseManager()
+    return _async_db_instance
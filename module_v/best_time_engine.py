@@ -0,0 +1,201 @@
+"""
+Best Time to Post Engine - Milton AI Publicist
+Vectorized day x hour engagement heatmap built with NumPy
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .database import DatabaseManager, get_database
+
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Two-sided z value for the heatmap confidence interval
+Z_95 = 1.96
+
+
+class BestTimeEngine:
+    """
+    Computes posting-time statistics from published posts
+
+    Publish times and engagement rates are loaded as flat arrays (SQLite
+    converts timestamps to epoch seconds) and grouped with np.bincount,
+    so cost is a single query plus a few vector passes regardless of how
+    many posts have history.
+    """
+
+    def __init__(self, db: Optional[DatabaseManager] = None):
+        """
+        Initialize best time engine
+
+        Args:
+            db: DatabaseManager to query (default: shared singleton)
+        """
+        self.db = db or get_database()
+
+    def load_arrays(self, platform: str = "linkedin") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Load publish times and engagement for a platform
+
+        Returns:
+            (day_of_week, hour, engagement) arrays; day_of_week is 0=Monday
+        """
+        conn = self.db._get_connection()
+        cursor = conn.execute("""
+            SELECT
+                CAST(strftime('%s', p.published_at) AS INTEGER) as published_epoch,
+                a.engagement_rate
+            FROM posts p
+            JOIN analytics a ON p.id = a.post_id AND a.platform = ?
+            WHERE p.status = 'published'
+            AND p.published_at IS NOT NULL
+            AND a.engagement_rate > 0
+            AND strftime('%s', p.published_at) IS NOT NULL
+        """, (platform,))
+
+        rows = cursor.fetchall()
+        if not rows:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+
+        epoch = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        engagement = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+
+        # 1970-01-01 was a Thursday (weekday 3)
+        day_of_week = (epoch // 86400 + 3) % 7
+        hour = (epoch % 86400) // 3600
+
+        return day_of_week, hour, engagement
+
+    @staticmethod
+    def _group_stats(index: np.ndarray, values: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-bucket count, mean and standard error via bincount
+
+        Buckets with no data have mean NaN; buckets with one sample have
+        standard error NaN.
+        """
+        count = np.bincount(index, minlength=size).astype(np.float64)
+        total = np.bincount(index, weights=values, minlength=size)
+        total_sq = np.bincount(index, weights=values * values, minlength=size)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            variance = (total_sq - count * mean * mean) / (count - 1)
+            stderr = np.sqrt(np.clip(variance, 0, None) / count)
+
+        stderr[count < 2] = np.nan
+        return count, mean, stderr
+
+    def get_heatmap(self, platform: str = "linkedin") -> Dict:
+        """
+        Build the 7x24 day-of-week x hour engagement heatmap
+
+        Returns:
+            Dict with 7x24 grids of mean engagement, sample count and 95%
+            confidence bounds (None where there is not enough data)
+        """
+        day_of_week, hour, engagement = self.load_arrays(platform)
+        count, mean, stderr = self._group_stats(day_of_week * 24 + hour, engagement, 7 * 24)
+
+        def grid(values: np.ndarray) -> List[List[Optional[float]]]:
+            shaped = values.reshape(7, 24)
+            return [
+                [None if np.isnan(v) else round(float(v), 2) for v in row]
+                for row in shaped
+            ]
+
+        return {
+            "platform": platform,
+            "data_points": int(engagement.size),
+            "days": DAY_NAMES,
+            "hours": list(range(24)),
+            "mean": grid(mean),
+            "count": count.reshape(7, 24).astype(int).tolist(),
+            "ci_low": grid(mean - Z_95 * stderr),
+            "ci_high": grid(mean + Z_95 * stderr),
+            "confidence": 0.95
+        }
+
+    def analyze_best_times(self, platform: str = "linkedin") -> Dict:
+        """
+        Summarize best day, hour and day/hour combinations
+
+        Same response shape as AnalyticsEngine.analyze_best_times.
+        """
+        day_of_week, hour, engagement = self.load_arrays(platform)
+
+        if engagement.size == 0:
+            return {
+                "message": "Not enough data yet",
+                "recommendation": "Post consistently for 2-4 weeks to get insights"
+            }
+
+        day_count, day_mean, _ = self._group_stats(day_of_week, engagement, 7)
+        hour_count, hour_mean, _ = self._group_stats(hour, engagement, 24)
+        combo_count, combo_mean, _ = self._group_stats(day_of_week * 24 + hour, engagement, 7 * 24)
+
+        day_averages = {
+            DAY_NAMES[d]: round(float(day_mean[d]), 2)
+            for d in np.flatnonzero(day_count)
+        }
+        hour_averages = {
+            int(h): round(float(hour_mean[h]), 2)
+            for h in np.flatnonzero(hour_count)
+        }
+
+        best_day = max(day_averages.items(), key=lambda x: x[1])
+        best_hour = max(hour_averages.items(), key=lambda x: x[1])
+
+        # Top 3 day/hour combinations (stable sort keeps earlier slots first on ties)
+        populated = np.flatnonzero(combo_count)
+        top = populated[np.argsort(-combo_mean[populated], kind="stable")[:3]]
+
+        return {
+            "platform": platform,
+            "data_points": int(engagement.size),
+            "best_day": {
+                "day": best_day[0],
+                "avg_engagement": best_day[1]
+            },
+            "best_hour": {
+                "hour": best_hour[0],
+                "avg_engagement": best_hour[1]
+            },
+            "top_combinations": [
+                {
+                    "time": f"{DAY_NAMES[idx // 24]} at {idx % 24:02d}:00",
+                    "avg_engagement": round(float(combo_mean[idx]), 2)
+                }
+                for idx in top
+            ],
+            "all_days": day_averages,
+            "all_hours": {f"{h:02d}:00": v for h, v in hour_averages.items()}
+        }
+
+    @staticmethod
+    def best_hours(heatmap: Dict, day_of_week: int, top_n: int = 5, min_samples: int = 3) -> List[int]:
+        """
+        Best posting hours for one weekday from a heatmap
+
+        Args:
+            heatmap: Result of get_heatmap()
+            day_of_week: 0=Monday .. 6=Sunday
+            top_n: Maximum hours to return
+            min_samples: Ignore cells with fewer published posts
+
+        Returns:
+            Up to top_n hours sorted ascending (empty if no cell qualifies)
+        """
+        means = heatmap["mean"][day_of_week]
+        counts = heatmap["count"][day_of_week]
+
+        candidates = [
+            (means[h], h) for h in range(24)
+            if means[h] is not None and counts[h] >= min_samples
+        ]
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+
+        return sorted(h for _, h in candidates[:top_n])
@@ -3,13 +3,21 @@ Database Manager for Milton AI Publicist
 SQLite-based persistent storage for posts, schedules, and analytics
 """
 
+import os
 import sqlite3
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
 from pathlib import Path
 import threading
 
+from .vector_index import VectorIndex, default_index_path, get_vector_index
+
+
+def default_db_path() -> str:
+    """Database file used when none is given: MILTON_DB_PATH env var or milton_publicist.db"""
+    return os.getenv("MILTON_DB_PATH", "milton_publicist.db")
+
 
 class DatabaseManager:
     """
@@ -17,17 +25,71 @@ class DatabaseManager:
     Thread-safe operations for concurrent access
     """
 
-    def __init__(self, db_path: str = "milton_publicist.db"):
+    def __init__(self, db_path: Optional[str] = None):
         """
         Initialize database manager
 
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file (default: MILTON_DB_PATH
+                     env var or milton_publicist.db)
         """
-        self.db_path = db_path
+        self.db_path = db_path or default_db_path()
         self.local = threading.local()
+        self._vector_index = None
+        self._watch_connection = None
+        self._watch_lock = threading.Lock()
         self._init_database()
 
+    @property
+    def vector_index(self) -> VectorIndex:
+        """
+        Similarity index of this database's posts (stored next to the database file)
+
+        An index opened without any posts is backfilled from the posts table,
+        so posts created before the index existed are searchable.
+        """
+        if self._vector_index is None:
+            self._vector_index = get_vector_index(default_index_path(self.db_path))
+            if not self._vector_index.ids("post"):
+                try:
+                    self.rebuild_vector_index()
+                except Exception as e:
+                    print(f"[WARN] Could not backfill similarity index: {e}")
+        return self._vector_index
+
+    @staticmethod
+    def _post_text(post) -> str:
+        """Text a post is indexed under"""
+        return f"{post['scenario']} {post['context'] or ''} {post['content']}"
+
+    def _index_post(self, post_id: int, content: Optional[str] = None):
+        """Add a post to the similarity index, or drop it if content is None"""
+        try:
+            if content is None:
+                self.vector_index.remove("post", post_id)
+            else:
+                self.vector_index.add("post", post_id, content)
+        except Exception as e:
+            print(f"[WARN] Could not update similarity index for post {post_id}: {e}")
+
+    def rebuild_vector_index(self) -> int:
+        """
+        Re-index every post and drop index entries of deleted posts
+
+        Returns:
+            Number of posts indexed
+        """
+        conn = self._get_connection()
+        rows = conn.execute("SELECT id, scenario, context, content FROM posts").fetchall()
+
+        index = self.vector_index
+        existing = {row["id"] for row in rows}
+        for post_id in index.ids("post"):
+            if post_id not in existing:
+                index.remove("post", post_id)
+
+        return index.add_many(("post", row["id"], self._post_text(row)) for row in rows)
+
     def _get_connection(self):
         """Get thread-local database connection"""
         if not hasattr(self.local, 'connection'):
@@ -36,6 +98,11 @@ class DatabaseManager:
                 check_same_thread=False
             )
             self.local.connection.row_factory = sqlite3.Row
+            # WAL lets readers on other threads proceed while one thread writes;
+            # busy_timeout makes concurrent writers wait instead of failing
+            self.local.connection.execute("PRAGMA journal_mode=WAL")
+            self.local.connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection.execute("PRAGMA busy_timeout=5000")
         return self.local.connection
 
     def _init_database(self):
@@ -72,9 +139,21 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 published_at TIMESTAMP,
                 error_message TEXT,
+                worker_id TEXT,
+                lease_expires_at TIMESTAMP,
+                attempts INTEGER DEFAULT 0,
+                next_attempt_at TIMESTAMP,
+                metadata TEXT,
                 FOREIGN KEY (post_id) REFERENCES posts(id)
             )
         """)
+        self._add_missing_columns(cursor, "scheduled_posts", {
+            "worker_id": "TEXT",
+            "lease_expires_at": "TIMESTAMP",
+            "attempts": "INTEGER DEFAULT 0",
+            "next_attempt_at": "TIMESTAMP",
+            "metadata": "TEXT"
+        })
 
         # Publishing results table
         cursor.execute("""
@@ -111,6 +190,87 @@ class DatabaseManager:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_created ON posts(created_at)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_scheduled_time ON scheduled_posts(scheduled_time)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_scheduled_status ON scheduled_posts(status)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scheduled_status_time ON scheduled_posts(status, scheduled_time)"
+        )
+        # A pending post is due at its retry time if it has one, else its scheduled time
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_scheduled_due
+            ON scheduled_posts(status, COALESCE(next_attempt_at, scheduled_time))
+        """)
+
+        # One analytics row per (post, platform) so engagement can be UPSERTed.
+        # Older databases may hold duplicates; keep the most recent row.
+        cursor.execute("""
+            DELETE FROM analytics
+            WHERE id NOT IN (
+                SELECT MAX(id) FROM analytics GROUP BY post_id, platform
+            )
+        """)
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_analytics_post_platform
+            ON analytics(post_id, platform)
+        """)
+
+        # Daily analytics rollups, maintained incrementally by AnalyticsEngine.
+        # Posts without a publish time use day '' and day_of_week/hour -1.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_daily_rollup (
+                day TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                voice_type TEXT NOT NULL,
+                scenario TEXT NOT NULL,
+                has_media INTEGER NOT NULL,
+                day_of_week INTEGER NOT NULL,
+                hour INTEGER NOT NULL,
+                post_count INTEGER DEFAULT 0,
+                row_count INTEGER DEFAULT 0,
+                total_views INTEGER DEFAULT 0,
+                total_likes INTEGER DEFAULT 0,
+                total_comments INTEGER DEFAULT 0,
+                total_shares INTEGER DEFAULT 0,
+                total_engagement_rate REAL DEFAULT 0.0,
+                max_views INTEGER DEFAULT 0,
+                max_likes INTEGER DEFAULT 0,
+                max_comments INTEGER DEFAULT 0,
+                max_shares INTEGER DEFAULT 0,
+                PRIMARY KEY (day, platform, voice_type, scenario, has_media, day_of_week, hour)
+            )
+        """)
+
+        # Per-post engagement rollup (average engagement rate across platforms)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_post_rollup (
+                post_id INTEGER PRIMARY KEY,
+                row_count INTEGER DEFAULT 0,
+                total_engagement_rate REAL DEFAULT 0.0,
+                performance REAL DEFAULT 0.0,
+                FOREIGN KEY (post_id) REFERENCES posts(id)
+            )
+        """)
+
+        # Engagement history: metric deltas per poll (bucket_start is epoch
+        # seconds; resolution 0 = raw poll, 3600 = hourly, 86400 = daily)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS engagement_snapshots (
+                post_id INTEGER NOT NULL,
+                platform TEXT NOT NULL,
+                bucket_start INTEGER NOT NULL,
+                resolution INTEGER NOT NULL DEFAULT 0,
+                d_views INTEGER NOT NULL DEFAULT 0,
+                d_likes INTEGER NOT NULL DEFAULT 0,
+                d_comments INTEGER NOT NULL DEFAULT 0,
+                d_shares INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (post_id, platform, bucket_start)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_snapshots_resolution
+            ON engagement_snapshots(resolution, bucket_start)
+        """)
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_published ON posts(published_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_rollup_performance ON analytics_post_rollup(performance)")
 
         conn.commit()
         print(f"[INFO] Database initialized: {self.db_path}")
@@ -119,6 +279,14 @@ class DatabaseManager:
     # POSTS CRUD OPERATIONS
     # ========================================================================
 
+    @staticmethod
+    def _add_missing_columns(cursor, table: str, columns: Dict[str, str]):
+        """Add columns introduced after a table was first created"""
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for name, definition in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
     def create_post(
         self,
         content: str,
@@ -142,6 +310,8 @@ class DatabaseManager:
         conn.commit()
         post_id = cursor.lastrowid
 
+        self._index_post(post_id, self._post_text({"scenario": scenario, "context": context, "content": content}))
+
         print(f"[INFO] Created post ID: {post_id}")
         return post_id
 
@@ -170,33 +340,58 @@ class DatabaseManager:
 
         return [dict(row) for row in cursor.fetchall()]
 
+    # Post columns the analytics rollups are keyed by
+    ROLLUP_COLUMNS = {"status", "published_at", "voice_type", "scenario", "graphic_url", "video_url"}
+
+    def _post_rollup_dimensions(self, conn, post_ids: List[int]) -> Dict:
+        """Rollup dimensions of posts before a change (see AnalyticsEngine.refresh_post_rollups)"""
+        from .analytics_engine import AnalyticsEngine  # analytics_engine imports this module
+        return AnalyticsEngine.load_post_dimensions(conn, post_ids)
+
+    def _refresh_post_rollups(self, conn, old_dimensions: Dict):
+        """Update the analytics rollups for changed or deleted posts, in the caller's transaction"""
+        from .analytics_engine import AnalyticsEngine
+        AnalyticsEngine.refresh_post_rollups(conn, old_dimensions)
+
     def update_post(self, post_id: int, **kwargs) -> bool:
-        """Update a post"""
+        """Update a post (and the analytics rollups, if a column they group by changed)"""
         conn = self._get_connection()
-        cursor = conn.cursor()
+        affects_rollups = bool(kwargs.keys() & self.ROLLUP_COLUMNS)
 
         # Build SET clause dynamically
         set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
         values = list(kwargs.values()) + [post_id]
 
-        cursor.execute(f"""
-            UPDATE posts
-            SET {set_clause}
-            WHERE id = ?
-        """, values)
+        with conn:
+            old_dimensions = self._post_rollup_dimensions(conn, [post_id]) if affects_rollups else {}
+            cursor = conn.execute(f"""
+                UPDATE posts
+                SET {set_clause}
+                WHERE id = ?
+            """, values)
+            updated = cursor.rowcount > 0
+            if updated and affects_rollups:
+                self._refresh_post_rollups(conn, old_dimensions)
 
-        conn.commit()
-        return cursor.rowcount > 0
+        if updated and kwargs.keys() & {"content", "scenario", "context"}:
+            self._index_post(post_id, self._post_text(self.get_post(post_id)))
+
+        return updated
 
     def delete_post(self, post_id: int) -> bool:
-        """Delete a post"""
+        """Delete a post (and its contribution to the analytics rollups)"""
         conn = self._get_connection()
-        cursor = conn.cursor()
 
-        cursor.execute("DELETE FROM posts WHERE id = ?", (post_id,))
-        conn.commit()
+        with conn:
+            old_dimensions = self._post_rollup_dimensions(conn, [post_id])
+            cursor = conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                self._refresh_post_rollups(conn, old_dimensions)
 
-        return cursor.rowcount > 0
+        if deleted:
+            self._index_post(post_id)
+        return deleted
 
     def mark_post_published(self, post_id: int, post_url: Optional[str] = None):
         """Mark a post as published"""
@@ -215,9 +410,10 @@ class DatabaseManager:
         self,
         post_id: int,
         platform: str,
-        scheduled_time: Union[datetime, str]
+        scheduled_time: Union[datetime, str],
+        metadata: Optional[Dict] = None
     ) -> int:
-        """Schedule a post for future publishing"""
+        """Schedule a post for future publishing (metadata is stored as JSON)"""
         conn = self._get_connection()
         cursor = conn.cursor()
 
@@ -228,13 +424,30 @@ class DatabaseManager:
             time_str = scheduled_time
 
         cursor.execute("""
-            INSERT INTO scheduled_posts (post_id, platforms, scheduled_time)
-            VALUES (?, ?, ?)
-        """, (post_id, platform, time_str))
+            INSERT INTO scheduled_posts (post_id, platform, scheduled_time, metadata)
+            VALUES (?, ?, ?, ?)
+        """, (post_id, platform, time_str, json.dumps(metadata) if metadata else None))
 
         conn.commit()
         return cursor.lastrowid
 
+    def reschedule_scheduled_post(self, schedule_id: int, scheduled_time: Union[datetime, str]) -> bool:
+        """Move a pending scheduled post to a new time (clearing any pending retry)"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        if isinstance(scheduled_time, datetime):
+            scheduled_time = scheduled_time.isoformat()
+
+        cursor.execute("""
+            UPDATE scheduled_posts
+            SET scheduled_time = ?, next_attempt_at = NULL
+            WHERE id = ? AND status = 'pending'
+        """, (scheduled_time, schedule_id))
+
+        conn.commit()
+        return cursor.rowcount > 0
+
     def get_due_scheduled_posts(self) -> List[Dict]:
         """Get posts that are due to be published"""
         conn = self._get_connection()
@@ -247,37 +460,281 @@ class DatabaseManager:
             FROM scheduled_posts sp
             JOIN posts p ON sp.post_id = p.id
             WHERE sp.status = 'pending'
-            AND sp.scheduled_time <= ?
-            ORDER BY sp.scheduled_time
+            AND COALESCE(sp.next_attempt_at, sp.scheduled_time) <= ?
+            ORDER BY COALESCE(sp.next_attempt_at, sp.scheduled_time)
         """, (now,))
 
         return [dict(row) for row in cursor.fetchall()]
 
-    def mark_scheduled_post_published(self, schedule_id: int):
-        """Mark a scheduled post as published"""
+    def claim_due_scheduled_posts(
+        self,
+        worker_id: str,
+        lease_seconds: float = 300,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Atomically take ownership of due scheduled posts
+
+        Moves due pending rows, and in_flight rows whose lease has expired
+        (their worker died), to in_flight under worker_id in one UPDATE ...
+        RETURNING, so concurrent daemons never claim the same row. Each
+        claim counts as an attempt.
+
+        Args:
+            worker_id: Identifier of the claiming daemon
+            lease_seconds: How long the claim holds before others may reclaim it
+            limit: Maximum rows to claim (default: all due)
+
+        Returns:
+            Claimed scheduled posts with post content, oldest first
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
 
+        now = datetime.utcnow()
+        lease_expires_at = (now + timedelta(seconds=lease_seconds)).isoformat()
+
         cursor.execute("""
             UPDATE scheduled_posts
-            SET status = 'published', published_at = ?
-            WHERE id = ?
-        """, (datetime.utcnow().isoformat(), schedule_id))
+            SET status = 'in_flight', worker_id = :worker_id, lease_expires_at = :lease_expires_at,
+                attempts = COALESCE(attempts, 0) + 1
+            WHERE id IN (
+                SELECT id FROM scheduled_posts
+                WHERE (status = 'pending' AND COALESCE(next_attempt_at, scheduled_time) <= :now)
+                   OR (status = 'in_flight' AND lease_expires_at <= :now)
+                ORDER BY COALESCE(next_attempt_at, scheduled_time)
+                LIMIT :limit
+            )
+            RETURNING id
+        """, {
+            "worker_id": worker_id,
+            "lease_expires_at": lease_expires_at,
+            "now": now.isoformat(),
+            "limit": -1 if limit is None else limit
+        })
+        claimed = [row["id"] for row in cursor.fetchall()]
+        conn.commit()
+
+        if not claimed:
+            return []
+
+        placeholders = ",".join("?" * len(claimed))
+        cursor.execute(f"""
+            SELECT sp.*, p.content, p.graphic_url, p.video_url
+            FROM scheduled_posts sp
+            JOIN posts p ON sp.post_id = p.id
+            WHERE sp.id IN ({placeholders})
+            ORDER BY sp.scheduled_time
+        """, claimed)
+
+        return [dict(row) for row in cursor.fetchall()]
+
+    def renew_scheduled_post_lease(self, schedule_id: int, worker_id: str, lease_seconds: float = 300) -> bool:
+        """Extend a claim; False if worker_id no longer owns the row"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        lease_expires_at = (datetime.utcnow() + timedelta(seconds=lease_seconds)).isoformat()
+        cursor.execute("""
+            UPDATE scheduled_posts
+            SET lease_expires_at = ?
+            WHERE id = ? AND status = 'in_flight' AND worker_id = ?
+        """, (lease_expires_at, schedule_id, worker_id))
 
         conn.commit()
+        return cursor.rowcount > 0
 
-    def mark_scheduled_post_failed(self, schedule_id: int, error_message: str):
-        """Mark a scheduled post as failed"""
+    def get_pending_schedule_times(self) -> List[Dict]:
+        """
+        Next time each unfinished scheduled post needs attention (no joins, for wakeup planning)
+
+        Returns:
+            [{"id", "due_time"}]: retry or scheduled time for pending rows,
+            lease_expires_at for in_flight rows
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute("""
+            SELECT id, COALESCE(next_attempt_at, scheduled_time) AS due_time
+            FROM scheduled_posts WHERE status = 'pending'
+            UNION ALL
+            SELECT id, lease_expires_at AS due_time FROM scheduled_posts WHERE status = 'in_flight'
+            ORDER BY due_time
+        """)
+
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_data_version(self) -> int:
+        """
+        Counter that changes whenever any connection commits a write
+
+        Reads SQLite's PRAGMA data_version on a dedicated read-only
+        connection, so writes from this process (any thread) and from
+        other processes are all seen. Costs no table access.
+        """
+        with self._watch_lock:
+            if self._watch_connection is None:
+                self._watch_connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._watch_connection.execute("PRAGMA data_version").fetchone()[0]
+
+    @staticmethod
+    def _lease_condition(worker_id: Optional[str]) -> tuple:
+        """WHERE clause (and params) restricting an update to the lease holder"""
+        if worker_id is None:
+            return "", ()
+        return " AND status = 'in_flight' AND worker_id = ?", (worker_id,)
+
+    def mark_scheduled_post_published(self, schedule_id: int, worker_id: Optional[str] = None) -> bool:
+        """
+        Mark a scheduled post as published
+
+        Args:
+            schedule_id: Scheduled post ID
+            worker_id: If given, only succeed while this worker holds the lease
+
+        Returns:
+            True if the row was updated
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        condition, params = self._lease_condition(worker_id)
+        cursor.execute(f"""
+            UPDATE scheduled_posts
+            SET status = 'published', published_at = ?, lease_expires_at = NULL
+            WHERE id = ?{condition}
+        """, (datetime.utcnow().isoformat(), schedule_id, *params))
+
+        conn.commit()
+        return cursor.rowcount > 0
+
+    def mark_scheduled_post_failed(
+        self,
+        schedule_id: int,
+        error_message: str,
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Mark a scheduled post as failed
+
+        Args:
+            schedule_id: Scheduled post ID
+            error_message: Failure reason
+            worker_id: If given, only succeed while this worker holds the lease
+
+        Returns:
+            True if the row was updated
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        condition, params = self._lease_condition(worker_id)
+        cursor.execute(f"""
             UPDATE scheduled_posts
-            SET status = 'failed', error_message = ?
-            WHERE id = ?
-        """, (error_message, schedule_id))
+            SET status = 'failed', error_message = ?, lease_expires_at = NULL
+            WHERE id = ?{condition}
+        """, (error_message, schedule_id, *params))
 
         conn.commit()
+        return cursor.rowcount > 0
+
+    def retry_scheduled_post(
+        self,
+        schedule_id: int,
+        error_message: str,
+        next_attempt_at: Union[datetime, str],
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Return a failed scheduled post to pending, due again at next_attempt_at
+
+        Args:
+            schedule_id: Scheduled post ID
+            error_message: Why the attempt failed
+            next_attempt_at: When to try again (UTC)
+            worker_id: If given, only succeed while this worker holds the lease
+
+        Returns:
+            True if the row was updated
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        if isinstance(next_attempt_at, datetime):
+            next_attempt_at = next_attempt_at.isoformat()
+
+        condition, params = self._lease_condition(worker_id)
+        cursor.execute(f"""
+            UPDATE scheduled_posts
+            SET status = 'pending', error_message = ?, next_attempt_at = ?,
+                worker_id = NULL, lease_expires_at = NULL
+            WHERE id = ?{condition}
+        """, (error_message, next_attempt_at, schedule_id, *params))
+
+        conn.commit()
+        return cursor.rowcount > 0
+
+    def dead_letter_scheduled_post(
+        self,
+        schedule_id: int,
+        error_message: str,
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Park a scheduled post that failed permanently or ran out of attempts
+
+        Args:
+            schedule_id: Scheduled post ID
+            error_message: The last failure
+            worker_id: If given, only succeed while this worker holds the lease
+
+        Returns:
+            True if the row was updated
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        condition, params = self._lease_condition(worker_id)
+        cursor.execute(f"""
+            UPDATE scheduled_posts
+            SET status = 'dead_letter', error_message = ?, lease_expires_at = NULL
+            WHERE id = ?{condition}
+        """, (error_message, schedule_id, *params))
+
+        conn.commit()
+        return cursor.rowcount > 0
+
+    def requeue_dead_letter_posts(self, schedule_ids: Optional[List[int]] = None) -> int:
+        """
+        Give dead-lettered posts a fresh set of attempts, due immediately
+
+        Args:
+            schedule_ids: Posts to requeue (default: every dead-lettered post)
+
+        Returns:
+            Number of posts requeued
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        query = """
+            UPDATE scheduled_posts
+            SET status = 'pending', attempts = 0, next_attempt_at = ?,
+                worker_id = NULL, lease_expires_at = NULL
+            WHERE status = 'dead_letter'
+        """
+        params: list = [datetime.utcnow().isoformat()]
+        if schedule_ids is not None:
+            if not schedule_ids:
+                return 0
+            query += f" AND id IN ({','.join('?' * len(schedule_ids))})"
+            params.extend(schedule_ids)
+
+        cursor.execute(query, params)
+
+        conn.commit()
+        return cursor.rowcount
 
     def cancel_scheduled_post(self, schedule_id: int) -> bool:
         """Cancel a scheduled post"""
@@ -502,6 +959,11 @@ class DatabaseManager:
             self.local.connection.close()
             delattr(self.local, 'connection')
 
+        with self._watch_lock:
+            if self._watch_connection is not None:
+                self._watch_connection.close()
+                self._watch_connection = None
+
 
 # Singleton instance
 _db_instance = None
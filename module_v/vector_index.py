@@ -0,0 +1,502 @@
+"""
+Vector Index - Local similarity search over articles and posts
+Hashed n-gram vectors in a memory-mapped NumPy matrix with batched cosine top-k
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, so keep to one writing process
+    fcntl = None
+
+
+STOP_WORDS = {
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of",
+    "with", "is", "are", "was", "were", "be", "been", "it", "its", "this", "that",
+    "as", "by", "from", "our", "we", "you", "your", "i", "my", "me", "they", "their"
+}
+
+
+class HashedNgramVectorizer:
+    """
+    Text to fixed-size vectors without a vocabulary
+
+    Word unigrams and bigrams are hashed into dim buckets with a random
+    sign (so collisions cancel rather than pile up), weighted by
+    sublinear term frequency and L2-normalized. Vectors from any process
+    are comparable because the hash (CRC32) is stable.
+    """
+
+    def __init__(self, dim: int = 128):
+        self.dim = dim
+
+    def features(self, text: str) -> Counter:
+        words = [
+            word for word in re.findall(r"[a-z0-9]+", (text or "").lower())
+            if len(word) > 1 and word not in STOP_WORDS
+        ]
+        features = Counter(words)
+        features.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+        return features
+
+    def transform(self, text: str) -> np.ndarray:
+        """Unit vector for text (all zeros if it has no usable words)"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        for feature, count in self.features(text).items():
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            vector[hashed % self.dim] += sign * (1.0 + math.log(count))
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class VectorIndex:
+    """
+    Persistent cosine-similarity index keyed by (kind, id)
+
+    Vectors live in a memory-mapped float32 matrix (vectors.f32) that
+    doubles in size as it fills; keys.jsonl records which (kind, id) each
+    row holds, plus tombstones for removed items. Writes append, so adding
+    an item is O(1); re-adding an item replaces its previous row. Once
+    dead rows outnumber live ones the index is compacted: live rows are
+    copied into a new generation of both files, and meta.json is switched
+    to it atomically, so a crash mid-compaction leaves the old one intact. Queries
+    scan the matrix in chunks with one matrix product per chunk for a
+    whole batch of queries, keeping only each chunk's top k.
+
+    Several processes may share a directory (the dashboard indexes posts,
+    MediaMonitor articles). Updates hold an exclusive lock on index.lock
+    and queries a shared one, and each first replays whatever other
+    processes appended to keys.jsonl, or reopens the index if one of
+    them compacted it, so row positions always agree with the files.
+
+    Example:
+        index = get_vector_index()
+        index.add("post", 42, post_content)
+        index.search("NIL and donor engagement", k=5, kind="article")
+        # [{"kind": "article", "id": 17, "score": 0.61}, ...]
+    """
+
+    CHUNK_ROWS = 65536
+    COMPACT_MIN_DEAD_ROWS = 1024  # Dead rows tolerated before compacting
+
+    def __init__(self, path: str, dim: Optional[int] = None, initial_capacity: int = 1024):
+        """
+        Open or create an index
+
+        Args:
+            path: Index directory
+            dim: Vector size for a new index (default: VECTOR_INDEX_DIM env
+                 var or 128; an existing index keeps its own). Queries are
+                 memory-bandwidth bound, so scan time grows linearly with dim.
+            initial_capacity: Rows allocated for a new index
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._meta_path = self.path / "meta.json"
+        self._initial_capacity = initial_capacity
+        self._lock = threading.Lock()
+        self._lock_fd = os.open(self.path / "index.lock", os.O_RDWR | os.O_CREAT, 0o644)
+
+        with self._file_lock():
+            if self._meta_path.exists():
+                dim = json.loads(self._meta_path.read_text())["dim"]
+            else:
+                dim = dim or int(os.getenv("VECTOR_INDEX_DIM", "128"))
+                self._meta_path.write_text(json.dumps({"dim": dim}))
+
+            self.dim = dim
+            self.vectorizer = HashedNgramVectorizer(dim)
+            self._kind_codes: Dict[str, int] = {}
+            self._generation = None
+            self._refresh()
+
+    # ========================================================================
+    # STORAGE
+    # ========================================================================
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        """Hold index.lock against other processes (no-op without fcntl)"""
+        if fcntl is None:
+            yield
+            return
+
+        fcntl.flock(self._lock_fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _storage_paths(self, generation: int) -> Tuple[Path, Path]:
+        """Vector and key files of one generation"""
+        if generation == 0:
+            return self.path / "vectors.f32", self.path / "keys.jsonl"
+        return self.path / f"vectors.{generation}.f32", self.path / f"keys.{generation}.jsonl"
+
+    def _refresh(self):
+        """
+        Catch up with other processes' writes (call with the file lock held)
+
+        A new generation in meta.json means the index was compacted, so
+        it is reopened from scratch; otherwise only the keys appended
+        since the last refresh are replayed.
+        """
+        generation = json.loads(self._meta_path.read_text()).get("generation", 0)
+        if generation != self._generation:
+            self._generation = generation
+            self._vectors_path, self._keys_path = self._storage_paths(generation)
+            self._keys_offset = 0
+            self._rows: Dict[Tuple[str, Hashable], int] = {}
+            self._row_keys: List[Optional[Tuple[str, Hashable]]] = []
+            self._row_kinds = np.full(self._initial_capacity, -1, dtype=np.int16)  # -1 = empty or removed
+            self._vectors = None
+            self._capacity = 0
+
+        self._load_keys()
+
+        if not self._vectors_path.exists():
+            self._vectors_path.touch()
+        file_rows = self._vectors_path.stat().st_size // (self.dim * 4)
+        if self._vectors is None or file_rows > self._capacity:
+            self._resize(max(file_rows, len(self._row_keys), self._initial_capacity))
+
+    def _load_keys(self):
+        """Replay keys.jsonl from where the last replay stopped (a torn last line is left unread)"""
+        if not self._keys_path.exists():
+            return
+
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        self._keys_offset += complete
+
+        first_new = len(self._row_keys)
+        for line in data[:complete].splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            key = (entry["kind"], entry["id"])
+            if entry.get("deleted"):
+                row = self._rows.pop(key, None)
+                if row is not None:
+                    self._row_keys[row] = None
+                    if row < first_new:
+                        self._row_kinds[row] = -1
+                continue
+
+            previous = self._rows.get(key)
+            if previous is not None:
+                self._row_keys[previous] = None
+                if previous < first_new:
+                    self._row_kinds[previous] = -1
+            self._rows[key] = len(self._row_keys)
+            self._row_keys.append(key)
+
+        self._ensure_kinds(len(self._row_keys))
+        for row in range(first_new, len(self._row_keys)):
+            key = self._row_keys[row]
+            self._row_kinds[row] = self._kind_code(key[0]) if key is not None else -1
+
+    def _kind_code(self, kind: str) -> int:
+        if kind not in self._kind_codes:
+            self._kind_codes[kind] = len(self._kind_codes)
+        return self._kind_codes[kind]
+
+    def _ensure_kinds(self, rows: int):
+        if rows > len(self._row_kinds):
+            grown = np.full(max(rows, len(self._row_kinds) * 2), -1, dtype=np.int16)
+            grown[:len(self._row_kinds)] = self._row_kinds
+            self._row_kinds = grown
+
+    def _resize(self, capacity: int):
+        """Grow the backing file if needed (never shrinking another process's rows) and remap it"""
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+
+        row_bytes = self.dim * 4
+        with open(self._vectors_path, "r+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            capacity = max(capacity, size // row_bytes)
+            if capacity * row_bytes > size:
+                f.truncate(capacity * row_bytes)
+
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    def _append_keys(self, entries: List[Dict]):
+        """Append key entries (call with the exclusive file lock held, after _refresh)"""
+        data = "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+        with open(self._keys_path, "ab") as f:
+            f.truncate(self._keys_offset)  # Drop a torn line left by a crashed writer
+            f.write(data)
+        self._keys_offset += len(data)
+
+    # ========================================================================
+    # UPDATES
+    # ========================================================================
+
+    def add(self, kind: str, item_id: Hashable, text: str) -> bool:
+        """Index (or re-index) one item; False if the text has no usable words"""
+        return self.add_many([(kind, item_id, text)]) == 1
+
+    def add_many(self, items: Iterable[Tuple[str, Hashable, str]]) -> int:
+        """
+        Index a batch of (kind, id, text) items with one flush
+
+        Returns:
+            Number of items indexed
+        """
+        vectors = []
+        for kind, item_id, text in items:
+            vector = self.vectorizer.transform(text)
+            if vector.any():
+                vectors.append(((kind, item_id), vector))
+
+        if not vectors:
+            return 0
+
+        with self._lock, self._file_lock():
+            self._refresh()
+            start = len(self._row_keys)
+            if start + len(vectors) > self._capacity:
+                self._resize(max(start + len(vectors), self._capacity * 2))
+            self._ensure_kinds(start + len(vectors))
+
+            for offset, (key, vector) in enumerate(vectors):
+                row = start + offset
+                previous = self._rows.get(key)
+                if previous is not None:
+                    self._vectors[previous] = 0
+                    self._row_kinds[previous] = -1
+                    self._row_keys[previous] = None
+
+                self._vectors[row] = vector
+                self._row_kinds[row] = self._kind_code(key[0])
+                self._rows[key] = row
+                self._row_keys.append(key)
+
+            # Vectors reach the file before the keys that make them visible
+            self._vectors.flush()
+            self._append_keys([{"kind": kind, "id": item_id} for (kind, item_id), _ in vectors])
+            self._maybe_compact()
+
+        return len(vectors)
+
+    def remove(self, kind: str, item_id: Hashable) -> bool:
+        """Drop one item; False if it was not indexed"""
+        key = (kind, item_id)
+        with self._lock, self._file_lock():
+            self._refresh()
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+
+            self._vectors[row] = 0
+            self._row_kinds[row] = -1
+            self._row_keys[row] = None
+            self._append_keys([{"kind": kind, "id": item_id, "deleted": True}])
+            self._maybe_compact()
+        return True
+
+    def _maybe_compact(self):
+        dead = len(self._row_keys) - len(self._rows)
+        if dead > max(len(self._rows), self.COMPACT_MIN_DEAD_ROWS):
+            self._compact()
+
+    def compact(self) -> int:
+        """
+        Rewrite the index without the rows of removed or replaced items
+
+        Returns:
+            Number of rows reclaimed
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            return self._compact()
+
+    def _compact(self) -> int:
+        live = [row for row, key in enumerate(self._row_keys) if key is not None]
+        reclaimed = len(self._row_keys) - len(live)
+        if reclaimed == 0:
+            return 0
+
+        generation = self._generation + 1
+        vectors_path, keys_path = self._storage_paths(generation)
+        capacity = max(len(live), self._initial_capacity)
+        keys = [self._row_keys[row] for row in live]
+
+        compacted = np.memmap(vectors_path, dtype=np.float32, mode="w+", shape=(capacity, self.dim))
+        if live:
+            compacted[:len(live)] = self._vectors[live]
+        compacted.flush()
+        del compacted
+
+        with open(keys_path, "wb") as f:
+            for kind, item_id in keys:
+                f.write((json.dumps({"kind": kind, "id": item_id}) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            keys_offset = f.tell()
+
+        # Switching meta.json commits the new generation
+        meta_tmp = self._meta_path.with_suffix(".tmp")
+        meta_tmp.write_text(json.dumps({"dim": self.dim, "generation": generation}))
+        os.replace(meta_tmp, self._meta_path)
+
+        # Other processes only touch the old files under the lock, and switch
+        # generations before doing so; their existing maps stay valid on POSIX
+        old_paths = (self._vectors_path, self._keys_path)
+        self._vectors = None
+        self._generation = generation
+        self._vectors_path, self._keys_path = vectors_path, keys_path
+        self._keys_offset = keys_offset
+        for old_path in old_paths:
+            with suppress(OSError):  # Windows refuses to delete a mapped file
+                old_path.unlink(missing_ok=True)
+
+        self._rows = {key: row for row, key in enumerate(keys)}
+        self._row_keys = keys
+        self._row_kinds = np.full(capacity, -1, dtype=np.int16)
+        for row, (kind, _) in enumerate(keys):
+            self._row_kinds[row] = self._kind_code(kind)
+        self._capacity = 0
+        self._resize(capacity)
+        return reclaimed
+
+    # ========================================================================
+    # QUERIES
+    # ========================================================================
+
+    def search(self, text: str, k: int = 5, kind: Optional[str] = None) -> List[Dict]:
+        """
+        Most similar items to text
+
+        Args:
+            text: Query text
+            k: Results to return
+            kind: Only return items of this kind (e.g. "post", "article")
+
+        Returns:
+            [{"kind", "id", "score"}] by descending cosine similarity
+        """
+        return self.search_many([text], k=k, kind=kind)[0]
+
+    def search_many(self, texts: List[str], k: int = 5, kind: Optional[str] = None) -> List[List[Dict]]:
+        """Top-k results for each of a batch of query texts (one scan for all)"""
+        queries = np.stack([self.vectorizer.transform(text) for text in texts]) if texts else None
+        results: List[List[Dict]] = [[] for _ in texts]
+        if queries is None or k <= 0:
+            return results
+
+        with self._lock, self._file_lock(shared=True):
+            self._refresh()
+            rows = len(self._row_keys)
+            if kind is not None and kind not in self._kind_codes:
+                return results
+            wanted = self._kind_codes.get(kind)
+
+            best_scores = [np.empty(0, dtype=np.float32) for _ in texts]
+            best_rows = [np.empty(0, dtype=np.int64) for _ in texts]
+
+            for start in range(0, rows, self.CHUNK_ROWS):
+                end = min(start + self.CHUNK_ROWS, rows)
+                scores = self._vectors[start:end] @ queries.T
+
+                kinds = self._row_kinds[start:end]
+                invalid = kinds < 0 if wanted is None else kinds != wanted
+                scores[invalid] = -np.inf
+
+                for q in range(len(texts)):
+                    column = scores[:, q]
+                    top = np.argpartition(-column, k - 1)[:k] if len(column) > k else np.arange(len(column))
+                    best_scores[q] = np.concatenate([best_scores[q], column[top]])
+                    best_rows[q] = np.concatenate([best_rows[q], top + start])
+
+            for q in range(len(texts)):
+                order = np.argsort(-best_scores[q], kind="stable")[:k]
+                for position in order:
+                    score = float(best_scores[q][position])
+                    if score <= 0:
+                        break
+                    item_kind, item_id = self._row_keys[best_rows[q][position]]
+                    results[q].append({"kind": item_kind, "id": item_id, "score": round(score, 4)})
+
+        return results
+
+    def ids(self, kind: str) -> List[Hashable]:
+        """Ids of the indexed items of one kind"""
+        with self._lock, self._file_lock(shared=True):
+            self._refresh()
+            return [item_id for item_kind, item_id in self._rows if item_kind == kind]
+
+    def __len__(self) -> int:
+        with self._lock, self._file_lock(shared=True):
+            self._refresh()
+            return len(self._rows)
+
+    def get_stats(self) -> Dict:
+        """Item counts per kind and storage size"""
+        with self._lock, self._file_lock(shared=True):
+            self._refresh()
+            per_kind = Counter(kind for kind, _ in self._rows)
+            return {
+                "items": len(self._rows),
+                "rows": len(self._row_keys),
+                "capacity": self._capacity,
+                "dim": self.dim,
+                "kinds": dict(per_kind)
+            }
+
+
+# One index per directory
+_vector_indexes: Dict[str, VectorIndex] = {}
+_vector_indexes_lock = threading.Lock()
+
+
+def default_index_path(db_path: Optional[str] = None) -> str:
+    """
+    Index directory kept next to a database file
+
+    Args:
+        db_path: Database file (default: the app database, MILTON_DB_PATH)
+    """
+    if db_path is None:
+        from .database import default_db_path  # Lazy: database imports this module
+        db_path = default_db_path()
+    return str(Path(db_path).with_suffix(".vectors"))
+
+
+def get_vector_index(path: Optional[str] = None) -> VectorIndex:
+    """
+    Get the shared vector index for a directory
+
+    Args:
+        path: Index directory (default: next to the app database, so posts
+              and articles share one index)
+    """
+    path = os.path.abspath(path or default_index_path())
+    with _vector_indexes_lock:
+        if path not in _vector_indexes:
+            _vector_indexes[path] = VectorIndex(path)
+        return _vector_indexes[path]
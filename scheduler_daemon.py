@@ -3,20 +3,25 @@ Automated Scheduler Daemon for Milton AI Publicist
 Runs continuously in background, publishing posts at scheduled times
 """
 
-import time
+import heapq
+import os
 import signal
+import socket
 import sys
+import time
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import logging
+import uuid
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from module_v.database import get_database
-from module_iii import SocialMediaPublisher
+from module_v.database import DatabaseManager, get_database
+from module_v.async_database import AsyncDatabaseManager
+from module_iii import RetryPolicy, SocialMediaPublisher
 
 # Configure logging
 logging.basicConfig(
@@ -35,31 +40,92 @@ class SchedulerDaemon:
     Background daemon that automatically publishes scheduled posts
 
     Features:
-    - Checks for due posts every minute
+    - Wakes exactly when the next scheduled post is due
     - Publishes to LinkedIn, Twitter, Instagram
     - Updates database with results
     - Error handling and retry logic
     - Graceful shutdown
+
+    Runs on one long-lived event loop with a shared publisher (and so one
+    HTTP connection pool). Due posts publish concurrently, with at most
+    platform_concurrency[platform] in flight per platform.
+
+    Pending scheduled times are kept in a min-heap, and the loop sleeps
+    until the earliest one. Schedule changes made by anyone (the dashboard's
+    schedule/cancel endpoints, another process) are noticed within
+    watch_interval through SQLite's data_version counter, which costs no
+    table access, so an idle daemon does almost no work.
+
+    Due posts are claimed under a lease (status in_flight, this daemon's
+    worker_id) before publishing, so several daemons can share one
+    database without publishing a post twice; posts held by a daemon that
+    died are reclaimed once their lease expires.
+
+    Failed publishes that may succeed later (timeouts, 429, 5xx) return to
+    pending with next_attempt_at pushed back exponentially (with jitter),
+    and the wakeup heap picks them up like any other due time. Permanent
+    failures, and posts out of attempts, move to dead_letter, from where
+    they can be requeued in bulk.
     """
 
-    def __init__(self, check_interval: int = 60):
+    DEFAULT_PLATFORM_CONCURRENCY = {"linkedin": 4, "twitter": 4, "instagram": 2}
+    FALLBACK_PLATFORM_CONCURRENCY = 2
+    BOOKKEEPING_ATTEMPTS = 3  # Tries at marking a published post before giving up
+
+    def __init__(
+        self,
+        check_interval: int = 60,
+        watch_interval: float = 0.5,
+        platform_concurrency: Optional[Dict[str, int]] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 300,
+        max_attempts: int = 5,
+        retry_base_delay: float = 60,
+        retry_max_delay: float = 3600,
+        db: Optional[DatabaseManager] = None,
+        publisher: Optional[SocialMediaPublisher] = None
+    ):
         """
         Initialize scheduler daemon
 
         Args:
-            check_interval: Seconds between checks (default 60 = 1 minute)
+            check_interval: Longest gap between full due-post queries, a safety
+                            net behind the wakeup heap (default 60 = 1 minute)
+            watch_interval: Seconds between checks for schedule changes
+            platform_concurrency: Concurrent publishes allowed per platform
+                                  (default: DEFAULT_PLATFORM_CONCURRENCY)
+            worker_id: Name of this daemon in claims (default: host:pid:random)
+            lease_seconds: How long a claimed post stays reserved for this daemon
+            max_attempts: Publish attempts before a post is dead-lettered
+            retry_base_delay: Seconds before the first retry (doubling after each)
+            retry_max_delay: Longest delay between retries
+            db: Database to use (default: shared singleton)
+            publisher: Publisher to use (default: new SocialMediaPublisher)
         """
         self.check_interval = check_interval
-        self.db = get_database()
-        self.publisher = SocialMediaPublisher()
+        self.watch_interval = watch_interval
+        self.platform_concurrency = {**self.DEFAULT_PLATFORM_CONCURRENCY, **(platform_concurrency or {})}
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.retry_policy = RetryPolicy(max_attempts, retry_base_delay, retry_max_delay)
+        self.db = db or get_database()
+        self.adb = AsyncDatabaseManager(self.db)
+        self.publisher = publisher or SocialMediaPublisher()
         self.running = False
 
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._platform_slots: Dict[str, asyncio.Semaphore] = {}
+        self._due_heap: List[Tuple[float, int]] = []  # (due timestamp, schedule id)
+        self._data_version: Optional[int] = None
+
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._shutdown_handler)
         signal.signal(signal.SIGTERM, self._shutdown_handler)
 
         logger.info("Scheduler Daemon initialized")
         logger.info(f"Check interval: {check_interval} seconds")
+        logger.info(f"Worker ID: {self.worker_id}")
 
     def _shutdown_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
@@ -67,56 +133,129 @@ class SchedulerDaemon:
         self.stop()
 
     def start(self):
-        """Start the scheduler daemon"""
+        """Start the scheduler daemon (blocks until stopped)"""
         logger.info("="*70)
         logger.info("MILTON AI PUBLICIST - SCHEDULER DAEMON STARTING")
         logger.info("="*70)
         logger.info(f"Current time: {datetime.now(timezone.utc).isoformat()}")
         logger.info(f"Check interval: {self.check_interval} seconds")
+        logger.info(f"Platform concurrency: {self.platform_concurrency}")
         logger.info("Press Ctrl+C to stop")
         logger.info("="*70)
 
-        self.running = True
-
         try:
-            while self.running:
-                self._check_and_publish()
-
-                if self.running:  # Only sleep if still running
-                    logger.debug(f"Sleeping for {self.check_interval} seconds...")
-                    time.sleep(self.check_interval)
-
+            asyncio.run(self.run())
         except Exception as e:
             logger.error(f"Daemon crashed: {e}", exc_info=True)
             raise
         finally:
             logger.info("Scheduler Daemon stopped")
 
+    async def run(self):
+        """Check and publish until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._platform_slots = {}
+        self._data_version = None
+        self.running = True
+        last_check = None
+
+        try:
+            while self.running:
+                if self._schedule_changed():
+                    await self._reload_schedule()
+
+                now = time.time()
+                due = False
+                while self._due_heap and self._due_heap[0][0] <= now:
+                    heapq.heappop(self._due_heap)
+                    due = True
+
+                if due or last_check is None or time.monotonic() - last_check >= self.check_interval:
+                    await self._check_and_publish()
+                    last_check = time.monotonic()
+                    continue  # Publishing changed the schedule; reload before sleeping
+
+                # Sleep until the next post is due, waking early to look for schedule changes
+                delay = min(self.watch_interval, self.check_interval - (time.monotonic() - last_check))
+                if self._due_heap:
+                    delay = min(delay, self._due_heap[0][0] - now)
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=max(delay, 0))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.publisher.close()
+            self.running = False
+
     def stop(self):
-        """Stop the scheduler daemon"""
+        """Stop the scheduler daemon (safe to call from a signal handler or another thread)"""
         logger.info("Stopping scheduler daemon...")
         self.running = False
 
-    def _check_and_publish(self):
-        """Check for due posts and publish them"""
+        if self._loop is not None and self._stop_event is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+
+    def _schedule_changed(self) -> bool:
+        """True if anything was written to the database since the last call"""
+        version = self.db.get_data_version()
+        changed = version != self._data_version
+        self._data_version = version
+        return changed
+
+    async def _reload_schedule(self):
+        """Rebuild the wakeup heap from the pending scheduled posts"""
+        pending = await self.adb.get_pending_schedule_times()
+        self._due_heap = [
+            (self._parse_schedule_time(row['due_time']), row['id'])
+            for row in pending
+        ]
+        heapq.heapify(self._due_heap)
+
+        if self._due_heap:
+            wait = self._due_heap[0][0] - time.time()
+            logger.debug(f"{len(self._due_heap)} pending schedule(s); next due in {max(wait, 0):.1f}s")
+
+    @staticmethod
+    def _parse_schedule_time(value: str) -> float:
+        """Timestamp of a stored scheduled_time (naive times are UTC; unparseable ones are due now)"""
+        try:
+            scheduled = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return 0.0
+        if scheduled.tzinfo is None:
+            scheduled = scheduled.replace(tzinfo=timezone.utc)
+        return scheduled.timestamp()
+
+    def _platform_slot(self, platform: str) -> asyncio.Semaphore:
+        """Concurrency cap for one platform"""
+        if platform not in self._platform_slots:
+            limit = self.platform_concurrency.get(platform, self.FALLBACK_PLATFORM_CONCURRENCY)
+            self._platform_slots[platform] = asyncio.Semaphore(limit)
+        return self._platform_slots[platform]
+
+    async def _check_and_publish(self):
+        """Claim due posts and publish them concurrently"""
         try:
-            # Get all posts that are due to be published
-            due_posts = self.db.get_due_scheduled_posts()
+            # Take ownership of every due post (and any whose lease expired)
+            due_posts = await self.adb.claim_due_scheduled_posts(self.worker_id, self.lease_seconds)
 
             if not due_posts:
                 logger.debug("No posts due for publishing")
                 return
 
-            logger.info(f"Found {len(due_posts)} post(s) due for publishing")
+            logger.info(f"Claimed {len(due_posts)} post(s) due for publishing")
 
-            # Process each due post
-            for scheduled_post in due_posts:
+            # Publish all due posts at once; per-platform semaphores cap the fan-out
+            await asyncio.gather(*(
                 self._publish_scheduled_post(scheduled_post)
+                for scheduled_post in due_posts
+            ))
 
         except Exception as e:
             logger.error(f"Error checking for due posts: {e}", exc_info=True)
 
-    def _publish_scheduled_post(self, scheduled_post: dict):
+    async def _publish_scheduled_post(self, scheduled_post: dict):
         """
         Publish a single scheduled post
 
@@ -128,13 +267,10 @@ class SchedulerDaemon:
         platform = scheduled_post['platform']
         scheduled_time = scheduled_post['scheduled_time']
 
-        logger.info("="*70)
-        logger.info(f"Publishing Scheduled Post")
-        logger.info(f"  Schedule ID: {schedule_id}")
-        logger.info(f"  Post ID: {post_id}")
-        logger.info(f"  Platform: {platform}")
-        logger.info(f"  Scheduled: {scheduled_time}")
-        logger.info("="*70)
+        logger.info(
+            f"Publishing scheduled post {schedule_id} "
+            f"(post {post_id}, {platform}, scheduled {scheduled_time})"
+        )
 
         try:
             # Get post content
@@ -142,67 +278,109 @@ class SchedulerDaemon:
             graphic_url = scheduled_post.get('graphic_url')
             video_url = scheduled_post.get('video_url')
 
-            logger.info(f"Content: {content[:100]}...")
+            logger.debug(f"Content: {content[:100]}...")
             if graphic_url:
-                logger.info(f"Graphic: {graphic_url}")
+                logger.debug(f"Graphic: {graphic_url}")
             if video_url:
-                logger.info(f"Video: {video_url}")
+                logger.debug(f"Video: {video_url}")
 
             # Publish to the specified platform
-            result = asyncio.run(self._publish_to_platform(
-                platform=platform,
-                content=content,
-                graphic_url=graphic_url,
-                video_url=video_url
-            ))
-
-            if result['success']:
-                post_url = result.get('url')
-                logger.info(f"✅ SUCCESS: Published to {platform}")
-                logger.info(f"   URL: {post_url}")
-
-                # Mark scheduled post as published
-                self.db.mark_scheduled_post_published(schedule_id, post_url)
-
-                # Mark the original post as published
-                self.db.mark_post_published(post_id, post_url)
-
-                # Log the publishing result
-                self.db.log_publishing_result(
-                    post_id=post_id,
-                    platform=platform,
-                    success=True,
-                    post_url=post_url
-                )
-            else:
-                error = result.get('error', 'Unknown error')
-                logger.error(f"❌ FAILED: {error}")
+            async with self._platform_slot(platform):
+                # Waiting for a slot may have outlasted the lease; re-check ownership first
+                if not await self.adb.renew_scheduled_post_lease(schedule_id, self.worker_id, self.lease_seconds):
+                    logger.warning(f"Lease on schedule {schedule_id} lost to another worker; skipping")
+                    return
 
-                # Mark scheduled post as failed
-                self.db.mark_scheduled_post_failed(schedule_id, error)
-
-                # Log the failure
-                self.db.log_publishing_result(
-                    post_id=post_id,
+                result = await self._publish_to_platform(
                     platform=platform,
-                    success=False,
-                    error_message=error
+                    content=content,
+                    graphic_url=graphic_url,
+                    video_url=video_url
                 )
 
         except Exception as e:
             error_msg = f"Exception during publishing: {str(e)}"
             logger.error(error_msg, exc_info=True)
 
-            # Mark as failed
-            self.db.mark_scheduled_post_failed(schedule_id, error_msg)
+            await self._handle_failure(scheduled_post, {'error': error_msg, 'retryable': True})
+            return
+
+        # Outside the try above: once the post is live, a bookkeeping error
+        # must not send it back for another attempt
+        if result['success']:
+            await self._record_success(scheduled_post, result.get('url'))
+        else:
+            await self._handle_failure(scheduled_post, result)
+
+    async def _record_success(self, scheduled_post: dict, post_url: Optional[str]):
+        """
+        Record a successful publish
+
+        Marking the schedule row is retried briefly: while it stays claimed,
+        another worker would reclaim and republish it once the lease runs
+        out. Other bookkeeping errors are only logged.
+        """
+        schedule_id = scheduled_post['id']
+        post_id = scheduled_post['post_id']
+        platform = scheduled_post['platform']
+
+        logger.info(f"✅ SUCCESS: Published schedule {schedule_id} to {platform}")
+        logger.info(f"   URL: {post_url}")
+
+        for attempt in range(self.BOOKKEEPING_ATTEMPTS):
+            try:
+                if not await self.adb.mark_scheduled_post_published(schedule_id, self.worker_id):
+                    logger.warning(f"Lease on schedule {schedule_id} expired while publishing")
+                break
+            except Exception as e:
+                if attempt == self.BOOKKEEPING_ATTEMPTS - 1:
+                    logger.error(
+                        f"Schedule {schedule_id} was published but could not be marked: {e}",
+                        exc_info=True
+                    )
+                    return
+                await asyncio.sleep(0.5 * 2 ** attempt)
 
-            # Log the failure
-            self.db.log_publishing_result(
+        try:
+            # Mark the original post as published and log the result
+            await self.adb.mark_post_published(post_id, post_url)
+            await self.adb.log_publishing_result(
                 post_id=post_id,
                 platform=platform,
-                success=False,
-                error_message=error_msg
+                success=True,
+                post_url=post_url
             )
+        except Exception as e:
+            logger.error(f"Schedule {schedule_id} was published but not recorded: {e}", exc_info=True)
+
+    async def _handle_failure(self, scheduled_post: dict, result: dict):
+        """Schedule a retry for a transient failure, or dead-letter the post"""
+        schedule_id = scheduled_post['id']
+        platform = scheduled_post['platform']
+        attempts = scheduled_post.get('attempts') or 1
+        error = result.get('error', 'Unknown error')
+
+        max_attempts = self.retry_policy.max_attempts
+        if self.retry_policy.should_retry(result, attempts):
+            delay = self.retry_policy.delay(attempts)
+            next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+            logger.warning(
+                f"⚠️  RETRY: schedule {schedule_id} on {platform} failed "
+                f"(attempt {attempts}/{max_attempts}): {error}; retrying in {delay:.0f}s"
+            )
+            await self.adb.retry_scheduled_post(schedule_id, error, next_attempt_at, self.worker_id)
+        else:
+            reason = "permanent error" if attempts < max_attempts else f"{attempts} attempts"
+            logger.error(f"❌ FAILED: schedule {schedule_id} on {platform} ({reason}): {error}")
+            await self.adb.dead_letter_scheduled_post(schedule_id, error, self.worker_id)
+
+        # Log the failure
+        await self.adb.log_publishing_result(
+            post_id=scheduled_post['post_id'],
+            platform=platform,
+            success=False,
+            error_message=error
+        )
 
     async def _publish_to_platform(
         self,
@@ -227,22 +405,16 @@ class SchedulerDaemon:
             if platform == 'linkedin':
                 return await self.publisher.publish_to_linkedin(
                     content=content,
-                    image_url=graphic_url,
-                    video_url=video_url
+                    media_url=graphic_url or video_url
                 )
 
             elif platform == 'twitter':
-                return await self.publisher.publish_to_twitter(
-                    content=content,
-                    image_url=graphic_url,
-                    video_url=video_url
-                )
+                return await self.publisher.publish_to_twitter(content=content)
 
             elif platform == 'instagram':
                 return await self.publisher.publish_to_instagram(
-                    content=content,
-                    image_url=graphic_url,
-                    video_url=video_url
+                    caption=content,
+                    image_url=graphic_url
                 )
 
             else:
@@ -255,7 +427,8 @@ class SchedulerDaemon:
             logger.error(f"Error publishing to {platform}: {e}", exc_info=True)
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(e),
+                'retryable': True
             }
 
     def get_status(self) -> dict:
@@ -268,6 +441,12 @@ class SchedulerDaemon:
         return {
             'running': self.running,
             'check_interval': self.check_interval,
+            'watch_interval': self.watch_interval,
+            'worker_id': self.worker_id,
+            'next_due': (
+                datetime.fromtimestamp(self._due_heap[0][0], timezone.utc).isoformat()
+                if self._due_heap else None
+            ),
             'total_posts': stats['total_posts'],
             'published_posts': stats['published_posts'],
             'pending_schedules': len(pending_schedules),
@@ -284,7 +463,12 @@ def main():
         '--interval',
         type=int,
         default=60,
-        help='Check interval in seconds (default: 60)'
+        help='Longest gap between full due-post checks in seconds (default: 60)'
+    )
+    parser.add_argument(
+        '--worker-id',
+        default=None,
+        help='Name of this daemon when several share a database (default: host:pid:random)'
     )
     parser.add_argument(
         '--test',
@@ -301,7 +485,7 @@ def main():
         logger.info("Running in TEST MODE (10-second intervals)")
 
     # Create and start daemon
-    daemon = SchedulerDaemon(check_interval=args.interval)
+    daemon = SchedulerDaemon(check_interval=args.interval, worker_id=args.worker_id)
 
     try:
         daemon.start()
@@ -5,8 +5,11 @@ Tests all 35+ API endpoints with realistic scenarios
 
 import pytest
 import asyncio
+import json
 import sys
 import os
+import tempfile
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Any
@@ -14,6 +17,10 @@ from typing import Dict, Any
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+# Keep the app's database, LLM cache and similarity index out of the repo
+_TEST_DATA_DIR = tempfile.mkdtemp(prefix="milton_tests_")
+os.environ.setdefault("MILTON_DB_PATH", os.path.join(_TEST_DATA_DIR, "milton_publicist.db"))
+
 from fastapi.testclient import TestClient
 from dashboard.app import app
 
@@ -139,6 +146,55 @@ class TestContentGeneration:
         # Should handle gracefully
         assert response.status_code in [200, 400, 422]
 
+    def test_generate_stream(self, monkeypatch):
+        """Test SSE generation streams tokens, then saves the post"""
+        from types import SimpleNamespace
+        from dashboard.app import llm
+
+        chunks = ["Proud of our ", "volleyball team. ", "Let's Go Owls!"]
+
+        class FakeStream:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            @property
+            async def text_stream(self):
+                for chunk in chunks:
+                    yield chunk
+
+            async def get_final_message(self):
+                return SimpleNamespace(
+                    content=[SimpleNamespace(type="text", text="".join(chunks))],
+                    usage=SimpleNamespace(input_tokens=100, output_tokens=20)
+                )
+
+        fake_client = SimpleNamespace(messages=SimpleNamespace(stream=lambda **kwargs: FakeStream()))
+        monkeypatch.setattr(llm, "_async_client", fake_client)
+
+        response = client.post("/api/generate/stream", json={
+            "voice_type": "personal",
+            "scenario": "Team Celebration",
+            "context": "Volleyball team won the conference"
+        })
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = [
+            block for block in response.text.split("\n\n")
+            if block.startswith("event:")
+        ]
+        assert [e.split("\n")[0] for e in events] == ["event: token"] * 3 + ["event: done"]
+
+        done = json.loads(events[-1].split("data: ", 1)[1])
+        assert done["success"] is True
+        assert done["post"]["content"] == "".join(chunks)
+        assert done["tokens_used"] == 120
+
+        client.delete(f"/api/posts/{done['post']['id']}")
+
 
 # ============================================================================
 # POST MANAGEMENT TESTS
@@ -298,6 +354,36 @@ class TestPublishing:
         data = response.json()
         assert "instructions" in data
 
+    def test_publisher_session_replaced_per_event_loop(self):
+        """A session left by an earlier event loop is closed before a new one is opened"""
+        from types import SimpleNamespace
+        from module_iii.social_media_publisher import SocialMediaPublisher
+
+        publisher = SocialMediaPublisher(clerk_auth=SimpleNamespace())
+        first = asyncio.run(publisher._get_session())
+        second = asyncio.run(publisher._get_session())
+
+        assert first is not second
+        assert first.closed and not second.closed
+        asyncio.run(publisher.close())
+        assert second.closed
+
+    def test_publisher_closed_on_shutdown(self, monkeypatch):
+        """The dashboard closes its publisher when the app shuts down"""
+        import dashboard.app as dashboard_app
+
+        class StubPublisher:
+            closed = False
+
+            async def close(self):
+                self.closed = True
+
+        stub = StubPublisher()
+        monkeypatch.setattr(dashboard_app, "publisher", stub)
+        with TestClient(app):
+            pass
+        assert stub.closed
+
 
 # ============================================================================
 # ANALYTICS TESTS
@@ -334,6 +420,14 @@ class TestAnalytics:
         data = response.json()
         assert isinstance(data, dict)
 
+    def test_posting_heatmap(self):
+        """Test day x hour heatmap endpoint"""
+        response = client.get("/api/analytics/heatmap?platform=linkedin")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["mean"]) == 7
+        assert all(len(row) == 24 for row in data["count"])
+
     def test_content_performance(self):
         """Test content performance endpoint"""
         response = client.get("/api/analytics/content-performance")
@@ -365,6 +459,207 @@ class TestAnalytics:
         })
         assert response.status_code in [200, 201]
 
+    def test_record_engagement_bulk(self):
+        """Test bulk engagement ingestion reports per-row errors"""
+        from module_v.database import get_database
+        post_id = get_database().create_post(
+            content="Bulk engagement test post", voice_type="personal", scenario="test"
+        )
+
+        response = client.post("/api/analytics/engagement/bulk", json={"records": [
+            {"post_id": post_id, "platform": "linkedin", "views": 100, "likes": 10},
+            {"post_id": post_id, "platform": "linkedin", "views": 200, "likes": 30},
+            {"post_id": post_id, "platform": "twitter", "views": -5},
+            {"platform": "twitter", "views": 5},
+        ]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["recorded"] == 2
+        assert [e["index"] for e in data["errors"]] == [2, 3]
+
+        # Second row for the same (post, platform) overwrote the first
+        rows = get_database().get_post_analytics(post_id)
+        assert len(rows) == 1
+        assert rows[0]["views"] == 200
+
+        client.delete(f"/api/posts/{post_id}")
+
+    def test_engagement_curve(self, tmp_path):
+        """Test engagement history stores deltas and survives downsampling"""
+        from module_v.analytics_engine import AnalyticsEngine
+        from module_v.database import DatabaseManager
+
+        db = DatabaseManager(str(tmp_path / "history.db"))
+        engine = AnalyticsEngine(db=db)
+        post_id = db.create_post(
+            content="Engagement curve test post", voice_type="personal", scenario="test"
+        )
+
+        engine.record_engagement(post_id, "linkedin", views=100, likes=10)
+        engine.record_engagement(post_id, "linkedin", views=100, likes=10)
+        engine.record_engagement(post_id, "linkedin", views=250, likes=12)
+
+        deltas = db._get_connection().execute(
+            "SELECT SUM(d_views), COUNT(*) FROM engagement_snapshots WHERE post_id = ?", (post_id,)
+        ).fetchone()
+        assert deltas[0] == 250
+        assert deltas[1] <= 2  # Unchanged poll stored nothing
+
+        points = engine.get_engagement_curve(post_id, "linkedin")["curves"]["linkedin"]
+        assert points[-1]["views"] == 250
+        assert points[-1]["likes"] == 12
+
+        # Downsampling far in the future merges into coarser buckets, totals unchanged
+        engine.downsample_engagement_history(now=time.time() + 3 * 86400)
+        points = engine.get_engagement_curve(post_id, "linkedin")["curves"]["linkedin"]
+        assert len(points) == 1
+        assert points[0]["resolution_seconds"] == 3600
+        assert points[0]["views"] == 250
+
+    def test_engagement_curve_endpoints(self):
+        """Test the per-post and cohort curve endpoints"""
+        from dashboard.app import analytics
+        from module_v.database import get_database
+        post_id = get_database().create_post(
+            content="Engagement curve endpoint post", voice_type="personal", scenario="test"
+        )
+
+        analytics.record_engagement(post_id, "linkedin", views=80, likes=8)
+
+        response = client.get(f"/api/analytics/post/{post_id}/curve?platform=linkedin")
+        assert response.status_code == 200
+        points = response.json()["curves"]["linkedin"]
+        assert points[-1]["views"] == 80
+        assert points[-1]["likes"] == 8
+
+        response = client.get("/api/analytics/cohort-curve?platform=linkedin")
+        assert response.status_code == 200
+        assert set(response.json()["horizons"]) == {"1h", "24h", "7d"}
+
+        client.delete(f"/api/posts/{post_id}")
+
+    def test_dashboard_snapshot_invalidated_on_engagement(self):
+        """Test dashboard snapshot is reused until engagement is written"""
+        from dashboard.app import analytics
+        from module_v.database import get_database
+        post_id = get_database().create_post(
+            content="Snapshot test post", voice_type="personal", scenario="test"
+        )
+
+        snapshot = analytics.get_snapshot()
+        assert analytics.get_snapshot() is snapshot
+
+        response = client.post("/api/analytics/engagement", json={
+            "post_id": post_id, "platform": "linkedin", "views": 10, "likes": 1
+        })
+        assert response.status_code == 200
+        assert analytics.get_snapshot() is not snapshot
+
+        client.delete(f"/api/posts/{post_id}")
+
+    @staticmethod
+    def _join_aggregates(conn) -> Dict[str, Any]:
+        """The analytics JOIN posts queries the rollups replaced"""
+        by_voice = {
+            row[0]: {"post_count": row[1], "avg_performance": round(row[2], 2)}
+            for row in conn.execute("""
+                SELECT p.voice_type, COUNT(DISTINCT p.id), AVG(a.engagement_rate)
+                FROM posts p JOIN analytics a ON p.id = a.post_id
+                WHERE p.status = 'published'
+                GROUP BY p.voice_type
+            """)
+        }
+        by_media = {
+            row[0]: {"post_count": row[1], "avg_performance": round(row[2], 2)}
+            for row in conn.execute("""
+                SELECT
+                    CASE WHEN p.graphic_url IS NOT NULL OR p.video_url IS NOT NULL
+                         THEN 'with_media' ELSE 'without_media' END AS media_status,
+                    COUNT(DISTINCT p.id), AVG(a.engagement_rate)
+                FROM posts p JOIN analytics a ON p.id = a.post_id
+                WHERE p.status = 'published'
+                GROUP BY media_status
+            """)
+        }
+        by_platform = {
+            row[0]: {"views": {"total": row[1], "best": row[2]}, "likes": {"total": row[3], "best": row[4]}}
+            for row in conn.execute("""
+                SELECT a.platform, SUM(a.views), MAX(a.views), SUM(a.likes), MAX(a.likes)
+                FROM analytics a JOIN posts p ON a.post_id = p.id
+                WHERE p.status = 'published'
+                GROUP BY a.platform
+            """)
+        }
+        top = [
+            (row[0], round(row[1], 2))
+            for row in conn.execute("""
+                SELECT p.id, AVG(a.engagement_rate) AS performance
+                FROM posts p JOIN analytics a ON p.id = a.post_id
+                WHERE p.status = 'published'
+                GROUP BY p.id
+                ORDER BY performance DESC
+            """)
+        ]
+        return {"by_voice": by_voice, "by_media": by_media, "by_platform": by_platform, "top": top}
+
+    @staticmethod
+    def _rollup_aggregates(engine) -> Dict[str, Any]:
+        content = engine.analyze_content_performance()
+        overall = engine.get_overall_performance(days=1)["metrics_by_platform"]
+        return {
+            "by_voice": content["by_voice_type"],
+            "by_media": content["by_media_presence"],
+            "by_platform": {
+                platform: {
+                    metric: {"total": values[metric]["total"], "best": values[metric]["best"]}
+                    for metric in ("views", "likes")
+                }
+                for platform, values in overall.items()
+            },
+            "top": [(post["post_id"], post["performance"]) for post in engine.get_top_performing_posts(limit=100)]
+        }
+
+    def test_rollups_track_post_edits(self, tmp_path):
+        """Rollups match the JOIN queries after engagement, publish, update and delete"""
+        from module_v.analytics_engine import AnalyticsEngine
+        from module_v.database import DatabaseManager
+
+        db = DatabaseManager(str(tmp_path / "rollups.db"))
+        engine = AnalyticsEngine(db=db)
+        conn = db._get_connection()
+
+        def assert_consistent():
+            assert self._rollup_aggregates(engine) == self._join_aggregates(conn)
+            assert not engine._rollups_stale()
+
+        star = db.create_post("Record crowd for the home opener", "personal", "Volleyball")
+        steady = db.create_post("Donor spotlight on the new arena", "professional", "Donors")
+        draft = db.create_post("Draft recruiting update", "coach", "Recruiting")
+
+        # Engagement recorded before the posts are published
+        engine.record_engagement(star, "linkedin", views=900, likes=90, comments=9, shares=4)
+        engine.record_engagement(steady, "linkedin", views=200, likes=12)
+        engine.record_engagement(steady, "twitter", views=300, likes=30)
+        engine.record_engagement(draft, "linkedin", views=50, likes=2)
+        assert_consistent()
+
+        db.mark_post_published(star, "https://linkedin.example/star")
+        db.mark_post_published(steady, "https://linkedin.example/steady")
+        assert_consistent()
+        assert self._rollup_aggregates(engine)["by_platform"]["linkedin"]["views"] == {"total": 1100, "best": 900}
+
+        engine.record_engagement(steady, "linkedin", views=400, likes=40)
+        assert_consistent()
+
+        db.update_post(steady, voice_type="coach", graphic_url="https://cdn.example/arena.png")
+        db.update_post(star, content="Record crowd for the home opener, again")
+        assert_consistent()
+
+        db.delete_post(star)
+        assert_consistent()
+        assert self._rollup_aggregates(engine)["by_platform"]["linkedin"]["views"] == {"total": 400, "best": 400}
+        assert [post_id for post_id, _ in self._rollup_aggregates(engine)["top"]] == [steady]
+
 
 # ============================================================================
 # AUTHENTICATION TESTS
@@ -540,6 +835,1486 @@ class TestPerformance:
         assert elapsed < 2.0
 
 
+# ============================================================================
+# ASYNC DATABASE TESTS
+# ============================================================================
+
+class TestAsyncDatabase:
+    """Test the async database facade used by the dashboard"""
+
+    def test_concurrent_queries(self, tmp_path):
+        """Concurrent facade calls run on the worker pool and all complete"""
+        from module_v.database import DatabaseManager
+        from module_v.async_database import AsyncDatabaseManager
+
+        adb = AsyncDatabaseManager(DatabaseManager(str(tmp_path / "async.db")), max_workers=4)
+
+        async def workload():
+            ids = await asyncio.gather(*[
+                adb.create_post(content=f"Post {i}", voice_type="personal", scenario="test")
+                for i in range(20)
+            ])
+            posts = await asyncio.gather(*[adb.get_post(post_id) for post_id in ids])
+            stats = await adb.get_stats()
+            return ids, posts, stats
+
+        ids, posts, stats = asyncio.run(workload())
+        adb.close()
+
+        assert len(set(ids)) == 20
+        assert all(p is not None for p in posts)
+        assert stats["total_posts"] == 20
+
+
+# ============================================================================
+# LLM CLIENT TESTS
+# ============================================================================
+
+class TestLLMClient:
+    """Test the shared LLM client's concurrency cap and metrics"""
+
+    def test_concurrent_calls_overlap_up_to_limit(self):
+        """Calls overlap up to max_concurrency; the rest wait for a slot"""
+        from module_ii.llm_client import LLMClient
+
+        class SlowMessages:
+            async def create(self, **kwargs):
+                await asyncio.sleep(0.2)
+                return kwargs["messages"][0]["content"]
+
+        class SlowAsyncClient:
+            messages = SlowMessages()
+
+        llm = LLMClient(api_key="test", max_concurrency=3, async_client=SlowAsyncClient())
+
+        async def workload():
+            return await asyncio.gather(*[
+                llm.create_message(model="test", max_tokens=10, messages=[{"role": "user", "content": str(i)}])
+                for i in range(6)
+            ])
+
+        start = time.time()
+        results = asyncio.run(workload())
+        elapsed = time.time() - start
+
+        assert results == [str(i) for i in range(6)]
+        assert elapsed < 1.0  # Two waves of 0.2s, not six sequential calls
+
+        metrics = llm.get_metrics()
+        assert metrics["calls"] == 6
+        assert metrics["max_in_flight"] == 3
+        assert metrics["waiting"] == 0
+        assert metrics["queue_time"]["max_ms"] >= 150
+
+    def test_async_client_per_event_loop(self):
+        """Each event loop gets its own AsyncAnthropic client; close() releases it"""
+        from module_ii.llm_client import LLMClient
+
+        llm = LLMClient(api_key="test")
+
+        async def client_for_loop(close: bool):
+            client_ = llm.async_client
+            assert llm.async_client is client_
+            if close:
+                await llm.close()
+                assert client_.is_closed()
+            return client_
+
+        first = asyncio.run(client_for_loop(close=True))
+        second = asyncio.run(client_for_loop(close=False))
+        third = asyncio.run(client_for_loop(close=False))
+        assert len({id(first), id(second), id(third)}) == 3
+        assert list(llm._loop_clients.values()) == [third]  # Closed loop's client was dropped
+
+    def test_llm_metrics_endpoint(self):
+        """Test LLM metrics endpoint"""
+        response = client.get("/api/llm/metrics")
+        assert response.status_code == 200
+        data = response.json()
+        assert "max_concurrency" in data
+        assert "queue_time" in data
+        assert "hit_rate" in data["cache"]["overall"]
+
+
+class TestLLMCache:
+    """Test the content-addressed LLM response cache"""
+
+    @staticmethod
+    def _counting_client(text: str):
+        from types import SimpleNamespace
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+        return SimpleNamespace(messages=SimpleNamespace(create=create)), calls
+
+    def test_repeat_requests_hit_cache(self, tmp_path):
+        """Identical requests call the API once; restarts are served from SQLite"""
+        from module_ii.llm_cache import LLMResponseCache
+
+        client_, calls = self._counting_client('{"sentiment": "positive"}')
+        request = dict(model="test-model", max_tokens=300, messages=[{"role": "user", "content": "KSU wins"}])
+
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+        first = cache.complete(client_, call_site="sentiment", ttl=60, parse=json.loads, **request)
+        second = cache.complete(client_, call_site="sentiment", ttl=60, parse=json.loads, **request)
+        assert first == second == {"sentiment": "positive"}
+        assert len(calls) == 1
+
+        # Different sampling parameters are a different key
+        cache.complete(client_, call_site="sentiment", ttl=60, temperature=0.7, **request)
+        assert len(calls) == 2
+
+        reopened = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+        reopened.complete(client_, call_site="sentiment", ttl=60, **request)
+        assert len(calls) == 2
+
+        metrics = reopened.get_metrics()["call_sites"]["sentiment"]
+        assert metrics["disk_hits"] == 1
+        assert metrics["hit_rate"] == 1.0
+
+    def test_default_path_follows_database(self, tmp_path, monkeypatch):
+        """Without LLM_CACHE_DB the cache lives in the app database, not the working directory"""
+        from module_ii.llm_cache import LLMResponseCache
+        from module_v.database import DatabaseManager
+
+        monkeypatch.delenv("LLM_CACHE_DB", raising=False)
+        monkeypatch.setenv("MILTON_DB_PATH", str(tmp_path / "app.db"))
+        assert LLMResponseCache().db_path == DatabaseManager().db_path == str(tmp_path / "app.db")
+
+        monkeypatch.setenv("LLM_CACHE_DB", str(tmp_path / "cache.db"))
+        assert LLMResponseCache().db_path == str(tmp_path / "cache.db")
+
+    def test_expired_and_unparseable_responses_refetch(self, tmp_path):
+        """Expired entries and responses the parser rejects are not served"""
+        from module_ii.llm_cache import LLMResponseCache
+
+        client_, calls = self._counting_client("not json")
+        request = dict(model="test-model", max_tokens=300, messages=[{"role": "user", "content": "QA"}])
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+
+        for _ in range(2):
+            with pytest.raises(json.JSONDecodeError):
+                cache.complete(client_, call_site="qa", ttl=60, parse=json.loads, **request)
+        assert len(calls) == 2
+
+        cache.complete(client_, call_site="qa", ttl=-1, **request)
+        cache.complete(client_, call_site="qa", ttl=60, **request)
+        assert len(calls) == 4
+        assert cache.purge() == 0  # Expired row was replaced by the fresh one
+
+
+# ============================================================================
+# NEWS TRIAGE TESTS
+# ============================================================================
+
+class TestNewsTriage:
+    """Test concurrent and batched news triage"""
+
+    NEWS = [
+        {"title": f"KSU wins game {i}" if i % 2 else f"KSU practice update {i}",
+         "summary": "Kennesaw State Owls", "link": f"https://ksuowls.com/{i}", "source": "test"}
+        for i in range(12)
+    ]
+
+    @pytest.fixture
+    def monitor(self, tmp_path, monkeypatch):
+        """NewsMonitor with canned feeds, a scripted LLM and an isolated cache"""
+        import re
+        from types import SimpleNamespace
+        from module_ii.llm_cache import LLMResponseCache
+        from module_iv.news_monitor import NewsMonitor
+
+        def score(title):
+            worthy = "wins" in title
+            return {"sentiment": "positive", "priority": 9 if worthy else 2,
+                    "post_worthy": worthy, "reasoning": "test"}
+
+        class ScriptedLLM:
+            def __init__(self):
+                self.prompts = []
+                self.closed = 0
+                self.batch_overrides = {}  # Title -> fields the batch response gets wrong
+
+            async def close(self):
+                self.closed += 1
+
+            async def create_message(self, **kwargs):
+                prompt = kwargs["messages"][0]["content"]
+                self.prompts.append(prompt)
+                await asyncio.sleep(0.1)
+
+                if prompt.startswith("Analyze each"):
+                    titles = re.findall(r"\[(\d+)\] Title: (.*)", prompt)
+                    text = json.dumps({"results": [
+                        {"index": int(i), **score(title), **self.batch_overrides.get(title, {})}
+                        for i, title in titles
+                    ]})
+                elif prompt.startswith("Analyze this"):
+                    text = json.dumps(score(re.search(r"Title: (.*)", prompt).group(1)))
+                else:
+                    text = "What a win for our student-athletes. Let's Go Owls!"
+                return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+        monitor = NewsMonitor(anthropic_api_key="test")
+        monitor.llm = ScriptedLLM()
+        monitor.llm_cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+        async def fetch_news():
+            return list(self.NEWS)
+
+        monkeypatch.setattr(monitor, "fetch_rss_feeds_async", fetch_news)
+        return monitor
+
+    def test_batch_triage(self, monitor):
+        """Batch mode scores items a batch per prompt and reuses results on re-runs"""
+        start = time.time()
+        suggestions = asyncio.run(monitor.monitor_and_suggest_async(min_priority=7, mode="batch"))
+        elapsed = time.time() - start
+
+        assert len(suggestions) == 6
+        assert all(s["priority"] == 9 for s in suggestions)
+        triage_prompts = [p for p in monitor.llm.prompts if p.startswith("Analyze")]
+        assert len(triage_prompts) == 2  # 12 items / TRIAGE_BATCH_SIZE of 10
+        assert elapsed < 0.6  # Triage round-trip + suggestion round-trip, not 18 calls
+
+        # Unchanged items are served from the cache, even in concurrent mode
+        monitor.llm.prompts.clear()
+        asyncio.run(monitor.monitor_and_suggest_async(min_priority=7, mode="concurrent"))
+        assert not [p for p in monitor.llm.prompts if p.startswith("Analyze")]
+
+    def test_malformed_batch_entries(self, monitor):
+        """Batch entries are coerced to the expected types; ones that cannot be fall back to per-item scoring"""
+        import re
+
+        monitor.llm.batch_overrides = {
+            "KSU wins game 1": {"priority": "8"},
+            "KSU wins game 3": {"priority": "high"},
+            "KSU practice update 4": {"post_worthy": "maybe"}
+        }
+        suggestions = asyncio.run(monitor.monitor_and_suggest_async(min_priority=7, mode="batch"))
+
+        assert sorted(s["priority"] for s in suggestions) == [8, 9, 9, 9, 9, 9]
+        single = [p for p in monitor.llm.prompts if p.startswith("Analyze this")]
+        assert sorted(re.search(r"Title: (.*)", p).group(1) for p in single) == ["KSU practice update 4", "KSU wins game 3"]
+
+    def test_concurrent_triage(self, monitor):
+        """Concurrent mode sends one prompt per item, all in parallel"""
+        start = time.time()
+        suggestions = asyncio.run(monitor.monitor_and_suggest_async(min_priority=7, mode="concurrent"))
+        elapsed = time.time() - start
+
+        assert len(suggestions) == 6
+        triage_prompts = [p for p in monitor.llm.prompts if p.startswith("Analyze this")]
+        assert len(triage_prompts) == 12
+        assert elapsed < 0.6
+
+    def test_sync_wrapper_closes_llm_client_per_run(self, monitor):
+        """The blocking wrapper can run repeatedly, closing the loop's LLM client each time"""
+        assert len(monitor.monitor_and_suggest(min_priority=7)) == 6
+        assert len(monitor.monitor_and_suggest(min_priority=7)) == 6
+        assert monitor.llm.closed == 2
+
+    def test_sync_feed_fetch_closes_session(self, monkeypatch):
+        """Each blocking fetch uses and closes its own HTTP session"""
+        from module_iv.news_monitor import NewsMonitor
+
+        monitor = NewsMonitor(anthropic_api_key="test")
+        sessions = []
+
+        async def fetch_feed(source_name, feed_url):
+            sessions.append(monitor._get_session())
+            return []
+
+        monkeypatch.setattr(monitor, "_fetch_feed", fetch_feed)
+        monitor.fetch_rss_feeds()
+        monitor.fetch_rss_feeds()
+
+        assert len({id(session) for session in sessions}) == 2
+        assert all(session.closed for session in sessions)
+
+    def test_feed_conditional_get(self):
+        """Unchanged feeds answer 304 and cached items are reused"""
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+        from module_iv.news_monitor import NewsMonitor
+
+        rss = """<?xml version="1.0"?><rss version="2.0"><channel><title>KSU</title>
+            <item><title>Kennesaw State Owls win opener</title><link>https://ksuowls.com/1</link>
+            <description>KSU victory</description></item>
+            <item><title>Unrelated headline</title><link>https://example.com/2</link></item>
+            </channel></rss>"""
+        statuses = []
+        upstream = {"fail": False}
+
+        async def feed(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                statuses.append(304)
+                return web.Response(status=304)
+            if upstream["fail"]:
+                statuses.append(500)
+                return web.Response(status=500)
+            statuses.append(200)
+            return web.Response(text=rss, content_type="application/rss+xml", headers={"ETag": '"v1"'})
+
+        async def scenario():
+            web_app = web.Application()
+            web_app.router.add_get("/rss", feed)
+            server = TestServer(web_app)
+            await server.start_server()
+
+            monitor = NewsMonitor(anthropic_api_key="test")
+            monitor.news_sources = {"local": str(server.make_url("/rss"))}
+            monitor.FEED_MIN_REFRESH_SECONDS = 0
+
+            first = await monitor.fetch_rss_feeds_async()
+            second = await monitor.fetch_rss_feeds_async()
+
+            # Upstream failure serves the last good items
+            upstream["fail"] = True
+            monitor._feed_cache["local"]["etag"] = None
+            third = await monitor.fetch_rss_feeds_async()
+
+            await monitor.close()
+            await server.close()
+            return first, second, third
+
+        first, second, third = asyncio.run(scenario())
+
+        assert [item["title"] for item in first] == ["Kennesaw State Owls win opener"]
+        assert second == first
+        assert third == first
+        assert statuses == [200, 304, 500]
+
+
+# ============================================================================
+# KEYWORD MATCHING TESTS
+# ============================================================================
+
+class TestKeywordMatcher:
+    """Test the shared compiled keyword matcher"""
+
+    def test_category_counts_in_one_pass(self):
+        """Counts respect word boundaries, phrases and overlapping keywords"""
+        from module_ii.keyword_matcher import KeywordMatcher
+
+        matcher = KeywordMatcher({
+            "ai": ["ai", "artificial intelligence"],
+            "ksu": ["kennesaw", "kennesaw state", "state"],
+            "empty": ["reform"]
+        })
+        text = "AI said: Artificial\nIntelligence at Kennesaw State. Go KENNESAW!"
+
+        assert matcher.count(text) == {"ai": 2, "ksu": 4, "empty": 0}
+        assert matcher.distinct(text)["ksu"] == {"kennesaw", "kennesaw state", "state"}
+        assert matcher.matches_any("Owls said hello") is False
+
+    def test_call_sites_use_word_boundaries(self):
+        """Relevance call sites no longer match keywords inside other words"""
+        from module_iv.news_monitor import NewsMonitor
+        from module_ii.quality_assurance import QualityAssurance
+
+        monitor = NewsMonitor(anthropic_api_key="test")
+        assert monitor._is_ksu_related({"title": "Owls win opener", "summary": ""})
+        assert not monitor._is_ksu_related({"title": "Super Bowls recap", "summary": ""})
+
+        qa = QualityAssurance(anthropic_api_key="test", db_url="")
+        result = qa.check_brand_alignment("Our leadership team is excited to announce a new plan", "linkedin")
+        assert result["aligned_pillars"] == ["Leadership"]
+        assert "Contains generic corporate speak" in result["concerns"]
+
+
+# ============================================================================
+# NEAR-DUPLICATE DETECTION TESTS
+# ============================================================================
+
+class TestNearDuplicates:
+    """Test URL canonicalization and the MinHash/LSH article index"""
+
+    ORIGINAL = (
+        "The NCAA Division III Management Council approved new legislation on Tuesday "
+        "that allows athletes to benefit from name image and likeness deals, a change that "
+        "athletic directors say will reshape recruiting at small colleges across the country."
+    )
+    SYNDICATED = (
+        "NCAA Division III Management Council approved new legislation Tuesday that allows "
+        "athletes to benefit from name, image and likeness deals, a change athletic directors "
+        "say will reshape recruiting at small colleges nationwide. (D3Ticker)"
+    )
+
+    def test_canonicalize_url(self):
+        """Tracking parameters, hosts, ports and AMP variants collapse to one URL"""
+        from module_ii.near_duplicates import canonicalize_url
+
+        canonical = "https://ncaa.org/news/story?a=1&b=2"
+        assert canonicalize_url("http://WWW.ncaa.org:80/news//story/amp/?b=2&utm_source=rss&a=1#top") == canonical
+        assert canonicalize_url("https://m.ncaa.org/news/story?a=1&b=2&fbclid=xyz") == canonical
+        assert canonicalize_url("https://ncaa.org:8443/news") == "https://ncaa.org:8443/news"
+        assert canonicalize_url("  not a url ") == "not a url"
+
+    def test_syndicated_copy_matches_cluster(self):
+        """Edited copies and re-fetched URLs match; unrelated stories and expired entries do not"""
+        from module_ii.near_duplicates import NearDuplicateIndex
+
+        index = NearDuplicateIndex(window_seconds=3600)
+        index.add(1, text=self.ORIGINAL, url="https://www.ncaa.org/news/d3-nil?utm_source=rss", added_at=1000)
+
+        match = index.find(text=self.SYNDICATED, now=1000)
+        assert match.key == 1 and not match.exact_url and match.similarity >= index.threshold
+
+        assert index.find(text="unrelated", url="http://ncaa.org/news/d3-nil/", now=1000).exact_url
+        assert index.find(text="OpenAI ships a faster model for enterprise analytics workloads", now=1000) is None
+
+        assert index.find(text=self.SYNDICATED, now=1000 + 7200) is None
+        assert len(index) == 0
+
+    def test_expire_stops_at_first_entry_in_window(self):
+        """Expiry drops only the oldest entries and leaves newer ones indexed"""
+        from module_ii.near_duplicates import NearDuplicateIndex
+
+        index = NearDuplicateIndex(window_seconds=100)
+        for i in range(5):
+            index.add(i, url=f"https://ksuowls.com/story-{i}", added_at=1000 + 50 * i)
+
+        assert index.expire(now=1160) == 2  # added at 1000 and 1050
+        assert len(index) == 3
+        assert index.find(url="https://ksuowls.com/story-1", now=1160) is None
+        assert index.find(url="https://ksuowls.com/story-2", now=1160).key == 2
+
+
+# ============================================================================
+# POLL SCHEDULER TESTS
+# ============================================================================
+
+class TestPollScheduler:
+    """Test adaptive per-source polling"""
+
+    def test_interval_adapts_and_backs_off(self):
+        """Busy sources converge to the minimum, quiet ones to the maximum; errors double"""
+        from module_ii.poll_scheduler import PollScheduler
+
+        scheduler = PollScheduler(min_interval=300, max_interval=21600, jitter=0, clock=lambda: 0)
+        scheduler.add_source("techcrunch_ai", "techcrunch.com", interval=1800)
+        scheduler.add_source("chronicle", "chronicle.com", interval=1800)
+        assert scheduler.pop_due(now=0) == ["techcrunch_ai", "chronicle"]
+
+        now = 0
+        for _ in range(4):
+            now += 1800
+            assert scheduler.record_success("chronicle", None if now == 1800 else 0, now=now) > 0
+        assert scheduler.sources["chronicle"].interval == 21600
+
+        scheduler.record_success("techcrunch_ai", None, now=0)
+        assert scheduler.record_success("techcrunch_ai", 12, now=1800) == 300
+        assert scheduler.seconds_until_next(now=1800) == 300
+
+        assert [scheduler.record_failure("techcrunch_ai", now=2100) for _ in range(3)] == [300, 600, 1200]
+        assert scheduler.record_success("techcrunch_ai", 6, now=3300) == 300
+        assert scheduler.get_stats()["techcrunch_ai"]["consecutive_failures"] == 0
+
+    def test_run_caps_concurrency_per_host(self):
+        """Due sources run concurrently, but never more than per_host_limit per host"""
+        from module_ii.poll_scheduler import PollScheduler
+
+        scheduler = PollScheduler(min_interval=0.05, max_interval=0.05, per_host_limit=1)
+        for name in ["ncaa_a", "ncaa_b", "ncaa_c"]:
+            scheduler.add_source(name, "ncaa.org")
+        scheduler.add_source("d3ticker", "d3ticker.com")
+
+        active = {"ncaa.org": 0, "d3ticker.com": 0}
+        peak = {"ncaa.org": 0, "d3ticker.com": 0}
+        polls = []
+
+        async def poll(name):
+            host = scheduler.sources[name].host
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+            polls.append(name)
+            if name == "ncaa_c":
+                raise RuntimeError("HTTP 503")
+            return 1
+
+        async def run():
+            stop = asyncio.Event()
+            asyncio.get_running_loop().call_later(0.2, stop.set)
+            await scheduler.run(poll, stop=stop)
+
+        asyncio.run(run())
+        assert peak == {"ncaa.org": 1, "d3ticker.com": 1}
+        assert polls.count("d3ticker") >= 2 and "ncaa_c" in polls
+        assert scheduler.get_stats()["ncaa_c"]["errors"] >= 1
+
+
+# ============================================================================
+# ARTICLE INGESTION TESTS
+# ============================================================================
+
+class TestArticleIngestion:
+    """Test batched, idempotent article ingestion on the SQLite stand-in"""
+
+    @staticmethod
+    def _record(url: str, relevance: float = 0.8) -> Dict[str, Any]:
+        return {
+            "title": f"Story {url}", "url": url, "source": "ncaa",
+            "published_date": datetime(2026, 10, 1, 12, 0), "content": "Division III news",
+            "categories": ["news"], "relevance_score": relevance, "key_entities": ["Division III"],
+            "suggested_angle": "Executive perspective", "urgency": "today",
+            "pillar_alignment": ["Leadership & Vision"]
+        }
+
+    def test_ingest_inserts_only_new_urls(self, tmp_path):
+        """Re-ingesting a batch inserts nothing; opportunities exist only for inserted rows"""
+        import sqlite3
+        from module_v.article_store import create_article_store
+
+        store = create_article_store(f"sqlite:///{tmp_path / 'articles.db'}")
+
+        async def run():
+            await store.initialize()
+            first = await store.ingest([self._record("https://a"), self._record("https://b"),
+                                        self._record("https://a", relevance=0.9)])
+            second = await store.ingest([self._record("https://b"), self._record("https://c")])
+            await store.merge_duplicates([(first["https://a"], "https://d3ticker.com/a", "d3ticker", 0.95)] * 2)
+            recent = await store.recent_articles(days=1)
+            return first, second, recent
+
+        first, second, recent = asyncio.run(run())
+        assert set(first) == {"https://a", "https://b"}
+        assert set(second) == {"https://c"}
+        assert [row["url"] for row in recent] == ["https://a", "https://b", "https://c"]
+
+        conn = sqlite3.connect(tmp_path / "articles.db")
+        opportunities = conn.execute("SELECT article_id FROM content_opportunities ORDER BY article_id").fetchall()
+        assert [row[0] for row in opportunities] == sorted([*first.values(), *second.values()])
+
+        urls, sources, relevance = conn.execute(
+            "SELECT duplicate_urls, duplicate_sources, relevance_score FROM news_articles WHERE url = 'https://a'"
+        ).fetchone()
+        assert json.loads(urls) == ["https://d3ticker.com/a"]
+        assert json.loads(sources) == ["d3ticker"]
+        assert relevance == 0.95
+        conn.close()
+
+    def test_original_url_stored_canonical_url_deduplicates(self, tmp_path):
+        """The published URL is stored; its canonical form is the conflict key"""
+        import sqlite3
+        from module_v.article_store import create_article_store
+
+        store = create_article_store(f"sqlite:///{tmp_path / 'articles.db'}")
+        original = "https://www.ncaa.org/news/d3-nil?utm_source=rss"
+        canonical = "https://ncaa.org/news/d3-nil"
+
+        async def run():
+            await store.initialize()
+            first = await store.ingest([{**self._record(original), "canonical_url": canonical}])
+            second = await store.ingest([{**self._record("http://ncaa.org/news/d3-nil/"), "canonical_url": canonical}])
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert list(first) == [canonical]
+        assert second == {}
+
+        conn = sqlite3.connect(tmp_path / "articles.db")
+        assert conn.execute("SELECT url, canonical_url FROM news_articles").fetchall() == [(original, canonical)]
+        conn.close()
+
+    def test_search_ranks_with_bm25(self, tmp_path):
+        """Full-text search ranks by BM25, stays current on update and skips processed rows"""
+        import sqlite3
+        from module_v.article_store import create_article_store
+
+        db_path = tmp_path / "articles.db"
+        records = [
+            {**self._record("https://nil"), "title": "NIL collectives reshape Division III recruiting",
+             "content": "Donor collectives and NIL deals", "relevance_score": 0.6},
+            {**self._record("https://ai"), "title": "AI analytics in athletics",
+             "content": "Athletic departments adopt donor analytics; NIL mentioned once", "relevance_score": 0.9},
+            {**self._record("https://other"), "title": "Football schedule released",
+             "content": "Season opener set", "relevance_score": 1.0},
+        ]
+        store = create_article_store(f"sqlite:///{db_path}")
+
+        async def run():
+            await store.initialize()
+            ids = await store.ingest(records)
+            ranked = await store.search(["nil", "collectives"], limit=5)
+
+            conn = sqlite3.connect(db_path)
+            with conn:
+                conn.execute("UPDATE news_articles SET content = 'Collectives everywhere' WHERE url = 'https://other'")
+                conn.execute("UPDATE news_articles SET processed = 1 WHERE url = 'https://nil'")
+            conn.close()
+
+            return ids, ranked, await store.search(["collectives"]), await store.search([], limit=1)
+
+        ids, ranked, updated, fallback = asyncio.run(run())
+        assert [row["url"] for row in ranked] == ["https://nil", "https://ai"]
+        assert ranked[0]["categories"] == ["news"]
+        assert [row["url"] for row in updated] == ["https://other"]
+        assert [row["article_id"] for row in fallback] == [ids["https://other"]]
+
+
+# ============================================================================
+# VECTOR SIMILARITY TESTS
+# ============================================================================
+
+class TestVectorIndex:
+    """Test the memory-mapped similarity index over posts and articles"""
+
+    def test_posts_indexed_incrementally(self, tmp_path):
+        """create/update/delete_post keep the index current, and it survives a reopen"""
+        from module_v.database import DatabaseManager
+        from module_v.vector_index import VectorIndex
+
+        db = DatabaseManager(str(tmp_path / "posts.db"))
+        nil_post = db.create_post("NIL collectives are reshaping Division III recruiting", "personal", "NIL")
+        ai_post = db.create_post("Our AI donor analytics platform boosted annual giving", "professional", "AI")
+        db.vector_index.add("article", 7, "Division III programs weigh NIL collectives for recruiting")
+
+        results = db.vector_index.search("How NIL collectives change recruiting", k=5)
+        assert [(r["kind"], r["id"]) for r in results[:2]] == [("post", nil_post), ("article", 7)]
+        assert db.vector_index.search("donor analytics giving", k=1, kind="post")[0]["id"] == ai_post
+
+        db.update_post(nil_post, content="Volleyball wins the conference title")
+        db.delete_post(ai_post)
+        assert db.vector_index.search("donor analytics giving", kind="post") == []
+
+        reopened = VectorIndex(str(tmp_path / "posts.vectors"), initial_capacity=1)
+        assert reopened.get_stats()["kinds"] == {"post": 1, "article": 1}
+        assert reopened.search("volleyball conference title", k=1)[0]["id"] == nil_post
+
+    def test_existing_posts_backfilled_and_reindexed_on_scenario_change(self, tmp_path):
+        """Posts stored before the index existed are indexed on first open; scenario/context edits re-index"""
+        from module_v.database import DatabaseManager
+
+        db = DatabaseManager(str(tmp_path / "legacy.db"))
+        conn = db._get_connection()
+        conn.execute(
+            "INSERT INTO posts (content, voice_type, scenario, context) VALUES (?, ?, ?, ?)",
+            ("Huge crowd at the home opener", "personal", "Volleyball", "Conference play begins")
+        )
+        conn.commit()
+        post_id = conn.execute("SELECT id FROM posts").fetchone()[0]
+
+        assert db.vector_index.search("home opener crowd", k=1, kind="post")[0]["id"] == post_id
+
+        db.update_post(post_id, scenario="Fundraising", context="Alumni giving campaign")
+        assert db.vector_index.search("alumni giving campaign", k=1, kind="post")[0]["id"] == post_id
+        assert db.vector_index.search("conference play volleyball", kind="post") == []
+
+        conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+        conn.commit()
+        assert db.rebuild_vector_index() == 0
+        assert db.vector_index.ids("post") == []
+
+    def test_compaction_reclaims_dead_rows(self, tmp_path):
+        """Replaced and removed rows are dropped from the matrix and keys.jsonl, manually and automatically"""
+        from module_v.vector_index import VectorIndex
+
+        path = tmp_path / "compact.vectors"
+        index = VectorIndex(str(path), initial_capacity=4)
+        topics = ["volleyball", "donors", "recruiting", "tuition", "athletics", "alumni", "campus", "nil"]
+        index.add_many(("post", i, f"{topic} news item {i}") for i, topic in enumerate(topics))
+        index.add_many(("post", i, f"{topics[i]} revised story") for i in range(3))
+        index.remove("post", 7)
+        assert index.get_stats()["rows"] == 11
+
+        assert index.compact() == 4
+        assert index.get_stats()["rows"] == len(index) == 7
+        assert index.search("donors revised story", k=1)[0]["id"] == 1
+        assert not (path / "vectors.f32").exists() and not (path / "keys.jsonl").exists()
+
+        reopened = VectorIndex(str(path), initial_capacity=4)
+        assert sorted(reopened.ids("post")) == list(range(7))
+        assert reopened.search("campus news item", k=1)[0]["id"] == 6
+
+        reopened.COMPACT_MIN_DEAD_ROWS = 2
+        for i in range(5):
+            reopened.remove("post", i)
+        stats = reopened.get_stats()
+        assert stats["items"] == 2 and stats["rows"] < 7
+        assert sorted(reopened.ids("post")) == [5, 6]
+        assert reopened.search("campus news item", k=1)[0]["id"] == 6
+        assert len(list(path.glob("keys*.jsonl"))) == 1
+
+    def test_writers_sharing_a_directory(self, tmp_path):
+        """Separate index instances (as in separate processes) append, remove and compact without clobbering rows"""
+        import threading
+        from module_v.vector_index import VectorIndex
+
+        path = str(tmp_path / "shared.vectors")
+        posts, articles = VectorIndex(path), VectorIndex(path)
+        posts.add("post", 1, "Volleyball wins the conference title")
+        articles.add("article", 10, "Donor gift funds the new basketball arena")
+
+        assert [(r["kind"], r["id"]) for r in posts.search("donor gift arena", k=1)] == [("article", 10)]
+        reopened = VectorIndex(path)
+        assert [(r["kind"], r["id"]) for r in reopened.search("donor gift funds arena", k=1)] == [("article", 10)]
+        assert [(r["kind"], r["id"]) for r in reopened.search("volleyball conference title", k=1)] == [("post", 1)]
+
+        def write(index, kind):
+            for i in range(100):
+                index.add(kind, i, f"{kind} story number{i} about topic{i}")
+
+        threads = [threading.Thread(target=write, args=(index, kind)) for index, kind in ((posts, "post"), (articles, "article"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # One instance compacts while the other still has the old files mapped
+        for i in range(90):
+            articles.remove("post", i)
+        assert articles.compact() > 0
+        posts.add("post", 500, "Swim team sets a school record")
+
+        reopened = VectorIndex(path)
+        assert reopened.get_stats()["kinds"] == {"post": 11, "article": 100}
+        for kind, i in (("post", 95), ("article", 3), ("article", 99)):
+            top = reopened.search(f"{kind} story number{i} about topic{i}", k=1)[0]
+            assert (top["kind"], top["id"]) == (kind, i)
+        assert posts.search("swim school record", k=1)[0]["id"] == 500
+        assert articles.search("swim school record", k=1)[0]["id"] == 500
+
+    def test_posts_and_articles_share_the_default_index(self, tmp_path, monkeypatch):
+        """The default index sits next to MILTON_DB_PATH, where DatabaseManager indexes posts"""
+        from module_v.database import DatabaseManager
+        from module_v.vector_index import get_vector_index
+
+        monkeypatch.setenv("MILTON_DB_PATH", str(tmp_path / "app.db"))
+        db = DatabaseManager()
+        post_id = db.create_post("Softball clinches the ASUN regular season", "personal", "Softball")
+        get_vector_index().add("article", 3, "Owls softball clinches ASUN title")
+
+        assert get_vector_index() is db.vector_index
+        assert get_vector_index().path == tmp_path / "app.vectors"
+        found = {(r["kind"], r["id"]) for r in db.vector_index.search("softball clinches ASUN", k=5)}
+        assert found == {("post", post_id), ("article", 3)}
+
+    def test_similar_endpoint(self):
+        """The dashboard returns similar posts with their content"""
+        from dashboard.app import db
+
+        post_id = db.db.create_post("Kennesaw State owls celebrate a record donor season", "personal", "Donors")
+        try:
+            response = client.get("/api/similar", params={"text": "record donor season owls", "kind": "post"})
+            assert response.status_code == 200
+            top = response.json()["results"][0]
+            assert top["id"] == post_id and top["post"]["id"] == post_id
+
+            assert client.get("/api/similar", params={"text": "  "}).status_code == 400
+        finally:
+            db.db.delete_post(post_id)
+
+
+# ============================================================================
+# SCHEDULER DAEMON TESTS
+# ============================================================================
+
+class TestSchedulerDaemon:
+    """Test concurrent publishing of due posts"""
+
+    class SlowPublisher:
+        """Publisher double with fixed latency that records peak concurrency per platform"""
+
+        def __init__(self, latency: float = 0.05):
+            self.latency = latency
+            self.active = {}
+            self.peak = {}
+            self.closed = False
+
+        async def _publish(self, platform: str, content: str) -> Dict[str, Any]:
+            self.active[platform] = self.active.get(platform, 0) + 1
+            self.peak[platform] = max(self.peak.get(platform, 0), self.active[platform])
+            await asyncio.sleep(self.latency)
+            self.active[platform] -= 1
+            if "fail" in content:
+                return {"success": False, "error": "rejected"}
+            return {"success": True, "url": f"https://{platform}.example/{abs(hash(content))}"}
+
+        async def publish_to_linkedin(self, content, media_url=None, media_title=None, media_description=None):
+            return await self._publish("linkedin", content)
+
+        async def publish_to_twitter(self, content, media_ids=None):
+            return await self._publish("twitter", content)
+
+        async def publish_to_instagram(self, caption, image_url):
+            return await self._publish("instagram", caption)
+
+        async def close(self):
+            self.closed = True
+
+    def test_burst_published_concurrently_within_caps(self, tmp_path):
+        """A burst of due posts finishes in a few latency rounds, not one per post"""
+        from module_v.database import DatabaseManager
+        from scheduler_daemon import SchedulerDaemon
+
+        db = DatabaseManager(str(tmp_path / "schedule.db"))
+        due = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
+        platforms = ["linkedin", "twitter", "instagram"]
+        for i in range(48):
+            content = f"Scheduled update {i}" + (" fail" if i == 0 else "")
+            db.schedule_post(db.create_post(content, "personal", "Burst"), platforms[i % 3], due)
+
+        publisher = self.SlowPublisher()
+        daemon = SchedulerDaemon(
+            check_interval=3600,
+            platform_concurrency={"linkedin": 4, "twitter": 4, "instagram": 2},
+            db=db,
+            publisher=publisher
+        )
+
+        async def run_once():
+            task = asyncio.create_task(daemon.run())
+            while db.get_pending_schedule_times():
+                await asyncio.sleep(0.01)
+            daemon.stop()
+            await task
+
+        started = time.perf_counter()
+        asyncio.run(run_once())
+        elapsed = time.perf_counter() - started
+
+        # 16 posts per platform; instagram's cap of 2 needs 8 rounds, far below 48 sequential
+        assert elapsed < 48 * publisher.latency / 2
+        assert publisher.peak == {"linkedin": 4, "twitter": 4, "instagram": 2}
+        assert publisher.closed
+
+        schedules = db.get_all_scheduled_posts()
+        assert sum(s["status"] == "published" for s in schedules) == 47
+        assert [s["status"] for s in schedules if s["status"] != "published"] == ["dead_letter"]
+        assert not daemon.running
+
+    def test_wakes_for_new_and_cancelled_schedules(self, tmp_path):
+        """Posts scheduled while the daemon sleeps go out on time; cancelled ones never do"""
+        from module_v.database import DatabaseManager
+        from scheduler_daemon import SchedulerDaemon
+
+        db = DatabaseManager(str(tmp_path / "wakeup.db"))
+        keep = db.create_post("Goes out on time", "personal", "Wakeup")
+        drop = db.create_post("Cancelled before it is due", "personal", "Wakeup")
+        publisher = self.SlowPublisher(latency=0)
+        daemon = SchedulerDaemon(check_interval=3600, watch_interval=0.1, db=db, publisher=publisher)
+
+        checks = []
+        check_and_publish = daemon._check_and_publish
+
+        async def counted_check():
+            checks.append(time.time())
+            await check_and_publish()
+
+        daemon._check_and_publish = counted_check
+
+        async def scenario():
+            task = asyncio.create_task(daemon.run())
+            await asyncio.sleep(0.3)
+
+            # Written from other threads, the way the dashboard's endpoints would
+            due_at = datetime.utcnow() + timedelta(seconds=0.5)
+            await asyncio.to_thread(db.schedule_post, keep, "linkedin", due_at)
+            dropped = await asyncio.to_thread(db.schedule_post, drop, "twitter", due_at)
+            await asyncio.to_thread(db.cancel_scheduled_post, dropped)
+
+            while db.get_all_scheduled_posts(status="pending"):
+                await asyncio.sleep(0.02)
+            daemon.stop()
+            await task
+            return due_at
+
+        due_at = asyncio.run(scenario())
+
+        published = db.get_all_scheduled_posts(status="published")
+        assert [s["post_id"] for s in published] == [keep]
+        lateness = (datetime.fromisoformat(published[0]["published_at"]) - due_at).total_seconds()
+        assert 0 <= lateness < 1
+        assert publisher.peak == {"linkedin": 1}
+
+        # One check at startup, one when the post came due; none while idle
+        assert len(checks) == 2
+
+    def test_leases_are_exclusive_and_reclaimed(self, tmp_path):
+        """A claim excludes other workers until its lease expires; only the holder may finish it"""
+        from module_v.database import DatabaseManager
+
+        db = DatabaseManager(str(tmp_path / "leases.db"))
+        other = DatabaseManager(str(tmp_path / "leases.db"))
+        due = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+        first = db.schedule_post(db.create_post("First", "personal", "Lease"), "linkedin", due)
+        second = db.schedule_post(db.create_post("Second", "personal", "Lease"), "twitter", due)
+
+        assert [p["id"] for p in db.claim_due_scheduled_posts("a", lease_seconds=60, limit=1)] == [first]
+        assert [p["id"] for p in other.claim_due_scheduled_posts("b", lease_seconds=-1)] == [second]
+
+        # b's lease has already expired, so a reclaims it and b can no longer finish it
+        assert [p["id"] for p in db.claim_due_scheduled_posts("a")] == [second]
+        assert other.claim_due_scheduled_posts("c") == []
+        assert not other.mark_scheduled_post_published(second, worker_id="b")
+        assert not other.renew_scheduled_post_lease(second, "b")
+        assert db.mark_scheduled_post_published(second, worker_id="a")
+        assert db.mark_scheduled_post_failed(first, "rejected", worker_id="a")
+
+        statuses = {s["id"]: s["status"] for s in db.get_all_scheduled_posts()}
+        assert statuses == {first: "failed", second: "published"}
+
+    def test_two_daemons_never_double_publish(self, tmp_path):
+        """Daemons sharing a database split the due posts between them"""
+        from module_v.database import DatabaseManager
+        from scheduler_daemon import SchedulerDaemon
+
+        path = str(tmp_path / "shared.db")
+        db = DatabaseManager(path)
+        due = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+        for i in range(30):
+            db.schedule_post(db.create_post(f"Shared post {i}", "personal", "Lease"), "twitter", due)
+
+        class CountingPublisher(self.SlowPublisher):
+            published = []
+
+            async def _publish(self, platform, content):
+                self.published.append(content)
+                return await super()._publish(platform, content)
+
+        daemons = [
+            SchedulerDaemon(
+                check_interval=3600, worker_id=f"worker-{n}",
+                db=DatabaseManager(path), publisher=CountingPublisher(latency=0.02)
+            )
+            for n in range(2)
+        ]
+
+        async def run_both():
+            tasks = [asyncio.create_task(daemon.run()) for daemon in daemons]
+            while db.get_pending_schedule_times():
+                await asyncio.sleep(0.01)
+            for daemon in daemons:
+                daemon.stop()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run_both())
+
+        assert sorted(CountingPublisher.published) == sorted(f"Shared post {i}" for i in range(30))
+        assert {s["status"] for s in db.get_all_scheduled_posts()} == {"published"}
+
+    def test_retries_with_backoff_then_dead_letters(self, tmp_path):
+        """Transient failures retry with growing delays; permanent ones and exhausted posts dead-letter"""
+        from module_v.database import DatabaseManager
+        from scheduler_daemon import SchedulerDaemon
+
+        db = DatabaseManager(str(tmp_path / "retries.db"))
+        due = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+        flaky = db.schedule_post(db.create_post("flaky", "personal", "Retry"), "linkedin", due)
+        down = db.schedule_post(db.create_post("down", "personal", "Retry"), "linkedin", due)
+        revoked = db.schedule_post(db.create_post("revoked", "personal", "Retry"), "linkedin", due)
+
+        attempts = {}
+
+        class FlakyPublisher(self.SlowPublisher):
+            async def publish_to_linkedin(self, content, media_url=None, media_title=None, media_description=None):
+                attempts.setdefault(content, []).append(time.time())
+                if content == "flaky" and len(attempts[content]) < 3:
+                    return {"success": False, "error": "HTTP 503: busy", "status_code": 503}
+                if content == "down":
+                    return {"success": False, "error": "timed out", "retryable": True}
+                if content == "revoked":
+                    return {"success": False, "error": "HTTP 401: token revoked", "status_code": 401}
+                return {"success": True, "url": "https://linkedin.example/flaky"}
+
+        daemon = SchedulerDaemon(
+            check_interval=3600, watch_interval=0.05, max_attempts=3,
+            retry_base_delay=0.2, db=db, publisher=FlakyPublisher()
+        )
+
+        async def run_until_settled():
+            task = asyncio.create_task(daemon.run())
+            while db.get_pending_schedule_times():
+                await asyncio.sleep(0.02)
+            daemon.stop()
+            await task
+
+        asyncio.run(run_until_settled())
+
+        rows = {s["id"]: s for s in db.get_all_scheduled_posts()}
+        assert (rows[flaky]["status"], rows[flaky]["attempts"]) == ("published", 3)
+        assert (rows[down]["status"], rows[down]["attempts"]) == ("dead_letter", 3)
+        assert (rows[revoked]["status"], rows[revoked]["attempts"]) == ("dead_letter", 1)
+        assert rows[down]["error_message"] == "timed out"
+
+        # Backoff doubles (0.2s then 0.4s, +/-20% jitter)
+        first_gap, second_gap = [b - a for a, b in zip(attempts["flaky"], attempts["flaky"][1:])]
+        assert 0.15 < first_gap < 0.4 and 0.3 < second_gap < 0.7
+
+        assert db.requeue_dead_letter_posts([revoked]) == 1
+        assert db.requeue_dead_letter_posts() == 1
+        requeued = {s["id"]: s for s in db.get_all_scheduled_posts(status="pending")}
+        assert set(requeued) == {down, revoked} and requeued[down]["attempts"] == 0
+
+    def test_bookkeeping_error_after_publish_is_not_retried(self, tmp_path, monkeypatch):
+        """A database error after a successful publish never sends the post back for another attempt"""
+        import sqlite3
+        from module_v.database import DatabaseManager
+        from scheduler_daemon import SchedulerDaemon
+
+        db = DatabaseManager(str(tmp_path / "bookkeeping.db"))
+        due = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+        schedule_id = db.schedule_post(db.create_post("live", "personal", "Retry"), "linkedin", due)
+
+        def locked(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        mark_scheduled = db.mark_scheduled_post_published
+        marks = []
+
+        def locked_once(*args, **kwargs):
+            marks.append(args)
+            if len(marks) == 1:
+                locked()
+            return mark_scheduled(*args, **kwargs)
+
+        monkeypatch.setattr(db, "mark_scheduled_post_published", locked_once)
+        monkeypatch.setattr(db, "mark_post_published", locked)
+        publishes = []
+
+        class CountingPublisher(self.SlowPublisher):
+            async def publish_to_linkedin(self, content, media_url=None, media_title=None, media_description=None):
+                publishes.append(content)
+                return {"success": True, "url": "https://linkedin.example/live"}
+
+        daemon = SchedulerDaemon(
+            check_interval=3600, watch_interval=0.05, retry_base_delay=0.05,
+            db=db, publisher=CountingPublisher()
+        )
+
+        async def run_briefly():
+            task = asyncio.create_task(daemon.run())
+            await asyncio.sleep(1.0)
+            daemon.stop()
+            await task
+
+        asyncio.run(run_briefly())
+
+        assert publishes == ["live"]
+        assert len(marks) == 2
+        assert {s["id"]: s["status"] for s in db.get_all_scheduled_posts()} == {schedule_id: "published"}
+
+    def test_dead_letter_endpoints(self):
+        """The dashboard lists dead-lettered posts and requeues them"""
+        from dashboard.app import db
+
+        post_id = db.db.create_post("Dead-letter endpoint check", "personal", "Retry")
+        schedule_id = db.db.schedule_post(post_id, "linkedin", datetime.utcnow() + timedelta(days=30))
+        try:
+            db.db.dead_letter_scheduled_post(schedule_id, "HTTP 401: token revoked")
+
+            listed = client.get("/api/scheduled/dead-letter").json()
+            assert schedule_id in [s["id"] for s in listed["dead_letter"]]
+            assert client.get("/api/scheduler/status").json()["dead_letter_schedules"] >= 1
+
+            response = client.post("/api/scheduled/dead-letter/requeue", json={"schedule_ids": [schedule_id]})
+            assert response.json() == {"success": True, "requeued": 1}
+            assert client.post("/api/scheduled/dead-letter/requeue", json={"schedule_ids": 5}).status_code == 400
+        finally:
+            db.db.cancel_scheduled_post(schedule_id)
+            db.db.delete_post(post_id)
+
+
+# ============================================================================
+# CONTENT SCHEDULER TESTS
+# ============================================================================
+
+class TestContentScheduler:
+    """Test the database-backed module_iv ContentScheduler"""
+
+    def test_schedule_survives_restart_in_time_order(self, tmp_path):
+        """Posts persist, come back sorted, and cancel/reschedule update the store"""
+        from module_v.database import DatabaseManager
+        from module_iv.content_scheduler import ContentScheduler
+
+        path = str(tmp_path / "content.db")
+        publisher = TestSchedulerDaemon.SlowPublisher(latency=0)
+        scheduler = ContentScheduler(db=DatabaseManager(path), publisher=publisher)
+
+        base = datetime.now().replace(microsecond=0) + timedelta(days=1)
+        later = scheduler.schedule_post("Later", ["linkedin"], base + timedelta(hours=5))
+        first = scheduler.schedule_post("First", ["linkedin", "twitter"], base, {"media_url": "https://x/img.png"})
+        dropped = scheduler.schedule_post("Dropped", ["twitter"], base + timedelta(hours=2))
+        moved = scheduler.schedule_post("Moved", ["linkedin"], base + timedelta(hours=1))
+
+        assert first["id"] != later["id"]
+        assert scheduler.cancel_scheduled_post(dropped["id"])
+        assert scheduler.reschedule_post(moved["id"], base + timedelta(hours=9))
+        assert not scheduler.cancel_scheduled_post(999999)
+
+        restarted = ContentScheduler(db=DatabaseManager(path), publisher=publisher)
+        scheduled = restarted.get_scheduled_posts(status="scheduled")
+        assert [p["content"] for p in scheduled] == ["First", "Later", "Moved"]
+        assert scheduled[0]["platforms"] == ["linkedin", "twitter"]
+        assert scheduled[0]["metadata"] == {"media_url": "https://x/img.png"}
+        assert scheduled[0]["scheduled_time"] == base.isoformat()
+        assert [p["content"] for p in restarted.get_scheduled_posts(platform="twitter")] == ["First", "Dropped"]
+        assert restarted.get_scheduled_posts(status="cancelled")[0]["id"] == dropped["id"]
+        assert restarted.get_schedule_summary(days=2)["by_platform"] == {"linkedin": 3, "twitter": 1}
+        assert restarted.get_due_posts() == []
+        assert [p["content"] for p in restarted.get_due_posts(base + timedelta(hours=5))] == ["First", "Later"]
+
+    def test_due_posts_publish_platforms_concurrently(self, tmp_path):
+        """Each due post's platforms publish in parallel, and rows are marked in the shared table"""
+        from module_v.database import DatabaseManager
+        from module_iv.content_scheduler import ContentScheduler
+
+        db = DatabaseManager(str(tmp_path / "due.db"))
+        publisher = TestSchedulerDaemon.SlowPublisher(latency=0.1)
+        scheduler = ContentScheduler(db=db, publisher=publisher)
+
+        past = datetime.now() - timedelta(minutes=1)
+        post = scheduler.schedule_post(
+            "Three platforms at once", ["linkedin", "twitter", "instagram"], past,
+            {"media_url": "https://x/img.png"}
+        )
+        scheduler.schedule_post("Not yet", ["linkedin"], datetime.now() + timedelta(hours=1))
+
+        started = time.perf_counter()
+        results = asyncio.run(scheduler.check_and_publish_due_posts())
+        elapsed = time.perf_counter() - started
+
+        assert [r["post_id"] for r in results] == [post["id"]]
+        assert all(r["success"] for r in results[0]["platforms"].values())
+        assert elapsed < 0.25  # One latency, not three
+
+        rows = sorted((s["content"], s["platform"], s["status"]) for s in db.get_all_scheduled_posts())
+        assert rows == [
+            ("Not yet", "linkedin", "pending"),
+            ("Three platforms at once", "instagram", "published"),
+            ("Three platforms at once", "linkedin", "published"),
+            ("Three platforms at once", "twitter", "published")
+        ]
+        assert [p["content"] for p in scheduler.get_scheduled_posts(status="published")] == ["Three platforms at once"]
+        assert asyncio.run(scheduler.check_and_publish_due_posts()) == []
+
+    def test_next_optimal_time_uses_utc_heatmap_cells(self, tmp_path, monkeypatch):
+        """Heatmap weekdays and hours are UTC, so the next slot is found in UTC and returned in local time"""
+        import time as clock_time
+        from module_v.database import DatabaseManager
+        from module_iv.content_scheduler import ContentScheduler
+
+        class MondayLateEngine:
+            """Only Monday 23:00 UTC has history"""
+            def get_heatmap(self, platform):
+                mean = [[None] * 24 for _ in range(7)]
+                count = [[0] * 24 for _ in range(7)]
+                mean[0][23], count[0][23] = 9.0, 5
+                return {"mean": mean, "count": count}
+
+        monkeypatch.setenv("TZ", "Asia/Tokyo")  # UTC+9, no DST
+        clock_time.tzset()
+        try:
+            scheduler = ContentScheduler(
+                best_times=MondayLateEngine(),
+                db=DatabaseManager(str(tmp_path / "optimal.db")),
+                publisher=TestSchedulerDaemon.SlowPublisher(latency=0)
+            )
+            # Tuesday 05:00 local is still Monday 20:00 UTC
+            assert scheduler.calculate_next_optimal_time("linkedin", datetime(2030, 1, 8, 5, 0)) == datetime(2030, 1, 8, 8, 0)
+        finally:
+            monkeypatch.undo()
+            clock_time.tzset()
+
+    def test_failures_retry_with_backoff_then_dead_letter(self, tmp_path):
+        """Transient failures go back to pending until attempts run out; permanent ones are dead-lettered"""
+        from module_v.database import DatabaseManager
+        from module_iv.content_scheduler import ContentScheduler
+
+        class OutagePublisher(TestSchedulerDaemon.SlowPublisher):
+            async def _publish(self, platform, content):
+                if platform == "linkedin":
+                    return {"success": False, "error": "Service unavailable", "status_code": 503}
+                return {"success": False, "error": "Account not connected"}
+
+        db = DatabaseManager(str(tmp_path / "retry.db"))
+        scheduler = ContentScheduler(
+            db=db, publisher=OutagePublisher(latency=0), max_attempts=2, retry_base_delay=0
+        )
+        post = scheduler.schedule_post("Outage", ["linkedin", "twitter"], datetime.now() - timedelta(minutes=1))
+
+        asyncio.run(scheduler.check_and_publish_due_posts())
+        rows = {s["platform"]: s for s in db.get_all_scheduled_posts()}
+        assert rows["linkedin"]["status"] == "pending" and rows["linkedin"]["next_attempt_at"]
+        assert rows["twitter"]["status"] == "dead_letter"
+        assert scheduler.get_scheduled_posts(status="scheduled")[0]["id"] == post["id"]
+
+        asyncio.run(scheduler.check_and_publish_due_posts())
+        rows = {s["platform"]: s for s in db.get_all_scheduled_posts()}
+        assert (rows["linkedin"]["status"], rows["linkedin"]["attempts"]) == ("dead_letter", 2)
+        assert rows["linkedin"]["error_message"] == "Service unavailable"
+        assert scheduler.get_scheduled_posts(status="failed")[0]["id"] == post["id"]
+        assert asyncio.run(scheduler.check_and_publish_due_posts()) == []
+
+    def test_publisher_exceptions_are_retried(self, tmp_path):
+        """A transport exception is transient, as in SchedulerDaemon, so the post goes back to pending"""
+        from module_v.database import DatabaseManager
+        from module_iii import RetryPolicy
+        from module_iv.content_scheduler import ContentScheduler
+
+        class DroppingPublisher(TestSchedulerDaemon.SlowPublisher):
+            async def _publish(self, platform, content):
+                raise ConnectionResetError("Connection reset by peer")
+
+        db = DatabaseManager(str(tmp_path / "exceptions.db"))
+        scheduler = ContentScheduler(db=db, publisher=DroppingPublisher(latency=0), retry_base_delay=0)
+        scheduler.schedule_post("Dropped connection", ["twitter"], datetime.now() - timedelta(minutes=1))
+
+        results = asyncio.run(scheduler.check_and_publish_due_posts())
+        assert results[0]["platforms"]["twitter"]["retryable"] is True
+        row = db.get_all_scheduled_posts()[0]
+        assert (row["status"], row["error_message"]) == ("pending", "Connection reset by peer")
+
+        policy = RetryPolicy(max_attempts=3, base_delay=10, max_delay=30)
+        assert policy.should_retry({"status_code": 503}, 2) and not policy.should_retry({"status_code": 503}, 3)
+        assert not policy.should_retry({"status_code": 401, "retryable": True}, 1)
+        assert 16 <= policy.delay(2) <= 24 and policy.delay(10) <= 36
+
+    def test_own_writes_do_not_reload_cache(self, tmp_path, monkeypatch):
+        """Schedule/cancel/reschedule update the cache in place; only outside writes reload it"""
+        from module_v.database import DatabaseManager
+        from module_iv.content_scheduler import ContentScheduler
+
+        path = str(tmp_path / "cache.db")
+        db = DatabaseManager(path)
+        scheduler = ContentScheduler(db=db, publisher=TestSchedulerDaemon.SlowPublisher(latency=0))
+
+        loads = []
+        original = db.get_all_scheduled_posts
+        monkeypatch.setattr(db, "get_all_scheduled_posts", lambda *a, **kw: loads.append(1) or original(*a, **kw))
+
+        base = datetime.now().replace(microsecond=0) + timedelta(days=1)
+        kept = scheduler.schedule_post("Kept", ["linkedin"], base)
+        dropped = scheduler.schedule_post("Dropped", ["twitter"], base + timedelta(hours=1))
+        assert scheduler.cancel_scheduled_post(dropped["id"])
+        assert scheduler.reschedule_post(kept["id"], base + timedelta(hours=2))
+        assert [p["content"] for p in scheduler.get_scheduled_posts(status="scheduled")] == ["Kept"]
+        assert loads == []
+
+        other = DatabaseManager(path)
+        other_id = other.create_post(content="Elsewhere", voice_type="scheduled", scenario="Elsewhere")
+        other.schedule_post(other_id, "linkedin", ContentScheduler._to_utc(base))
+        assert [p["content"] for p in scheduler.get_scheduled_posts(status="scheduled")] == ["Elsewhere", "Kept"]
+        assert loads == [1]
+
+
+# ============================================================================
+# SLOT OPTIMIZER TESTS
+# ============================================================================
+
+class TestSlotOptimizer:
+    """Test batch assignment of posts to calendar slots"""
+
+    @staticmethod
+    def morning_grid():
+        """Engagement peaks sharply at 07:00, then 12:00, then 17:00"""
+        import numpy as np
+
+        grid = np.ones((7, 24))
+        grid[:, 7], grid[:, 12], grid[:, 17] = 10.0, 6.0, 4.0
+        return grid
+
+    def test_batch_spreads_over_calendar_within_rules(self):
+        """Posts fill the best hours without stacking, respecting caps, spacing and blackouts"""
+        from collections import Counter
+        from datetime import time as clock
+        from module_iv.slot_optimizer import SlotOptimizer
+
+        monday = datetime(2030, 1, 7)
+        optimizer = SlotOptimizer(
+            min_spacing=timedelta(hours=3),
+            daily_cap=3,
+            blackouts=[(clock(22, 0), clock(6, 0)), (monday + timedelta(days=2), monday + timedelta(days=3))]
+        )
+        existing = [("linkedin", monday + timedelta(hours=7))]
+        assignments = optimizer.assign(
+            [{"platforms": ["linkedin"]} for _ in range(17)],
+            grids={"linkedin": self.morning_grid()},
+            start=monday, days=7, existing=existing
+        )
+
+        times = sorted(a.scheduled_time for a in assignments)
+        assert all(t is not None for t in times)
+        per_day = Counter(t.date() for t in times + [existing[0][1]])
+        assert max(per_day.values()) == 3 and (monday + timedelta(days=2)).date() not in per_day
+        assert all(6 <= t.hour < 22 for t in times)
+
+        calendar = sorted(times + [existing[0][1]])
+        assert min(b - a for a, b in zip(calendar, calendar[1:])) >= timedelta(hours=3)
+
+        # Six open days: 07:00 on five of them (Monday's is taken), noon and 17:00 on all six
+        hours = Counter(t.hour for t in times)
+        assert hours[7] == 5 and hours[12] == 6 and hours[17] == 6
+
+    def test_multi_platform_posts_and_unplaceable(self):
+        """A post's slot must suit all of its platforms; overflow is reported, not forced"""
+        import numpy as np
+        from module_iv.slot_optimizer import SlotOptimizer
+
+        twitter = np.ones((7, 24))
+        twitter[:, 20] = 50.0
+        optimizer = SlotOptimizer(min_spacing=timedelta(hours=1), daily_cap=1)
+        assignments = optimizer.assign(
+            [{"platforms": ["linkedin", "twitter"], "weight": 2.0}, {"platforms": ["twitter"]}, {"platforms": ["twitter"]}],
+            grids={"linkedin": self.morning_grid(), "twitter": twitter},
+            start=datetime(2030, 1, 7), days=1
+        )
+
+        assert assignments[0].scheduled_time == datetime(2030, 1, 7, 20, 0)
+        assert assignments[0].score == 2 * (1.0 + 50.0)
+        assert [a.scheduled_time for a in assignments[1:]] == [None, None]
+
+    def test_hundreds_of_posts_under_a_second(self):
+        """Solver cost stays well below a second for a large batch"""
+        import numpy as np
+        from module_iv.slot_optimizer import SlotOptimizer
+
+        rng = np.random.RandomState(0)
+        grids = {p: rng.rand(7, 24) for p in ["linkedin", "twitter", "instagram"]}
+        posts = [{"platforms": [["linkedin"], ["twitter"], ["instagram"], ["linkedin", "twitter"]][i % 4]} for i in range(400)]
+        optimizer = SlotOptimizer(min_spacing=timedelta(hours=1), daily_cap=8)
+
+        started = time.perf_counter()
+        assignments = optimizer.assign(posts, grids, start=datetime(2030, 1, 7), days=30)
+        elapsed = time.perf_counter() - started
+
+        assert sum(a.scheduled_time is not None for a in assignments) == 400
+        assert elapsed < 1.0
+
+    def test_content_scheduler_batch(self, tmp_path):
+        """ContentScheduler.schedule_batch persists the optimized slots"""
+        from module_v.database import DatabaseManager
+        from module_iv.content_scheduler import ContentScheduler
+
+        scheduler = ContentScheduler(
+            db=DatabaseManager(str(tmp_path / "batch.db")),
+            publisher=TestSchedulerDaemon.SlowPublisher(latency=0)
+        )
+        monday = datetime(2030, 1, 7)
+        scheduler.schedule_post("Already booked", ["linkedin"], monday + timedelta(hours=7))
+
+        result = scheduler.schedule_batch(
+            [{"content": f"Week post {i}", "platforms": ["linkedin"]} for i in range(10)],
+            start=monday, days=2, min_spacing=timedelta(hours=2), daily_cap=4
+        )
+
+        assert len(result["scheduled"]) == 7 and len(result["unscheduled"]) == 3
+        times = [datetime.fromisoformat(p["scheduled_time"]) for p in scheduler.get_scheduled_posts()]
+        assert times == sorted(times) and len(set(times)) == 8
+        # Without history, best-practice LinkedIn hours 2h+ apart fill first on both days
+        for day in (monday, monday + timedelta(days=1)):
+            assert {7, 12, 17} <= {t.hour for t in times if t.date() == day.date()}
+
+    def test_content_scheduler_batch_plans_in_utc(self, tmp_path, monkeypatch):
+        """The UTC heatmap hours are matched in UTC, and local blackouts are honoured, outside UTC too"""
+        import time as clock_time
+        from datetime import time as clock
+        from module_v.database import DatabaseManager
+        from module_iv.content_scheduler import ContentScheduler
+
+        monkeypatch.setenv("TZ", "Asia/Tokyo")  # UTC+9, no DST
+        clock_time.tzset()
+        try:
+            db = DatabaseManager(str(tmp_path / "tokyo.db"))
+            scheduler = ContentScheduler(db=db, publisher=TestSchedulerDaemon.SlowPublisher(latency=0))
+            monday = datetime(2030, 1, 7)  # Local midnight = 15:00 UTC the day before
+
+            result = scheduler.schedule_batch(
+                [{"content": f"Tokyo post {i}", "platforms": ["linkedin"]} for i in range(3)],
+                start=monday, days=1, min_spacing=timedelta(hours=2), daily_cap=None
+            )
+            utc_hours = sorted(datetime.fromisoformat(s["scheduled_time"]).hour for s in db.get_all_scheduled_posts())
+            assert utc_hours == [7, 12, 17]
+            assert sorted(datetime.fromisoformat(p["scheduled_time"]).hour for p in result["scheduled"]) == [2, 16, 21]
+
+            result = scheduler.schedule_batch(
+                [{"content": "Not in the evening", "platforms": ["twitter"]}],
+                start=monday, days=1, blackouts=[(clock(20, 0), clock(23, 0))]
+            )
+            # Twitter's best UTC hours 12 and 17 are 21:00 and 02:00 local; 21:00 is blacked out
+            assert datetime.fromisoformat(result["scheduled"][0]["scheduled_time"]).hour == 2
+        finally:
+            monkeypatch.undo()
+            clock_time.tzset()
+
+    def test_batch_endpoint(self):
+        """The dashboard batch API schedules what fits and reports the rest"""
+        from dashboard.app import db
+
+        post_ids = [db.db.create_post(f"Batch endpoint post {i}", "personal", "Batch") for i in range(3)]
+        try:
+            response = client.post("/api/scheduled/batch", json={
+                "post_ids": post_ids,
+                "platforms": ["linkedin"],
+                "start": "2031-03-03T00:00:00",
+                "days": 1,
+                "daily_cap": 2,
+                "blackouts": [{"start": "00:00", "end": "06:00"}]
+            })
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["scheduled"]) == 2 and len(data["unscheduled"]) == 1
+            assert all(s["scheduled_time"] >= "2031-03-03T06:00:00" for s in data["scheduled"])
+
+            # An aware start is converted to UTC; numeric options may arrive as strings
+            response = client.post("/api/scheduled/batch", json={
+                "post_ids": post_ids[:1],
+                "platforms": ["linkedin"],
+                "start": "2031-03-10T09:00:00+09:00",
+                "days": "1",
+                "daily_cap": "1"
+            })
+            assert response.status_code == 200
+            assert response.json()["scheduled"][0]["scheduled_time"].startswith("2031-03-10T07:00")
+
+            assert client.post("/api/scheduled/batch", json={"post_ids": post_ids}).status_code == 400
+            for option in ({"days": "a week"}, {"daily_cap": "many"}):
+                invalid = {"post_ids": post_ids, "platforms": ["linkedin"], **option}
+                assert client.post("/api/scheduled/batch", json=invalid).status_code == 400
+            bad = {"post_ids": post_ids, "platforms": ["linkedin"], "blackouts": [{"start": "soon"}]}
+            assert client.post("/api/scheduled/batch", json=bad).status_code == 400
+        finally:
+            for scheduled in db.db.get_all_scheduled_posts(status="pending"):
+                if scheduled["post_id"] in post_ids:
+                    db.db.cancel_scheduled_post(scheduled["id"])
+            for post_id in post_ids:
+                db.db.delete_post(post_id)
+
+
+    def test_batch_endpoint_plans_like_content_scheduler(self):
+        """The API goes through ContentScheduler: in-flight rows count, and offset-less blackouts are UTC"""
+        from dashboard.app import db
+
+        booked = db.db.create_post("Going out right now", "personal", "Batch")
+        post_ids = [db.db.create_post(f"Planned post {i}", "personal", "Batch") for i in range(2)]
+        in_flight = db.db.schedule_post(booked, "linkedin", "2031-04-07T07:00:00")
+        conn = db.db._get_connection()
+        conn.execute("UPDATE scheduled_posts SET status = 'in_flight' WHERE id = ?", (in_flight,))
+        conn.commit()
+        try:
+            response = client.post("/api/scheduled/batch", json={
+                "post_ids": post_ids,
+                "platforms": ["linkedin"],
+                "start": "2031-04-07T00:00:00",
+                "days": 1,
+                "blackouts": [{"start": "16:00", "end": "20:00"}]
+            })
+            assert response.status_code == 200
+            # Best-practice hours: 07:00 and 08:00 are too close to the in-flight post and 17:00
+            # and 18:00 are blacked out, so after 12:00 the earliest off-peak slot wins
+            times = [s["scheduled_time"] for s in response.json()["scheduled"]]
+            assert times == ["2031-04-07T00:00:00", "2031-04-07T12:00:00"]
+        finally:
+            conn.execute("UPDATE scheduled_posts SET status = 'cancelled' WHERE post_id IN (?, ?, ?)", (booked, *post_ids))
+            conn.commit()
+            for post_id in (booked, *post_ids):
+                db.db.delete_post(post_id)
+
 # ============================================================================
 # MAIN TEST RUNNER
 # ============================================================================